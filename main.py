@@ -1,5 +1,8 @@
 import os
 import json
+import contextvars
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -8,16 +11,23 @@ import sys
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
-from scripts.utils.logger_config import get_logger
+from scripts.utils.logger_config import get_logger, log_context, bind_log_context, reset_log_context, new_run_id
 from scripts.utils.helpers import save_news_data
-from scripts.utils.get_interests import get_interests
-from scripts.apis import (
-    fetch_newsdata,
-    fetch_newsapi,
-    fetch_gnews,
-    fetch_mediastack,
-    fetch_currents
-)
+from scripts.utils.get_interests import get_interest_repository
+from scripts.utils.fetch_scheduler import load_schedule, get_due_apis, record_fetch_result
+from scripts.utils.query_planner import (BATCHABLE_PROVIDERS, plan_query_batches, combine_queries, split_response,
+                                         batch_page_params)
+from scripts.utils.process_fetched_data import process_and_insert_data
+from scripts.utils.db_connection import get_db_connection, close_connection, get_pool_stats
+from scripts.utils.sharding import filter_shard
+from scripts.utils.track_api_calls import reserve_api_call, release_api_call
+from scripts.utils.ranking import update_top_articles
+from scripts.utils.storage_policy import get_policy_stats
+from scripts.utils.run_manifest import open_run, is_job_done, record_job, finish_run, response_cursor
+from scripts.utils.concurrency import CONCURRENCY_CONFIG, get_concurrency_stats
+from scripts.utils.response_envelope import json_default
+from scripts.utils.enrichment import stop_enrichment
+from scripts.apis import build_provider_clients
 
 # Initialize logger
 logger = get_logger('main')
@@ -25,54 +35,81 @@ logger = get_logger('main')
 # Load environment variables
 load_dotenv()
 
-def run_apis(apis_to_fetch, **kwargs):
+def run_apis(apis_to_fetch, stats=None, clients=None, fetch_options=None, **kwargs):
     """
     Run the specified APIs and collect the news data.
 
     Args:
         apis_to_fetch (list): List of API names to fetch data from.
+        stats (dict, optional): If provided, filled with the insertion counts of each API, keyed by API name.
+        clients (dict, optional): Provider clients built once for the run. Defaults to a new set.
+        fetch_options (dict, optional): Options passed to fetch_news for every API (e.g. track).
         **kwargs: Additional keyword arguments for API parameters.
 
     Returns:
-        dict: A dictionary containing news data from each API.
+        dict: A dictionary containing news data (ResponseEnvelope or None) from each API.
     """
     news_data = {}
-    api_functions = {
-        'newsdata': fetch_newsdata,
-        'newsapi': fetch_newsapi,
-        'gnews': fetch_gnews,
-        'mediastack': fetch_mediastack,
-        'currents': fetch_currents
-    }
+    if clients is None:
+        clients = build_provider_clients()
 
     for api in apis_to_fetch:
-        if api in api_functions:
+        if api in clients:
+            # The caller's parameters are passed as is; sets are serialized by json_default where logged
             api_params = kwargs.get(api, {})
-            # Ensure all parameters are JSON serializable
-            api_params = {k: (list(v) if isinstance(v, set) else v) for k, v in api_params.items()}
-            try:
-                logger.debug(f"Fetching data from API: {api} with params: {api_params}")
-                news_data[api] = api_functions[api](**api_params)
-                logger.debug(f"Successfully fetched data from API: {api}")
-            except Exception as api_e:
-                logger.error(f"Error fetching data from API {api}: {str(api_e)}")
-                news_data[api] = None
+            call_options = fetch_options or {}
+            if stats is not None:
+                stats[api] = {}
+                call_options = {**call_options, 'stats': stats[api]}
+            with log_context(provider=api):
+                try:
+                    logger.debug(f"Fetching data from API: {api} with params: {api_params}")
+                    news_data[api] = clients[api].fetch(**api_params, **call_options)
+                    logger.debug(f"Successfully fetched data from API: {api}")
+                except Exception as api_e:
+                    logger.error(f"Error fetching data from API {api}: {str(api_e)}")
+                    news_data[api] = None
         else:
             logger.warning(f"Skipping unknown API: {api}")
 
     return news_data
 
-def fetch_news_for_interest(apis_to_fetch, interest):
+def build_date_windows(now=None):
     """
-    Fetch news for a single interest from NewsData, NewsAPI, and GNews.
+    Build the date ranges searched for interests, once per run.
+
+    Args:
+        now (datetime, optional): End of the ranges. Defaults to datetime.now().
+
+    Returns:
+        dict: Date range parameters keyed by API name.
+    """
+    now = now or datetime.now()
+    return {
+        'newsapi': {
+            'from_param': (now - timedelta(days=30)).strftime('%Y-%m-%d'),
+            'to': now.strftime('%Y-%m-%d'),
+        },
+        'gnews': {
+            'from_param': (now - timedelta(days=60)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'to': now.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        },
+    }
+
+def build_interest_params(interest, date_windows=None):
+    """
+    Build the NewsData, NewsAPI, and GNews parameters for an interest.
 
     Args:
         interest (dict): A dictionary containing interest data.
+        date_windows (dict, optional): Date ranges from build_date_windows(). Defaults to ranges ending now.
 
     Returns:
-        dict: A dictionary containing news data from NewsData, NewsAPI, and GNews for the interest.
+        dict: API parameters keyed by API name.
     """
-    
+    if date_windows is None:
+        date_windows = build_date_windows()
+
     common_params = {
         'q': interest['formatted_interest'],
         'language': interest['language']
@@ -87,14 +124,12 @@ def fetch_news_for_interest(apis_to_fetch, interest):
         },
         'newsapi': {
             'searchIn': 'title,description',
-            'from_param': (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),
-            'to': datetime.now().strftime('%Y-%m-%d'),
+            **date_windows['newsapi'],
             **common_params
         },
         'gnews': {
             'max': 10,  # You can adjust this or make it dynamic based on requirements
-            'from_param': (datetime.now() - timedelta(days=60)).strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'to': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            **date_windows['gnews'],
             'in_param': 'title,description',
             'nullable': 'image',
             'lang': interest['language'],
@@ -102,38 +137,313 @@ def fetch_news_for_interest(apis_to_fetch, interest):
         }
     }
 
-    return run_apis(apis_to_fetch, **kwargs)
+    return kwargs
+
+def fetch_news_for_interest(apis_to_fetch, interest, stats=None, clients=None, date_windows=None, fetch_options=None):
+    """
+    Fetch news for a single interest from NewsData, NewsAPI, and GNews.
+
+    Args:
+        apis_to_fetch (list): List of API names to fetch data from.
+        interest (dict): A dictionary containing interest data.
+        stats (dict, optional): If provided, filled with the insertion counts of each API.
+        clients (dict, optional): Provider clients built once for the run.
+        date_windows (dict, optional): Date ranges built once for the run.
+        fetch_options (dict, optional): Options passed to fetch_news.
+
+    Returns:
+        dict: A dictionary containing news data from NewsData, NewsAPI, and GNews for the interest.
+    """
+    return run_apis(apis_to_fetch, stats=stats, clients=clients, fetch_options=fetch_options,
+                    **build_interest_params(interest, date_windows))
+
+def fetch_interest_job(apis_to_fetch, interest, clients=None, date_windows=None, fetch_options=None):
+    """
+    Fetch news for an interest, returning it with its insertion counts so it can be stored by the caller.
+
+    Args:
+        apis_to_fetch (list): List of API names to fetch data from.
+        interest (dict): A dictionary containing interest data.
+        clients (dict, optional): Provider clients built once for the run.
+        date_windows (dict, optional): Date ranges built once for the run.
+        fetch_options (dict, optional): Options passed to fetch_news.
+
+    Returns:
+        tuple: (interest, news data keyed by API name, insertion counts keyed by API name).
+    """
+    with log_context(interest_id=interest['id']):
+        logger.info(f"Fetching news for interest: {interest['formatted_interest']} (ID: {interest['id']})")
+        fetch_stats = {}
+        interest_news = fetch_news_for_interest(apis_to_fetch, interest, stats=fetch_stats, clients=clients,
+                                                date_windows=date_windows, fetch_options=fetch_options)
+    return interest, interest_news, fetch_stats
+
+def fetch_interest_jobs(jobs, workers=1, **fetch_kwargs):
+    """
+    Fetch (interest, APIs) jobs one at a time, or with a pool of threads.
+
+    With several workers every (interest, API) pair is a separate task, so each provider
+    has as many requests in flight as its adaptive concurrency limit allows (see
+    scripts/utils/concurrency.py). Jobs are taken from `jobs` at most two per worker
+    ahead of the fetches, so quota reservations stay close to the calls.
+
+    Args:
+        jobs (iterable): (interest, list of API names) tuples.
+        workers (int, optional): Number of threads. Defaults to 1 (in order, in the calling thread).
+        **fetch_kwargs: Keyword arguments for fetch_interest_job (clients, date_windows, fetch_options).
+
+    Yields:
+        tuple: fetch_interest_job results, in completion order.
+    """
+    if workers <= 1:
+        for interest, apis in jobs:
+            yield fetch_interest_job(apis, interest, **fetch_kwargs)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch') as executor:
+        pending = set()
+        for interest, apis in jobs:
+            for api in apis:
+                # Each task runs in a copy of the caller's log context
+                pending.add(executor.submit(contextvars.copy_context().run, fetch_interest_job, [api], interest,
+                                            **fetch_kwargs))
+            while len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def fetch_news_for_batch(api, interests, stats=None, clients=None, date_windows=None, fetch_options=None,
+                         request_stats=None):
+    """
+    Fetch news for several compatible interests with a single OR-combined request.
+
+    The request asks for as many articles per interest as a single-interest request (see
+    batch_page_params). The articles of the response are assigned back to the interests
+    they match and inserted under each interest. An article matching several interests is
+    only stored under the first one, but it counts as new for each of them ('batch_shared' in
+    stats), so the fetch scheduler does not take it for a stale duplicate.
 
+    Args:
+        api (str): Name of the API.
+        interests (list): Interest dictionaries planned into the same request.
+        stats (dict, optional): If provided, filled with the insertion counts of each interest, keyed by
+            interest ID, plus 'batch_shared': new articles another interest of the batch inserted first.
+        clients (dict, optional): Provider clients built once for the run.
+        date_windows (dict, optional): Date ranges built once for the run.
+        fetch_options (dict, optional): Options passed to fetch_news.
+        request_stats (dict, optional): If provided, filled with the fetch_news stats of the request.
 
-def main(fetch_interests_flag=False, apis_to_fetch=None, **kwargs):
+    Returns:
+        dict: A dictionary containing news data for each interest ID (None if the request failed).
+    """
+    params = build_interest_params(interests[0], date_windows)[api]
+    params['q'] = combine_queries(interests)
+    params.update(batch_page_params(api, len(interests)))
+
+    call_stats = {}
+    data = run_apis([api], stats=call_stats, clients=clients,
+                    fetch_options={**(fetch_options or {}), 'process': False}, **{api: params})[api]
+    if request_stats is not None:
+        request_stats.update(call_stats.get(api, {}))
+    if data is None:
+        return {interest['id']: None for interest in interests}
+
+    interest_news = split_response(api, data, interests)
+    results_key = BATCHABLE_PROVIDERS[api]['results_key'] if api in BATCHABLE_PROVIDERS else None
+    batch_titles = set()
+    for interest_id, response in interest_news.items():
+        interest_stats = {'inserted_titles': set()}
+        if not process_and_insert_data(api, response, interest_stats):
+            logger.error(f"Failed to insert {api} data for interest ID '{interest_id}'.")
+        inserted_titles = interest_stats.pop('inserted_titles')
+        titles = {article.get('title') for article in (response.get(results_key) or [])} if results_key else set()
+        interest_stats['batch_shared'] = len((titles & batch_titles) - inserted_titles)
+        batch_titles |= inserted_titles
+        if stats is not None:
+            stats[interest_id] = interest_stats
+
+    return interest_news
+
+def release_unused_call(api, fetch_stats, shard_index):
+    """
+    Give back the call reserved for a fetch that sent no request of its own (see reserve_api_call).
+
+    Args:
+        api (str): Name of the API.
+        fetch_stats (dict): The fetch_news stats of the fetch.
+        shard_index (int): Shard that reserved the call.
+    """
+    if fetch_stats.get('shared') or not fetch_stats.get('requests_sent'):
+        release_api_call(api, shard_index)
+
+def collect_interest_news(news_data, api, interest, data, new_articles, schedule=None, rank=False, manifest=None):
+    """
+    Store the news fetched for an (interest, API) pair, reschedule the pair, update its ranking
+    and checkpoint it in the run manifest.
+
+    Args:
+        news_data (dict): News data being collected, keyed by API then interest ID.
+        api (str): Name of the API.
+        interest (dict): A dictionary containing interest data.
+        data (dict or None): The API response for the interest, None if the fetch failed.
+        new_articles (int): Number of new articles inserted for the interest.
+        schedule (dict, optional): Adaptive fetch schedule, if enabled.
+        rank (bool, optional): If True, merge the articles into the interest's top-K. Defaults to False.
+        manifest (dict, optional): Run manifest, if the run is checkpointed.
+    """
+    if data is None:
+        logger.warning(f"No data returned for API '{api}' and interest ID '{interest['id']}'.")
+        record_job(manifest, interest['id'], api, 'failed', error="No data returned")
+        return
+
+    news_data[api][interest['id']] = data
+    logger.info(f"Added data for API '{api}' and interest ID '{interest['id']}'.")
+    if schedule is not None:
+        record_fetch_result(schedule, interest['id'], api, new_articles)
+    if rank:
+        update_top_articles(interest, api, data)
+    record_job(manifest, interest['id'], api, 'completed', cursor_value=response_cursor(api, data),
+               new_articles=new_articles)
+
+
+def main(fetch_interests_flag=False, apis_to_fetch=None, adaptive_schedule=False, batch_queries=False,
+         shard_index=None, num_shards=None, rank_results=False, resume_run=True, workers=None, **kwargs):
     """
     Main function to orchestrate fetching and saving news data.
 
     Args:
         fetch_interests_flag (bool): If True, fetch news for interests from the database.
         apis_to_fetch (list, optional): List of APIs to fetch. Defaults to all APIs.
+        adaptive_schedule (bool): If True (interests mode only), fetch only the (interest, API)
+            pairs whose adaptive refresh interval has elapsed, and reschedule them based on
+            how many new articles each fetch produced.
+        batch_queries (bool): If True (interests mode only), pack compatible interests into
+            OR-combined requests for the providers that support boolean queries.
+        shard_index (int, optional): Index of this shard (interests mode only), from 0 to num_shards - 1.
+            Defaults to the SHARD_INDEX environment variable.
+        num_shards (int, optional): Number of shards sharing the interests and the daily API quotas.
+            Each shard fetches the interests it owns on a consistent hash ring, and reserves each
+            call from its share of the quota in api_usage. Defaults to the NUM_SHARDS environment variable.
+        rank_results (bool): If True (interests mode only), score the fetched articles against each
+            interest and keep its best RANKING_TOP_K articles in interest_top_articles.
+        resume_run (bool): If True (interests mode only), resume the latest unfinished run with the same
+            options, skipping the (interest, API) pairs it completed (see run_manifest.py). If False,
+            a new run is started.
+        workers (int, optional): Number of threads fetching (interest, API) pairs concurrently (interests
+            mode only). Defaults to the FETCH_WORKERS environment variable (1).
         **kwargs: Additional keyword arguments for API parameters.
 
     Returns:
         dict: A dictionary containing news data from each API.
     """
+    # Every record logged during the run carries its run ID (see logger_config.log_context)
+    run_id = os.getenv("RUN_ID") or new_run_id()
+    context_token = bind_log_context(run_id=run_id)
+    manifest = None
     try:
+        # The first connection checks the schema is at migrations.LATEST_VERSION (e.g. the dedup_key
+        # columns every insert relies on), so a database that is behind fails the run before any API call
+        close_connection(get_db_connection())
+
         if fetch_interests_flag:
-            interests = get_interests()
+            # Cached between runs of the same process; only changed interests are re-read
+            interests = get_interest_repository().get_interests()
             logger.debug(f"Retrieved {len(interests)} interests from the database.")
 
+            if num_shards is None and os.getenv("NUM_SHARDS"):
+                num_shards = int(os.getenv("NUM_SHARDS"))
+                shard_index = int(os.getenv("SHARD_INDEX", 0))
+            sharded = bool(num_shards) and num_shards > 1
+            fetch_options = None
+            if sharded:
+                interests = filter_shard(interests, shard_index, num_shards)
+                # Calls are counted when reserved, before being made
+                fetch_options = {'track': False}
+
+            # Jobs completed by an interrupted attempt of the same run are skipped
+            manifest = open_run({
+                'apis': sorted(apis_to_fetch),
+                'adaptive_schedule': adaptive_schedule,
+                'batch_queries': batch_queries,
+                'rank_results': rank_results,
+                'shard': [shard_index, num_shards] if sharded else None,
+            }, run_id=run_id, resume=resume_run)
+            if manifest is not None and manifest['resumed']:
+                bind_log_context(run_id=manifest['run_id'])
+
             # Initialize news_data with APIs as keys
             news_data = { api: {} for api in apis_to_fetch }
+            schedule = load_schedule() if adaptive_schedule else None
+            clients = build_provider_clients()
+            # A resumed run searches the same date ranges as its first attempt
+            date_windows = build_date_windows(manifest['started_at'] if manifest else None)
+            pending_interests = { api: [] for api in apis_to_fetch }
+
+            def due_interest_jobs():
+                # Lazy, so that quota is reserved just before the pair is fetched
+                for interest in interests:
+                    due_apis = apis_to_fetch
+                    if adaptive_schedule:
+                        due_apis = get_due_apis(schedule, interest['id'], apis_to_fetch)
+                        if not due_apis:
+                            logger.debug(f"No APIs due for interest ID '{interest['id']}', skipping.")
+                            continue
+
+                    if manifest is not None:
+                        due_apis = [api for api in due_apis if not is_job_done(manifest, interest['id'], api)]
+                        if not due_apis:
+                            continue
+
+                    if batch_queries:
+                        for api in due_apis:
+                            if api in BATCHABLE_PROVIDERS:
+                                pending_interests[api].append(interest)
+                        due_apis = [api for api in due_apis if api not in BATCHABLE_PROVIDERS]
+
+                    if sharded:
+                        due_apis = [api for api in due_apis if reserve_api_call(api, shard_index, num_shards)]
+                    if not due_apis:
+                        continue
+
+                    yield interest, due_apis
 
-            for interest in interests:
-                logger.info(f"Fetching news for interest: {interest['formatted_interest']} (ID: {interest['id']})")
-                interest_news = fetch_news_for_interest(apis_to_fetch, interest)
-                for api, data in interest_news.items():
-                    if data is not None:
-                        news_data[api][interest['id']] = data
-                        logger.info(f"Added data for API '{api}' and interest ID '{interest['id']}'.")
-                    else:
-                        logger.warning(f"No data returned for API '{api}' and interest ID '{interest['id']}'.")
+            workers = CONCURRENCY_CONFIG["workers"] if workers is None else workers
+            for interest, interest_news, fetch_stats in fetch_interest_jobs(
+                    due_interest_jobs(), workers, clients=clients, date_windows=date_windows,
+                    fetch_options=fetch_options):
+                with log_context(interest_id=interest['id']):
+                    for api, data in interest_news.items():
+                        with log_context(provider=api):
+                            if sharded:
+                                release_unused_call(api, fetch_stats.get(api, {}), shard_index)
+                            new_articles = fetch_stats.get(api, {}).get('inserted', 0)
+                            collect_interest_news(news_data, api, interest, data, new_articles, schedule, rank_results,
+                                                  manifest)
+
+            for api, api_interests in pending_interests.items():
+                for batch in plan_query_batches(api, api_interests):
+                    if sharded and not reserve_api_call(api, shard_index, num_shards):
+                        continue
+                    with log_context(provider=api):
+                        logger.info(f"Fetching {api} news for interest IDs: {[interest['id'] for interest in batch]}")
+                        batch_stats = {}
+                        request_stats = {}
+                        batch_news = fetch_news_for_batch(api, batch, stats=batch_stats, clients=clients,
+                                                          date_windows=date_windows, fetch_options=fetch_options,
+                                                          request_stats=request_stats)
+                        if sharded:
+                            release_unused_call(api, request_stats, shard_index)
+                        for interest in batch:
+                            with log_context(interest_id=interest['id']):
+                                interest_stats = batch_stats.get(interest['id'], {})
+                                new_articles = (interest_stats.get('inserted', 0)
+                                                + interest_stats.get('batch_shared', 0))
+                                collect_interest_news(news_data, api, interest, batch_news[interest['id']],
+                                                      new_articles, schedule, rank_results, manifest)
 
             logger.info("Completed fetching news for all interests.")
         else:
@@ -144,27 +454,63 @@ def main(fetch_interests_flag=False, apis_to_fetch=None, **kwargs):
                 # If no APIs specified, fetch from all available APIs
                 apis_to_fetch = ['newsdata', 'newsapi', 'gnews', 'mediastack', 'currents']
 
-            # Ensure all parameters are JSON serializable
-            for api, params in kwargs.items():
-                kwargs[api] = {k: (list(v) if isinstance(v, set) else v) for k, v in params.items()}
-
             logger.debug(f"Fetching news from APIs: {apis_to_fetch} with parameters: {kwargs}")
             news_data = run_apis(apis_to_fetch, **kwargs)
             logger.info("Completed fetching news from specified APIs.")
 
         # Save the collected news data
-        save_news_data(news_data)
+        save_news_data(news_data, suffix=f"shard{shard_index}" if num_shards and num_shards > 1 else None)
+        finish_run(manifest)
         logger.info("News data fetched and saved successfully.")
+        logger.debug(f"Database pool stats: {get_pool_stats()}")
+        logger.debug(f"Provider concurrency: {get_concurrency_stats()}")
+        # Checks still running after ENRICHMENT_DRAIN_SECONDS are left to the next run
+        stop_enrichment()
+        policy_stats = get_policy_stats()
+        if policy_stats['total_bytes_saved']:
+            logger.info(f"Storage policy savings: {policy_stats}")
         return news_data
     except Exception as e:
         logger.error(f"An error occurred in main: {str(e)}")
+        finish_run(manifest, 'failed')
         return None
+    finally:
+        reset_log_context(context_token)
+
+def run_shards(num_shards, **kwargs):
+    """
+    Run main() in one local process per shard, all against the same database.
+
+    Args:
+        num_shards (int): Number of shards (and processes).
+        **kwargs: Keyword arguments for main(), e.g. fetch_interests_flag=True and apis_to_fetch.
+
+    Returns:
+        list: The exit code of each shard process.
+    """
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=main, kwargs={**kwargs, 'shard_index': shard_index, 'num_shards': num_shards},
+                        name=f"news-fetcher-shard-{shard_index}")
+        for shard_index in range(num_shards)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    exit_codes = [process.exitcode for process in processes]
+    logger.info(f"Shard processes finished with exit codes: {exit_codes}")
+    return exit_codes
 
 if __name__ == "__main__":
     # Example usage
     # To fetch news for interests from the database:
     # result = main(fetch_interests_flag=True)
 
+    # To split the interests and daily quotas between 4 local processes:
+    # run_shards(4, fetch_interests_flag=True, apis_to_fetch=['newsdata', 'newsapi', 'gnews'])
+
     # To test with custom parameters:
     result = main(
         fetch_interests_flag=False,
@@ -267,4 +613,4 @@ if __name__ == "__main__":
                 # 'limit': 50
         }
     )
-    logger.debug((json.dumps(result, indent=2)))
+    logger.debug((json.dumps(result, indent=2, default=json_default)))
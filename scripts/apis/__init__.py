@@ -1,5 +1,19 @@
-from .newsdata_api import fetch_newsdata
-from .newsapi_api import fetch_newsapi
-from .gnews_api import fetch_gnews
-from .mediastack_api import fetch_mediastack
-from .currents_api import fetch_currents
+from .newsdata_api import fetch_newsdata, newsdata_client
+from .newsapi_api import fetch_newsapi, newsapi_client
+from .gnews_api import fetch_gnews, gnews_client
+from .mediastack_api import fetch_mediastack, mediastack_client
+from .currents_api import fetch_currents, currents_client
+from .provider_client import ProviderClient, RequestSpec
+
+
+def build_provider_clients():
+    """
+    Build a fresh set of provider clients, to be reused for a whole run.
+
+    Returns:
+        dict: ProviderClient objects keyed by API name.
+    """
+    return {
+        client.api_name: client.clone()
+        for client in (newsdata_client, newsapi_client, gnews_client, mediastack_client, currents_client)
+    }
@@ -1,10 +1,12 @@
 import os
 from datetime import datetime, timedelta
-from scripts.utils.helpers import fetch_news
+from scripts.apis.provider_client import ProviderClient, signature_arg_names, signature_defaults
+
+VALID_TYPES = (1, 2, 3)
 
 def fetch_currents(keywords=None, language=None, country=None, start_date=None, end_date=None,
                    type=None, category=None, page_number=None, domain=None, domain_not=None,
-                   page_size=None, limit=None):
+                   page_size=None, limit=None, **fetch_options):
     """
     Fetch news articles from the Currents API.
 
@@ -63,6 +65,8 @@ def fetch_currents(keywords=None, language=None, country=None, start_date=None,
             Note: Set to a small number (around 30) if you have a complex query.
             Default: Returns all matched articles by default.
 
+        **fetch_options: Extra keyword arguments forwarded to fetch_news (e.g. stats).
+
     Returns:
         dict: JSON response from the API.
 
@@ -99,38 +103,59 @@ def fetch_currents(keywords=None, language=None, country=None, start_date=None,
             )
 
     """
-    url = "https://api.currentsapi.services/v1/search"
-    api_key = os.getenv("CURRENTS_API_KEY")
-    if not api_key:
-        raise ValueError("API key not found. Set 'CURRENTS_API_KEY' environment variable.")
+    return currents_client.fetch(
+        keywords=keywords,
+        language=language,
+        country=country,
+        start_date=start_date,
+        end_date=end_date,
+        type=type,
+        category=category,
+        page_number=page_number,
+        domain=domain,
+        domain_not=domain_not,
+        page_size=page_size,
+        limit=limit,
+        **fetch_options
+    )
+
+
+def validate_currents_args(args):
+    """
+    Validate Currents arguments.
+
+    Args:
+        args (dict): Arguments of fetch_currents.
 
+    Returns:
+        dict: The arguments.
+
+    Raises:
+        ValueError: If invalid parameters are provided.
+    """
+    page_size = args.get('page_size')
     if page_size is not None and not (1 <= page_size <= 200):
         raise ValueError("page_size must be between 1 and 200.")
 
+    limit = args.get('limit')
     if limit is not None and not (1 <= limit <= 200):
         raise ValueError("limit must be between 1 and 200.")
 
-    if type is not None and type not in [1, 2, 3]:
+    type = args.get('type')
+    if type is not None and type not in VALID_TYPES:
         raise ValueError("type must be 1 (news), 2 (article), or 3 (discussion content).")
 
-    params = {
-        'apiKey': api_key,
-        'keywords': keywords,
-        'language': language,
-        'country': country,
-        'start_date': start_date,
-        'end_date': end_date,
-        'type': type,
-        'category': category,
-        'page_number': page_number,
-        'domain': domain,
-        'domain_not': domain_not,
-        'page_size': page_size,
-        'limit': limit
-    }
-    params = {k: v for k, v in params.items() if v is not None}
-    
-    # Get the path of this script
-    api_script_path = os.path.abspath(__file__)
-
-    return fetch_news(url, params, 'currents', api_script_path)
+    return args
+
+
+currents_client = ProviderClient(
+    'currents',
+    "https://api.currentsapi.services/v1/search",
+    os.path.abspath(__file__),
+    api_key_env="CURRENTS_API_KEY",
+    api_key_param='apiKey',
+    arg_names=signature_arg_names(fetch_currents),
+    defaults=signature_defaults(fetch_currents),
+    validator=validate_currents_args,
+    key_required=True
+)
@@ -1,7 +1,7 @@
 # scripts/apis/gnews_api.py
 
 import os
-from scripts.utils.helpers import fetch_news
+from scripts.apis.provider_client import ProviderClient, signature_arg_names, signature_defaults
 
 def fetch_gnews(
     q,
@@ -14,7 +14,8 @@ def fetch_gnews(
     to=None,
     sortby='publishedAt',
     page=1,
-    expand=None
+    expand=None,
+    **fetch_options
 ):
     """
     Fetch news from GNews API using the 'search' endpoint.
@@ -67,27 +68,34 @@ def fetch_gnews(
             Set to 'content' to enable.
             Example: expand='content'
 
+        **fetch_options: Extra keyword arguments forwarded to fetch_news (e.g. stats).
+
     Returns:
         dict: JSON response from the API.
     """
-    url = "https://gnews.io/api/v4/search"
-    params = {
-        'token': os.getenv("GNEWS_API_KEY"),
-        'q': q,
-        'lang': lang,
-        'country': country,
-        'max': max,
-        'in': in_param,
-        'nullable': nullable,
-        'from': from_param,
-        'to': to,
-        'sortby': sortby,
-        'page': page,
-        'expand': expand
-    }
-    params = {k: v for k, v in params.items() if v is not None}
-
-    # Get the path of this script
-    api_script_path = os.path.abspath(__file__)
-
-    return fetch_news(url, params, 'gnews', api_script_path)
\ No newline at end of file
+    return gnews_client.fetch(
+        q=q,
+        lang=lang,
+        country=country,
+        max=max,
+        in_param=in_param,
+        nullable=nullable,
+        from_param=from_param,
+        to=to,
+        sortby=sortby,
+        page=page,
+        expand=expand,
+        **fetch_options
+    )
+
+
+gnews_client = ProviderClient(
+    'gnews',
+    "https://gnews.io/api/v4/search",
+    os.path.abspath(__file__),
+    api_key_env="GNEWS_API_KEY",
+    api_key_param='token',
+    arg_names=signature_arg_names(fetch_gnews),
+    param_names={'in_param': 'in', 'from_param': 'from'},
+    defaults=signature_defaults(fetch_gnews)
+)
@@ -1,8 +1,10 @@
 import os
-from scripts.utils.helpers import fetch_news
+from scripts.apis.provider_client import ProviderClient, signature_arg_names, signature_defaults
+
+VALID_SORT_OPTIONS = ('published_desc', 'published_asc', 'popularity')
 
 def fetch_mediastack(keywords=None, sources=None, categories=None, countries=None, languages=None,
-                     date=None, sort=None, limit=None, offset=None):
+                     date=None, sort=None, limit=None, offset=None, **fetch_options):
     """
     Fetch news articles from the Mediastack API.
 
@@ -58,6 +60,8 @@ def fetch_mediastack(keywords=None, sources=None, categories=None, countries=Non
 
         offset (int, optional): Specify the pagination offset value. Default is 0.
 
+        **fetch_options: Extra keyword arguments forwarded to fetch_news (e.g. stats).
+
     Returns:
         dict: JSON response from the API.
 
@@ -76,34 +80,52 @@ def fetch_mediastack(keywords=None, sources=None, categories=None, countries=Non
             fetch_mediastack(keywords='artificial intelligence', date='2021-01-01,2021-12-31')
 
     """
-    url = "http://api.mediastack.com/v1/news"
-    access_key = os.getenv("MEDIASTACK_API_KEY")
-    if not access_key:
-        raise ValueError("API access key not found. Set 'MEDIASTACK_API_KEY' environment variable.")
+    return mediastack_client.fetch(
+        keywords=keywords,
+        sources=sources,
+        categories=categories,
+        countries=countries,
+        languages=languages,
+        date=date,
+        sort=sort,
+        limit=limit,
+        offset=offset,
+        **fetch_options
+    )
+
+
+def validate_mediastack_args(args):
+    """
+    Validate Mediastack arguments.
 
+    Args:
+        args (dict): Arguments of fetch_mediastack.
+
+    Returns:
+        dict: The arguments.
+
+    Raises:
+        ValueError: If invalid parameters are provided.
+    """
+    limit = args.get('limit')
     if limit is not None and limit > 100:
         raise ValueError("Limit cannot exceed 100.")
 
-    valid_sort_options = ['published_desc', 'published_asc', 'popularity']
-    if sort is not None and sort not in valid_sort_options:
-        raise ValueError(f"Invalid sort option. Choose from {valid_sort_options}.")
-
-    params = {
-        'access_key': access_key,
-        'keywords': keywords,
-        'sources': sources,
-        'categories': categories,
-        'countries': countries,
-        'languages': languages,
-        'date': date,
-        'sort': sort,
-        'limit': limit,
-        'offset': offset
-    }
-    params = {k: v for k, v in params.items() if v is not None}
-    
-    # Get the path of this script
-    api_script_path = os.path.abspath(__file__)
-    
-    
-    return fetch_news(url, params, 'mediastack', api_script_path)
+    sort = args.get('sort')
+    if sort is not None and sort not in VALID_SORT_OPTIONS:
+        raise ValueError(f"Invalid sort option. Choose from {list(VALID_SORT_OPTIONS)}.")
+
+    return args
+
+
+mediastack_client = ProviderClient(
+    'mediastack',
+    "http://api.mediastack.com/v1/news",
+    os.path.abspath(__file__),
+    api_key_env="MEDIASTACK_API_KEY",
+    api_key_param='access_key',
+    arg_names=signature_arg_names(fetch_mediastack),
+    defaults=signature_defaults(fetch_mediastack),
+    validator=validate_mediastack_args,
+    key_required=True
+)
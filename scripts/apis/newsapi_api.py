@@ -1,7 +1,7 @@
 # scripts/apis/newsapi_api.py
 
 import os
-from scripts.utils.helpers import fetch_news
+from scripts.apis.provider_client import ProviderClient, signature_arg_names, signature_defaults
 
 def fetch_newsapi(
     q=None,
@@ -14,7 +14,8 @@ def fetch_newsapi(
     language=None,
     sortBy=None,
     pageSize=None,
-    page=None
+    page=None,
+    **fetch_options
 ):
     """
     Fetch news from the 'everything' endpoint of NewsAPI.org.
@@ -64,30 +65,34 @@ def fetch_newsapi(
             Default: 1
             Example: page=2
 
+        **fetch_options: Extra keyword arguments forwarded to fetch_news (e.g. stats).
+
     Returns:
         dict: JSON response from the API.
     """
-    base_url = "https://newsapi.org/v2/everything"
-    
-    params = {
-        'apiKey': os.getenv("NEWSAPI_KEY"),
-        'q': q,
-        'searchIn': searchIn,
-        'sources': sources,
-        'domains': domains,
-        'excludeDomains': excludeDomains,
-        'from': from_param,
-        'to': to,
-        'language': language,
-        'sortBy': sortBy,
-        'pageSize': pageSize,
-        'page': page
-    }
-    
-    # Remove None values from params
-    params = {k: v for k, v in params.items() if v is not None}
-
-    # Get the path of this script
-    api_script_path = os.path.abspath(__file__)
-
-    return fetch_news(base_url, params, 'newsapi', api_script_path)
\ No newline at end of file
+    return newsapi_client.fetch(
+        q=q,
+        searchIn=searchIn,
+        sources=sources,
+        domains=domains,
+        excludeDomains=excludeDomains,
+        from_param=from_param,
+        to=to,
+        language=language,
+        sortBy=sortBy,
+        pageSize=pageSize,
+        page=page,
+        **fetch_options
+    )
+
+
+newsapi_client = ProviderClient(
+    'newsapi',
+    "https://newsapi.org/v2/everything",
+    os.path.abspath(__file__),
+    api_key_env="NEWSAPI_KEY",
+    api_key_param='apiKey',
+    arg_names=signature_arg_names(fetch_newsapi),
+    param_names={'from_param': 'from'},
+    defaults=signature_defaults(fetch_newsapi)
+)
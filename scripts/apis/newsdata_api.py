@@ -62,8 +62,11 @@ You can use these categories to filter news based on your interests.
 """
 
 import os
-from scripts.utils.helpers import fetch_news
-from scripts.utils.process_fetched_data import process_and_insert_data
+from scripts.apis.provider_client import ProviderClient, signature_arg_names, signature_defaults
+
+VALID_ENDPOINTS = frozenset(['latest', 'archive'])
+ARCHIVE_REQUIRED_ARGS = ('q', 'qInTitle', 'qInMeta', 'domain', 'country', 'category', 'language',
+                         'full_content', 'image', 'video', 'prioritydomain', 'domainurl')
 
 def fetch_newsdata(
     endpoint,
@@ -92,7 +95,8 @@ def fetch_newsdata(
     video=None,
     removeduplicate=None,
     size=None,
-    page=None
+    page=None,
+    **fetch_options
 ):
     """
     Fetch news from NewsData.io API.
@@ -213,74 +217,100 @@ def fetch_newsdata(
         page (str, optional): Use to navigate to the next page in paginated results.
             Example: page='XXXPPPXXXXXXXXXX'
 
+        **fetch_options: Extra keyword arguments forwarded to fetch_news (e.g. stats).
+
     Returns:
         dict: JSON response from the API.
 
     Raises:
         ValueError: If invalid parameters are provided.
     """
-    if endpoint not in ['latest', 'archive']:
+    return newsdata_client.fetch(
+        endpoint=endpoint,
+        id=id,
+        q=q,
+        qInTitle=qInTitle,
+        qInMeta=qInMeta,
+        timeframe=timeframe,
+        from_date=from_date,
+        to_date=to_date,
+        country=country,
+        category=category,
+        excludecategory=excludecategory,
+        language=language,
+        tag=tag,
+        sentiment=sentiment,
+        region=region,
+        domain=domain,
+        domainurl=domainurl,
+        excludedomain=excludedomain,
+        excludefield=excludefield,
+        prioritydomain=prioritydomain,
+        timezone=timezone,
+        full_content=full_content,
+        image=image,
+        video=video,
+        removeduplicate=removeduplicate,
+        size=size,
+        page=page,
+        **fetch_options
+    )
+
+
+def validate_newsdata_args(args):
+    """
+    Validate and normalize NewsData.io arguments.
+
+    Args:
+        args (dict): Arguments of fetch_newsdata.
+
+    Returns:
+        dict: The normalized arguments.
+
+    Raises:
+        ValueError: If invalid parameters are provided.
+    """
+    endpoint = args.get('endpoint')
+    if endpoint not in VALID_ENDPOINTS:
         raise ValueError("Invalid endpoint. Choose 'latest' or 'archive'.")
 
     # Validate exclusive parameters
-    if sum(bool(param) for param in [q, qInTitle, qInMeta]) > 1:
+    if sum(bool(args.get(param)) for param in ('q', 'qInTitle', 'qInMeta')) > 1:
         raise ValueError("You can use only one of 'q', 'qInTitle', or 'qInMeta' in the same query.")
 
-    if category and excludecategory:
+    if args.get('category') and args.get('excludecategory'):
         raise ValueError("You cannot use 'category' and 'excludecategory' simultaneously.")
 
     if endpoint == 'latest':
-        if from_date or to_date:
+        if args.get('from_date') or args.get('to_date'):
             raise ValueError("'from_date' and 'to_date' are only valid for the 'archive' endpoint.")
     elif endpoint == 'archive':
-        if timeframe or removeduplicate:
+        if args.get('timeframe') or args.get('removeduplicate'):
             raise ValueError("'timeframe' and 'removeduplicate' are only valid for the 'latest' endpoint.")
         # Ensure at least one required parameter is provided for 'archive'
-        if not any([q, qInTitle, qInMeta, domain, country, category, language, full_content, image, video, prioritydomain, domainurl]):
-            raise ValueError("For 'archive' endpoint, at least one of ['q','qInTitle','qInMeta','domain','country','category','language','full_content','image','video','prioritydomain','domainurl'] must be provided.")
+        if not any(args.get(param) for param in ARCHIVE_REQUIRED_ARGS):
+            raise ValueError(f"For 'archive' endpoint, at least one of {list(ARCHIVE_REQUIRED_ARGS)} must be provided.")
 
     # Handle category parameter
-    if isinstance(category, list):
-        category = ','.join(filter(None, category))  # Join non-empty strings
+    category = args.get('category')
+    if isinstance(category, (set, frozenset)):
+        category = sorted(category)
+    if isinstance(category, (list, tuple)):
+        args['category'] = ','.join(filter(None, category))  # Join non-empty strings
     elif isinstance(category, str):
-        category = category.strip()  # Remove any leading/trailing whitespace
-
-    url = f"https://newsdata.io/api/1/{endpoint}"
-    params = {
-        'apikey': os.getenv("NEWSDATA_API_KEY"),
-        'id': id,
-        'q': q,
-        'qInTitle': qInTitle,
-        'qInMeta': qInMeta,
-        'timeframe': timeframe if endpoint == 'latest' else None,
-        'from_date': from_date if endpoint == 'archive' else None,
-        'to_date': to_date if endpoint == 'archive' else None,
-        'country': country,
-        'category': category,
-        'excludecategory': excludecategory,
-        'language': language,
-        'tag': tag,
-        'sentiment': sentiment,
-        'region': region,
-        'domain': domain,
-        'domainurl': domainurl,
-        'excludedomain': excludedomain,
-        'excludefield': excludefield,
-        'prioritydomain': prioritydomain,
-        'timezone': timezone,
-        'full_content': full_content,
-        'image': image,
-        'video': video,
-        'removeduplicate': removeduplicate if endpoint == 'latest' else None,
-        'size': size,
-        'page': page,
-    }
-    # Remove parameters that are None or empty strings
-    params = {k: v for k, v in params.items() if v not in [None, '']}
-
-
-    # Get the path of this script
-    api_script_path = os.path.abspath(__file__)
-
-    # Fetch the news data
-    return fetch_news(url, params, 'newsdata', api_script_path)
\ No newline at end of file
+        args['category'] = category.strip()  # Remove any leading/trailing whitespace
+
+    return args
+
+
+newsdata_client = ProviderClient(
+    'newsdata',
+    "https://newsdata.io/api/1/{endpoint}",
+    os.path.abspath(__file__),
+    api_key_env="NEWSDATA_API_KEY",
+    api_key_param='apikey',
+    arg_names=signature_arg_names(fetch_newsdata),
+    param_names={'endpoint': None},
+    defaults=signature_defaults(fetch_newsdata),
+    validator=validate_newsdata_args
+)
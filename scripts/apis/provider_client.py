@@ -0,0 +1,183 @@
+# scripts\apis\provider_client.py
+
+import os
+import inspect
+import string
+from collections import namedtuple
+from urllib.parse import urlsplit
+from scripts.utils.helpers import fetch_news
+
+# Everything fetch_news needs to perform a request
+RequestSpec = namedtuple('RequestSpec', ['url', 'params', 'api_name', 'api_script_path'])
+
+def apply_base_url(url, api_name):
+    """
+    Redirect a provider URL to PROVIDER_BASE_URL, if set (e.g. a local mock server).
+
+    The provider name is prepended to the original path so one server can serve
+    every provider: https://newsdata.io/api/1/latest becomes
+    {PROVIDER_BASE_URL}/newsdata/api/1/latest.
+
+    Args:
+        url (str): The provider's endpoint URL.
+        api_name (str): Name of the API.
+
+    Returns:
+        str: The URL to use.
+    """
+    base_url = os.getenv("PROVIDER_BASE_URL")
+    if not base_url:
+        return url
+    return f"{base_url.rstrip('/')}/{api_name}{urlsplit(url).path}"
+
+
+# Keyword arguments handled by fetch_news rather than sent to the API
+FETCH_OPTIONS = ('max_retries', 'stats', 'process', 'track', 'stream')
+
+
+def signature_arg_names(func):
+    """
+    Get the names of the explicit arguments of a function.
+
+    Args:
+        func (callable): The function to inspect.
+
+    Returns:
+        frozenset: Argument names, excluding *args and **kwargs.
+    """
+    return frozenset(
+        name for name, param in inspect.signature(func).parameters.items()
+        if param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+    )
+
+
+def signature_defaults(func):
+    """
+    Get the non-None default argument values of a function.
+
+    Args:
+        func (callable): The function to inspect.
+
+    Returns:
+        dict: Argument name to default value.
+    """
+    return {
+        name: param.default for name, param in inspect.signature(func).parameters.items()
+        if param.default is not param.empty and param.default is not None
+    }
+
+
+class ProviderClient:
+    """
+    Request builder for one news provider.
+
+    Everything that does not depend on the request (endpoint URL, API key, script path,
+    static defaults, parameter renames, accepted arguments and validator) is resolved
+    once, so building a request for an interest only merges, validates and filters a
+    small dict.
+    """
+
+    def __init__(self, api_name, url, api_script_path, api_key_env, api_key_param,
+                 arg_names=None, param_names=None, defaults=None, validator=None, key_required=False):
+        """
+        Args:
+            api_name (str): Name of the API, as tracked in the api_info table.
+            url (str): Endpoint URL. May contain str.format fields filled from the arguments (e.g. '{endpoint}').
+            api_script_path (str): Path to the provider's API script file.
+            api_key_env (str): Environment variable holding the API key.
+            api_key_param (str): Name of the request parameter carrying the API key.
+            arg_names (iterable, optional): Accepted argument names. Unknown arguments raise TypeError.
+            param_names (dict, optional): Argument name to API parameter name. Map to None for
+                arguments used only in the URL.
+            defaults (dict, optional): Default argument values.
+            validator (callable, optional): Called with the merged arguments dict; raises ValueError
+                on invalid combinations and returns the (possibly normalized) dict.
+            key_required (bool, optional): If True, building a request without an API key raises ValueError.
+        """
+        self.api_name = api_name
+        self.endpoint_url = url
+        self.url = apply_base_url(url, api_name)
+        self.api_script_path = api_script_path
+        self.api_key_env = api_key_env
+        self.api_key_param = api_key_param
+        self.arg_names = frozenset(arg_names) if arg_names is not None else None
+        self.param_names = param_names or {}
+        self.defaults = defaults or {}
+        self.validator = validator
+        self.key_required = key_required
+        self._api_key = None
+        self._url_fields = [name for _, name, _, _ in string.Formatter().parse(self.url) if name]
+
+    @property
+    def api_key(self):
+        """str or None: The API key, read from the environment on first use."""
+        if self._api_key is None:
+            self._api_key = os.getenv(self.api_key_env)
+        return self._api_key
+
+    def clone(self):
+        """
+        Create a fresh copy of the client, re-reading the API key on first use.
+
+        Returns:
+            ProviderClient: The new client.
+        """
+        return ProviderClient(
+            self.api_name, self.endpoint_url, self.api_script_path, self.api_key_env, self.api_key_param,
+            arg_names=self.arg_names, param_names=self.param_names, defaults=self.defaults,
+            validator=self.validator, key_required=self.key_required
+        )
+
+    def request_spec(self, **kwargs):
+        """
+        Build the request for the given arguments.
+
+        Args:
+            **kwargs: Provider arguments, as accepted by the provider's fetch function.
+
+        Returns:
+            RequestSpec: The request to perform.
+
+        Raises:
+            TypeError: If an unknown argument is given.
+            ValueError: If the arguments are invalid or a required API key is missing.
+        """
+        if self.arg_names is not None:
+            unknown = kwargs.keys() - self.arg_names
+            if unknown:
+                raise TypeError(f"Unexpected arguments for {self.api_name}: {sorted(unknown)}")
+
+        api_key = self.api_key
+        if self.key_required and not api_key:
+            raise ValueError(f"API key not found. Set '{self.api_key_env}' environment variable.")
+
+        args = {**self.defaults, **kwargs} if self.defaults else kwargs
+        if self.validator is not None:
+            args = self.validator(args)
+
+        params = {self.api_key_param: api_key}
+        for name, value in args.items():
+            if value is None or value == '':
+                continue
+            param_name = self.param_names.get(name, name)
+            if param_name is not None:
+                params[param_name] = value
+        if api_key is None:
+            del params[self.api_key_param]
+
+        url = self.url.format(**{field: args[field] for field in self._url_fields}) if self._url_fields else self.url
+        return RequestSpec(url, params, self.api_name, self.api_script_path)
+
+    def fetch(self, **kwargs):
+        """
+        Build and perform a request.
+
+        Args:
+            **kwargs: Provider arguments, plus any of FETCH_OPTIONS which are passed to fetch_news.
+
+        Returns:
+            dict or None: JSON response from the API or None if failed.
+        """
+        fetch_options = {name: kwargs.pop(name) for name in FETCH_OPTIONS if name in kwargs}
+        spec = self.request_spec(**kwargs)
+        return fetch_news(spec.url, spec.params, spec.api_name, spec.api_script_path, **fetch_options)
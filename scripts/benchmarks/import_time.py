@@ -0,0 +1,107 @@
+# scripts\benchmarks\import_time.py
+
+"""
+Measure the startup cost of the project's modules.
+
+Each module is imported in a fresh interpreter, several times, and the best and
+median wall-clock import times are reported along with the heavy side effects the
+import triggered (requests imported, database pool created, log files opened).
+
+Usage:
+    python -m scripts.benchmarks.import_time
+    python -m scripts.benchmarks.import_time --repeat 10 scripts.utils.helpers main
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+DEFAULT_MODULES = [
+    'scripts.utils.logger_config',
+    'scripts.utils.db_connection',
+    'scripts.utils.helpers',
+    'scripts.utils.get_interests',
+    'scripts.apis',
+    'main',
+]
+
+# Runs in the child interpreter; prints a JSON line with the measurements
+_PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+db_connection = sys.modules.get('scripts.utils.db_connection')
+print(json.dumps({{
+    'seconds': elapsed,
+    'requests_imported': 'requests' in sys.modules,
+    'pool_created': getattr(db_connection, 'connection_pool', None) is not None,
+    'open_files': len(os.listdir('/proc/self/fd')) if os.path.isdir('/proc/self/fd') else None,
+}}))
+"""
+
+
+def measure_import(module, repeat=5):
+    """
+    Import a module in fresh interpreters and collect the timings.
+
+    Args:
+        module (str): Dotted module name.
+        repeat (int, optional): Number of fresh interpreters to use. Defaults to 5.
+
+    Returns:
+        dict: Best and median import time in milliseconds and the side effects of the last run,
+        or an 'error' key if the import failed.
+    """
+    timings = []
+    result = {}
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module)],
+            cwd=project_root, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            return {'module': module, 'error': proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed'}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(result['seconds'] * 1000)
+
+    return {
+        'module': module,
+        'best_ms': min(timings),
+        'median_ms': statistics.median(timings),
+        'requests_imported': result['requests_imported'],
+        'pool_created': result['pool_created'],
+        'open_files': result['open_files'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure module import times in fresh interpreters.")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = [measure_import(module, args.repeat) for module in args.modules]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'module':32} {'best ms':>9} {'median ms':>10} {'requests':>9} {'db pool':>8} {'fds':>5}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['module']:32} ERROR: {r['error']}")
+            continue
+        print(f"{r['module']:32} {r['best_ms']:9.1f} {r['median_ms']:10.1f} "
+              f"{str(r['requests_imported']):>9} {str(r['pool_created']):>8} {str(r['open_files']):>5}")
+
+
+if __name__ == "__main__":
+    main()
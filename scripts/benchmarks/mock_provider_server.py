@@ -0,0 +1,468 @@
+# scripts\benchmarks\mock_provider_server.py
+
+"""
+Local HTTP server impersonating the news providers, for offline benchmarks.
+
+Requests are routed on the first path segment, which is the provider name added by
+PROVIDER_BASE_URL (see scripts/apis/provider_client.py), e.g. /newsdata/api/1/latest.
+Each provider answers with a response in its own format: either a recorded payload
+loaded from '<fixtures_dir>/<provider>.json' or a synthetic one whose article titles
+contain the terms of the request's query (so batched queries can be split back).
+Titles are made unique per request so every response produces new rows.
+
+Latency and error rates are configurable, to measure the fetch pipeline under slow
+or failing providers without spending real quota.
+
+The article, image and source URLs of synthetic responses point back to the server
+under /site/, where HEAD and GET requests are answered like a news site would
+(a fraction of the images being broken), for the enrichment stage (see
+scripts/utils/enrichment.py).
+
+Usage:
+    python -m scripts.benchmarks.mock_provider_server --port 8765 --latency-ms 50 --error-rate 0.05
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+PROVIDERS = ('newsdata', 'newsapi', 'gnews', 'mediastack', 'currents')
+
+# Key of the article list in each provider's response
+RESULTS_KEYS = {
+    'newsdata': 'results',
+    'newsapi': 'articles',
+    'gnews': 'articles',
+    'mediastack': 'data',
+    'currents': 'news',
+}
+
+# Parameters setting the number of articles of a response, per provider
+PAGE_SIZE_PARAMS = {
+    'newsdata': 'size',
+    'newsapi': 'pageSize',
+    'gnews': 'max',
+    'mediastack': 'limit',
+    'currents': 'page_size',
+}
+
+
+def load_fixtures(fixtures_dir):
+    """
+    Load recorded provider responses.
+
+    Args:
+        fixtures_dir (str or None): Directory holding '<provider>.json' files. Missing files are skipped.
+
+    Returns:
+        dict: Provider name to recorded response.
+    """
+    fixtures = {}
+    if not fixtures_dir:
+        return fixtures
+    for provider in PROVIDERS:
+        path = os.path.join(fixtures_dir, f"{provider}.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                fixtures[provider] = json.load(f)
+    return fixtures
+
+
+def query_terms(query):
+    """
+    Split a (possibly OR-combined) query into its sub-queries.
+
+    Args:
+        query (str): The 'q' parameter, e.g. '(climate change) OR wildfire'.
+
+    Returns:
+        list: The sub-queries, without parentheses.
+    """
+    if not query:
+        return ['news']
+    return [part.strip().strip('()').strip() for part in query.split(' OR ') if part.strip()] or ['news']
+
+
+def synthetic_article(provider, terms, request_id, index, published, site_url='https://example.com'):
+    """
+    Build one article in a provider's response format.
+
+    Args:
+        provider (str): Name of the provider.
+        terms (list): Sub-queries of the request; the article matches one of them.
+        request_id (int): Sequence number of the request.
+        index (int): Position of the article in the response.
+        published (datetime): Publication time.
+        site_url (str, optional): Site the article, image and source URLs point to.
+
+    Returns:
+        dict: The article.
+    """
+    term = terms[index % len(terms)]
+    title = f"{term} report {request_id}-{index}"
+    description = f"Coverage of {term} from the benchmark feed."
+    url = f"{site_url}/{provider}/{request_id}/{index}"
+    content = f"{description} " * 20
+
+    if provider == 'newsdata':
+        return {
+            'article_id': f"{request_id:08x}{index:04x}",
+            'title': title,
+            'link': url,
+            'keywords': term.split(),
+            'creator': ['Benchmark Desk'],
+            'video_url': None,
+            'description': description,
+            'content': content,
+            'pubDate': published.strftime('%Y-%m-%d %H:%M:%S'),
+            'pubDateTZ': 'UTC',
+            'image_url': f"{url}.jpg",
+            'source_id': 'benchmark',
+            'source_priority': 1000 + index,
+            'source_name': 'Benchmark',
+            'source_url': site_url,
+            'source_icon': None,
+            'language': 'english',
+            'country': ['united states of america'],
+            'category': ['top'],
+            'ai_tag': 'ONLY AVAILABLE IN PROFESSIONAL AND CORPORATE PLANS',
+            'sentiment': 'ONLY AVAILABLE IN PROFESSIONAL AND CORPORATE PLANS',
+            'sentiment_stats': 'ONLY AVAILABLE IN PROFESSIONAL AND CORPORATE PLANS',
+            'ai_region': 'ONLY AVAILABLE IN CORPORATE PLANS',
+            'ai_org': 'ONLY AVAILABLE IN CORPORATE PLANS',
+            'duplicate': False,
+        }
+    if provider == 'newsapi':
+        return {
+            'source': {'id': 'benchmark', 'name': 'Benchmark'},
+            'author': 'Benchmark Desk',
+            'title': title,
+            'description': description,
+            'url': url,
+            'urlToImage': f"{url}.jpg",
+            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': content,
+        }
+    if provider == 'gnews':
+        return {
+            'title': title,
+            'description': description,
+            'content': content,
+            'url': url,
+            'image': f"{url}.jpg",
+            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'source': {'name': 'Benchmark', 'url': site_url},
+        }
+    if provider == 'mediastack':
+        return {
+            'author': 'Benchmark Desk',
+            'title': title,
+            'description': description,
+            'url': url,
+            'source': 'benchmark',
+            'image': f"{url}.jpg",
+            'category': 'general',
+            'language': 'en',
+            'country': 'us',
+            'published_at': published.strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+        }
+    return {
+        'id': f"{request_id}-{index}",
+        'title': title,
+        'description': description,
+        'url': url,
+        'author': 'Benchmark Desk',
+        'image': f"{url}.jpg",
+        'language': 'en',
+        'category': ['general'],
+        'published': published.strftime('%Y-%m-%d %H:%M:%S +0000'),
+    }
+
+
+def wrap_articles(provider, articles):
+    """
+    Wrap articles in a provider's response envelope.
+
+    Args:
+        provider (str): Name of the provider.
+        articles (list): The articles.
+
+    Returns:
+        dict: The response.
+    """
+    if provider == 'newsdata':
+        return {'status': 'success', 'totalResults': len(articles), 'results': articles, 'nextPage': None}
+    if provider == 'newsapi':
+        return {'status': 'ok', 'totalResults': len(articles), 'articles': articles}
+    if provider == 'gnews':
+        return {'totalArticles': len(articles), 'articles': articles}
+    if provider == 'mediastack':
+        return {'pagination': {'limit': len(articles), 'offset': 0, 'count': len(articles),
+                               'total': len(articles)}, 'data': articles}
+    return {'status': 'ok', 'news': articles, 'page': 1}
+
+
+def replay_fixture(provider, fixture, request_id):
+    """
+    Replay a recorded response, making its article titles and IDs unique to the request.
+
+    Args:
+        provider (str): Name of the provider.
+        fixture (dict): The recorded response.
+        request_id (int): Sequence number of the request.
+
+    Returns:
+        dict: The response.
+    """
+    results_key = RESULTS_KEYS[provider]
+    articles = []
+    for index, article in enumerate(fixture.get(results_key) or []):
+        article = dict(article)
+        article['title'] = f"{article.get('title') or ''} [{request_id}-{index}]"
+        if 'article_id' in article:
+            article['article_id'] = f"{article['article_id']}-{request_id}"
+        articles.append(article)
+    return {**fixture, results_key: articles}
+
+
+class MockProviderServer:
+    """
+    Threaded HTTP server answering provider requests, with injected latency and errors.
+
+    Counters of requests, errors and articles served are kept for the benchmark report.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 rate_limit_rate=0.0, articles_per_response=10, fixtures_dir=None, seed=None, max_concurrency=0,
+                 broken_image_rate=0.0):
+        """
+        Args:
+            host (str, optional): Interface to listen on. Defaults to 127.0.0.1.
+            port (int, optional): Port to listen on. Defaults to 0 (any free port).
+            latency_ms (float, optional): Delay added to every response, in milliseconds.
+            jitter_ms (float, optional): Random extra delay, up to this many milliseconds.
+            error_rate (float, optional): Fraction of requests answered with HTTP 500.
+            rate_limit_rate (float, optional): Fraction of requests answered with HTTP 429 and Retry-After: 1.
+            articles_per_response (int, optional): Articles in synthetic responses that do not set their
+                page size (see PAGE_SIZE_PARAMS). Defaults to 10.
+            fixtures_dir (str, optional): Directory of recorded responses, see load_fixtures.
+            seed (int, optional): Seed of the latency and error random generator.
+            max_concurrency (int, optional): Requests a provider serves at the same time; requests
+                beyond it are answered with HTTP 429 (without Retry-After). Defaults to 0 (unlimited).
+            broken_image_rate (float, optional): Fraction of the image URLs under /site/ answered with HTTP 404.
+        """
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.articles_per_response = articles_per_response
+        self.max_concurrency = max_concurrency
+        self.broken_image_rate = broken_image_rate
+        self._in_flight = {}
+        self.fixtures = load_fixtures(fixtures_dir)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_id = 0
+        self.counters = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'overloaded': 0, 'articles': 0,
+                         'site_requests': 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """str: URL to use as PROVIDER_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.handle(self)
+
+            def do_HEAD(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _next_request(self):
+        with self._lock:
+            self._request_id += 1
+            self.counters['requests'] += 1
+            roll = self._random.random()
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+            return self._request_id, roll, delay
+
+    def build_response(self, provider, params, request_id):
+        """
+        Build the response body of a successful request.
+
+        Args:
+            provider (str): Name of the provider.
+            params (dict): Query parameters of the request.
+            request_id (int): Sequence number of the request.
+
+        Returns:
+            dict: The response.
+        """
+        if provider in self.fixtures:
+            return replay_fixture(provider, self.fixtures[provider], request_id)
+        terms = query_terms(params.get('q') or params.get('keywords'))
+        now = datetime.utcnow().replace(microsecond=0)
+        articles = [
+            synthetic_article(provider, terms, request_id, index, now - timedelta(minutes=index),
+                              f"{self.base_url}/site")
+            for index in range(int(params.get(PAGE_SIZE_PARAMS.get(provider)) or self.articles_per_response))
+        ]
+        return wrap_articles(provider, articles)
+
+    def _enter(self, provider):
+        with self._lock:
+            self._in_flight[provider] = self._in_flight.get(provider, 0) + 1
+            if self.max_concurrency and self._in_flight[provider] > self.max_concurrency:
+                self.counters['overloaded'] += 1
+                return False
+            return True
+
+    def _exit(self, provider):
+        with self._lock:
+            self._in_flight[provider] -= 1
+
+    def handle(self, request):
+        """Answer one request on the given handler."""
+        parts = urlsplit(request.path)
+        provider = parts.path.strip('/').split('/', 1)[0]
+        if provider in ('site', ''):
+            self._respond_site(request, parts.path)
+            return
+        admitted = self._enter(provider)
+        try:
+            self._respond(request, provider, parts, admitted)
+        finally:
+            self._exit(provider)
+
+    def _respond(self, request, provider, parts, admitted):
+        request_id, roll, delay = self._next_request()
+        params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        if not admitted:
+            self._send(request, 429, {'status': 'error', 'message': 'Too many concurrent requests'}, {})
+            return
+        if delay:
+            time.sleep(delay)
+
+        if provider not in PROVIDERS:
+            status, body, headers = 404, {'status': 'error', 'message': f"Unknown provider '{provider}'"}, {}
+        elif roll < self.rate_limit_rate:
+            status, body, headers = 429, {'status': 'error', 'message': 'Too many requests'}, {'Retry-After': '1'}
+            with self._lock:
+                self.counters['rate_limited'] += 1
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status, body, headers = 500, {'status': 'error', 'message': 'Internal server error'}, {}
+            with self._lock:
+                self.counters['errors'] += 1
+        else:
+            status, body, headers = 200, self.build_response(provider, params, request_id), {}
+            with self._lock:
+                self.counters['articles'] += len(body.get(RESULTS_KEYS[provider]) or [])
+        self._send(request, status, body, headers)
+
+    def _respond_site(self, request, path):
+        # Home page, article pages and images of the synthetic articles' site
+        with self._lock:
+            self.counters['site_requests'] += 1
+        if path.endswith('.jpg'):
+            # Whether an image is broken is stable across requests
+            broken = (zlib.crc32(path.encode('utf-8')) % 10000) < self.broken_image_rate * 10000
+            status, content_type, body = (404, 'text/html', b'Not found') if broken else (200, 'image/jpeg', b'\xff' * 2048)
+        else:
+            status, content_type, body = 200, 'text/html', b'<html><title>Benchmark</title></html>'
+        request.send_response(status)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        if request.command != 'HEAD':
+            request.wfile.write(body)
+
+    def _send(self, request, status, body, headers):
+        payload = json.dumps(body).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def serve_forever(self):
+        """Serve requests in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-provider-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve mock news provider responses.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Random extra delay, up to this value")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of HTTP 429 responses")
+    parser.add_argument('--articles', type=int, default=10, help="Articles per synthetic response")
+    parser.add_argument('--fixtures', help="Directory of recorded <provider>.json responses")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--max-concurrency', type=int, default=0,
+                        help="Concurrent requests served per provider, 429 beyond (0 for unlimited)")
+    parser.add_argument('--broken-image-rate', type=float, default=0.0, help="Fraction of broken image URLs")
+    args = parser.parse_args()
+
+    server = MockProviderServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                                args.rate_limit_rate, args.articles, args.fixtures, args.seed, args.max_concurrency,
+                                args.broken_image_rate)
+    print(f"Serving mock providers on {server.base_url} (set PROVIDER_BASE_URL to this URL)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+# scripts\benchmarks\run_benchmark.py
+
+"""
+End-to-end offline benchmark of the fetch pipeline.
+
+A local mock provider server (mock_provider_server.py) stands in for the news APIs
+and the embedded SQLite storage backend for MySQL, so main.main runs end to
+end (requests, retries, api_calls logging, usage tracking, article inserts, JSON
+output) without network access or API quota.
+
+Each execution mode runs in a fresh interpreter against a fresh database, and the
+report gives for each one: requests/sec, articles inserted/sec, p50/p95 request
+latency (as seen by the client) and peak RSS.
+
+Modes:
+    providers  main() with explicit parameters for the five providers, --iterations times
+    interests  main(fetch_interests_flag=True): one request per interest and provider
+    batched    main(fetch_interests_flag=True, batch_queries=True)
+    sharded    main(fetch_interests_flag=True) once per shard, with per-shard quotas
+    ranked     main(fetch_interests_flag=True, rank_results=True)
+    concurrent main(fetch_interests_flag=True, workers=--workers), with adaptive per-provider concurrency
+
+Usage:
+    python -m scripts.benchmarks.run_benchmark
+    python -m scripts.benchmarks.run_benchmark --modes interests batched --interests 100 --latency-ms 80 --error-rate 0.05
+    python -m scripts.benchmarks.run_benchmark --modes interests concurrent --workers 16 --max-concurrency 6
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.benchmarks.mock_provider_server import MockProviderServer, PROVIDERS  # noqa: E402
+
+MODES = ('providers', 'interests', 'batched', 'sharded', 'ranked', 'concurrent')
+
+INTEREST_APIS = ['newsdata', 'newsapi', 'gnews']
+
+# Every provider client reads its key from one of these; the mock server ignores them
+API_KEY_ENVS = ('NEWSDATA_API_KEY', 'NEWSAPI_KEY', 'GNEWS_API_KEY', 'MEDIASTACK_API_KEY', 'CURRENTS_API_KEY')
+
+ARTICLE_TABLES = ('newsdata', 'newsapi', 'gnews')
+
+# Words the benchmark interests are built from
+TOPICS = [
+    'climate', 'election', 'inflation', 'football', 'vaccine', 'startup', 'wildfire', 'satellite',
+    'semiconductor', 'tourism', 'drought', 'banking', 'robotics', 'festival', 'shipping', 'energy',
+]
+
+
+def percentile(values, fraction):
+    """
+    Get a percentile of a list of values (nearest rank).
+
+    Args:
+        values (list): The values.
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        float or None: The percentile, None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """
+    Get the peak resident set size of the current process.
+
+    Returns:
+        float or None: Peak RSS in MiB, None where the resource module is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in KiB on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def seed_database(num_interests, daily_limit=None):
+    """
+    Fill the benchmark database with the APIs and active interests.
+
+    Args:
+        num_interests (int): Number of interests to create.
+        daily_limit (int, optional): Daily call limit of every API. Defaults to no limit.
+    """
+    from scripts.utils.db_connection import get_db_connection, close_connection
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO api_info (api_name_id, daily_limit) VALUES (%s, %s)",
+            [(api_name, daily_limit) for api_name in PROVIDERS]
+        )
+        cursor.executemany(
+            "INSERT INTO interests (id, formatted_interest, category, language, country) VALUES (%s, %s, %s, %s, %s)",
+            [
+                (interest_id,
+                 f"{TOPICS[interest_id % len(TOPICS)]} {TOPICS[(interest_id * 7 + 3) % len(TOPICS)]}",
+                 'top', 'en' if interest_id % 4 else 'pt', 'us' if interest_id % 4 else 'br')
+                for interest_id in range(1, num_interests + 1)
+            ]
+        )
+        conn.commit()
+        cursor.close()
+    finally:
+        close_connection(conn)
+
+
+def count_articles():
+    """
+    Count the rows of the article tables.
+
+    Returns:
+        dict: Table name to row count.
+    """
+    from scripts.utils.db_connection import get_db_connection, close_connection
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        counts = {}
+        for table in ARTICLE_TABLES:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table] = cursor.fetchone()[0]
+        cursor.close()
+        return counts
+    finally:
+        close_connection(conn)
+
+
+def provider_params(iteration):
+    """
+    Build the explicit parameters of the 'providers' mode for one iteration.
+
+    Args:
+        iteration (int): Iteration number, used to vary the queries.
+
+    Returns:
+        dict: Parameters keyed by API name.
+    """
+    query = f"benchmark topic {iteration}"
+    return {
+        'newsdata': {'endpoint': 'latest', 'q': query, 'language': 'en', 'country': 'us'},
+        'newsapi': {'q': query, 'searchIn': 'title,description', 'language': 'en'},
+        'gnews': {'q': query, 'lang': 'en', 'max': 10},
+        'mediastack': {'keywords': query, 'languages': 'en', 'limit': 30},
+        'currents': {'keywords': query, 'language': 'en'},
+    }
+
+
+def run_mode(mode, db_path, num_interests, iterations, num_shards, workers=1):
+    """
+    Run one execution mode in the current process and measure it.
+
+    Args:
+        mode (str): One of MODES.
+        db_path (str): Path of the SQLite database to create (must not exist).
+        num_interests (int): Number of interests in the database.
+        iterations (int): Runs of main() in 'providers' mode.
+        num_shards (int): Number of shards in 'sharded' mode.
+        workers (int, optional): Fetch threads in 'concurrent' mode. Defaults to 1.
+
+    Returns:
+        dict: The measurements.
+    """
+    import main as pipeline
+    from scripts.utils.storage import SQLiteBackend, set_storage_backend
+    from scripts.utils.helpers import get_http_session
+    from scripts.utils.concurrency import get_concurrency_stats
+
+    set_storage_backend(SQLiteBackend(db_path))
+    seed_database(num_interests)
+
+    latencies = []
+    statuses = {}
+
+    def record_response(response, *args, **kwargs):
+        latencies.append(response.elapsed.total_seconds())
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    get_http_session().hooks['response'].append(record_response)
+
+    started = time.perf_counter()
+    if mode == 'providers':
+        for iteration in range(iterations):
+            pipeline.main(apis_to_fetch=list(PROVIDERS), **provider_params(iteration))
+    elif mode == 'interests':
+        pipeline.main(fetch_interests_flag=True, apis_to_fetch=INTEREST_APIS)
+    elif mode == 'batched':
+        pipeline.main(fetch_interests_flag=True, apis_to_fetch=INTEREST_APIS, batch_queries=True)
+    elif mode == 'sharded':
+        for shard_index in range(num_shards):
+            pipeline.main(fetch_interests_flag=True, apis_to_fetch=INTEREST_APIS,
+                          shard_index=shard_index, num_shards=num_shards)
+    elif mode == 'ranked':
+        pipeline.main(fetch_interests_flag=True, apis_to_fetch=INTEREST_APIS, rank_results=True)
+    elif mode == 'concurrent':
+        pipeline.main(fetch_interests_flag=True, apis_to_fetch=INTEREST_APIS, workers=workers)
+    else:
+        raise ValueError(f"Unknown mode '{mode}'. Valid modes are: {', '.join(MODES)}")
+    elapsed = time.perf_counter() - started
+
+    articles = count_articles()
+    inserted = sum(articles.values())
+    return {
+        'mode': mode,
+        'seconds': elapsed,
+        'requests': len(latencies),
+        'statuses': statuses,
+        'articles_inserted': inserted,
+        'articles_by_table': articles,
+        'requests_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'articles_per_sec': inserted / elapsed if elapsed else 0.0,
+        'p50_latency_ms': (percentile(latencies, 0.50) or 0.0) * 1000,
+        'p95_latency_ms': (percentile(latencies, 0.95) or 0.0) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+        'concurrency': get_concurrency_stats(),
+    }
+
+
+def run_worker(args):
+    """Entry point of the per-mode interpreter: run the mode and write the result file."""
+    result = run_mode(args.worker, os.path.join(args.workdir, 'benchmark.db'), args.interests,
+                      args.iterations, args.shards, args.workers)
+    with open(os.path.join(args.workdir, 'result.json'), 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+def benchmark_mode(mode, server, args):
+    """
+    Run one mode in a fresh interpreter, pointed at the mock server.
+
+    Args:
+        mode (str): One of MODES.
+        server (MockProviderServer): The running mock server.
+        args (argparse.Namespace): Benchmark options.
+
+    Returns:
+        dict: The measurements, or an 'error' key if the run failed.
+    """
+    with tempfile.TemporaryDirectory(prefix=f"news_fetcher_bench_{mode}_") as workdir:
+        env = dict(os.environ)
+        env.update({key: 'benchmark' for key in API_KEY_ENVS})
+        env.update({
+            'PROVIDER_BASE_URL': server.base_url,
+            'FETCHED_NEWS_DIR': os.path.join(workdir, 'fetched_news'),
+            'PYTHONPATH': os.pathsep.join(filter(None, [project_root, env.get('PYTHONPATH')])),
+            'RETRY_BASE_DELAY': env.get('RETRY_BASE_DELAY', str(args.retry_base_delay)),
+        })
+        command = [sys.executable, '-m', 'scripts.benchmarks.run_benchmark', '--worker', mode, '--workdir', workdir,
+                   '--interests', str(args.interests), '--iterations', str(args.iterations),
+                   '--shards', str(args.shards), '--workers', str(args.workers)]
+        # Run from the work directory so log files stay out of the project
+        proc = subprocess.run(command, cwd=workdir, env=env, capture_output=not args.verbose, text=True)
+        result_path = os.path.join(workdir, 'result.json')
+        if proc.returncode != 0 or not os.path.exists(result_path):
+            error = (proc.stderr or '').strip().splitlines()
+            return {'mode': mode, 'error': error[-1] if error else f"exit code {proc.returncode}"}
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def print_report(results, server):
+    """Print the results as a table."""
+    print(f"{'mode':10} {'requests':>9} {'req/s':>8} {'articles':>9} {'art/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'peak RSS MiB':>13}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['mode']:10} ERROR: {r['error']}")
+            continue
+        rss = f"{r['peak_rss_mb']:.1f}" if r['peak_rss_mb'] is not None else 'n/a'
+        print(f"{r['mode']:10} {r['requests']:9d} {r['requests_per_sec']:8.1f} {r['articles_inserted']:9d} "
+              f"{r['articles_per_sec']:9.1f} {r['p50_latency_ms']:8.1f} {r['p95_latency_ms']:8.1f} {rss:>13}")
+    counters = server.counters
+    print(f"Mock server: {counters['requests']} requests, {counters['errors']} errors, "
+          f"{counters['rate_limited']} rate limited, {counters['overloaded']} over capacity, "
+          f"{counters['articles']} articles served")
+    for r in results:
+        if r['mode'] == 'concurrent' and 'error' not in r:
+            limits = ', '.join(f"{api} {stats['limit']:.1f}" for api, stats in r['concurrency'].items())
+            print(f"Final concurrency limits: {limits}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fetch pipeline against local mock providers.")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help="Execution modes to run")
+    parser.add_argument('--interests', type=int, default=20, help="Interests in the benchmark database")
+    parser.add_argument('--iterations', type=int, default=5, help="Runs of main() in 'providers' mode")
+    parser.add_argument('--shards', type=int, default=2, help="Shards in 'sharded' mode")
+    parser.add_argument('--workers', type=int, default=8, help="Fetch threads in 'concurrent' mode")
+    parser.add_argument('--max-concurrency', type=int, default=0,
+                        help="Concurrent requests each mock provider serves, 429 beyond (0 for unlimited)")
+    parser.add_argument('--articles', type=int, default=10, help="Articles per mock response")
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="Mock response latency")
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help="Random extra mock latency, up to this value")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of HTTP 429 responses")
+    parser.add_argument('--fixtures', help="Directory of recorded <provider>.json responses to replay")
+    parser.add_argument('--retry-base-delay', type=float, default=0.05,
+                        help="RETRY_BASE_DELAY of the pipeline, unless already set in the environment")
+    parser.add_argument('--seed', type=int, default=1234, help="Seed of the mock latency and errors")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    parser.add_argument('--verbose', action='store_true', help="Show the pipeline's output")
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    results = []
+    with MockProviderServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, articles_per_response=args.articles,
+                            fixtures_dir=args.fixtures, seed=args.seed, max_concurrency=args.max_concurrency) as server:
+        for mode in args.modes:
+            results.append(benchmark_mode(mode, server, args))
+
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            print_report(results, server)
+
+
+if __name__ == "__main__":
+    main()
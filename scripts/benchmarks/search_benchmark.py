@@ -0,0 +1,214 @@
+# scripts\benchmarks\search_benchmark.py
+
+"""
+Benchmark the article search index at production scale.
+
+A scratch SQLite database is filled with synthetic articles whose words follow a
+Zipf-like distribution (a few very common words, a long tail of rare ones), then
+the report gives:
+    - bulk indexing throughput (articles/sec)
+    - latency of incremental inserts through insert_data_into_db (which updates the index)
+    - p50/p95 search latency for common, mid-frequency and rare keywords, for
+      two-keyword queries and for provider-filtered queries
+
+Usage:
+    python -m scripts.benchmarks.search_benchmark
+    python -m scripts.benchmarks.search_benchmark --articles 5000000 --queries 200
+"""
+
+import os
+import sys
+import json
+import time
+import bisect
+import random
+import argparse
+import tempfile
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.benchmarks.run_benchmark import percentile  # noqa: E402
+
+PROVIDERS = ('newsdata', 'newsapi', 'gnews')
+
+
+def build_vocabulary(size, rng):
+    """
+    Build a vocabulary of pronounceable made-up words.
+
+    Args:
+        size (int): Number of words.
+        rng (random.Random): Random generator.
+
+    Returns:
+        list: Distinct words, most frequent first.
+    """
+    syllables = ['ba', 'ko', 'ri', 'tu', 'me', 'sa', 'lo', 'ne', 'pi', 'da', 'vu', 'ge', 'zo', 'fa', 'hi', 'ju']
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class ArticleGenerator:
+    """Generate synthetic articles with Zipf-distributed words."""
+
+    def __init__(self, vocabulary, rng):
+        self.vocabulary = vocabulary
+        self.rng = rng
+        weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+        total = sum(weights)
+        self._cumulative = []
+        running = 0.0
+        for weight in weights:
+            running += weight / total
+            self._cumulative.append(running)
+
+    def words(self, count):
+        return ' '.join(self.vocabulary[min(len(self.vocabulary) - 1, self._index())] for _ in range(count))
+
+    def _index(self):
+        return bisect.bisect(self._cumulative, self.rng.random())
+
+    def article(self, number):
+        provider = PROVIDERS[number % len(PROVIDERS)]
+        return (provider, f"interest {number % 500}", f"{self.words(8)} {number}", self.words(20), self.words(40),
+                f"https://example.com/{number}", f"2024-{1 + number % 12:02d}-{1 + number % 28:02d} 12:00:00")
+
+
+def fill_index(articles, generator, batch_size=10000):
+    """
+    Bulk-load articles into the search index.
+
+    Returns:
+        float: Articles indexed per second.
+    """
+    from scripts.utils.db_connection import get_db_connection, close_connection
+    from scripts.utils.article_search import _INSERT_SQL
+
+    started = time.perf_counter()
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        for start in range(0, articles, batch_size):
+            cursor.executemany(_INSERT_SQL, [generator.article(n) for n in range(start, min(start + batch_size, articles))])
+            conn.commit()
+            if start and start % (batch_size * 50) == 0:
+                print(f"  indexed {start} articles", file=sys.stderr)
+        cursor.close()
+    finally:
+        close_connection(conn)
+    return articles / (time.perf_counter() - started)
+
+
+def time_incremental_inserts(generator, batches, batch_size):
+    """
+    Time insert_data_into_db batches, which insert into gnews and update the index.
+
+    Returns:
+        list: Seconds per batch.
+    """
+    from scripts.utils.process_fetched_data import insert_data_into_db
+
+    timings = []
+    for batch in range(batches):
+        records = [
+            {'interest': 'benchmark', 'title': f"{generator.words(8)} incremental {batch}-{n}",
+             'description': generator.words(20), 'url': f"https://example.com/inc/{batch}/{n}",
+             'image': None, 'published_at': '2024-06-01 12:00:00', 'content': generator.words(40)}
+            for n in range(batch_size)
+        ]
+        started = time.perf_counter()
+        insert_data_into_db(records, 'gnews')
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def time_queries(queries, repeat, **search_kwargs):
+    """
+    Time search_articles over a list of queries.
+
+    Returns:
+        dict: Number of queries, p50/p95 latency in milliseconds and mean number of results.
+    """
+    from scripts.utils.article_search import search_articles
+
+    timings = []
+    results = 0
+    for query in queries:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = search_articles(query, **search_kwargs)
+            timings.append(time.perf_counter() - started)
+        results += len(found)
+    return {
+        'queries': len(queries),
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'mean_results': results / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the article search index.")
+    parser.add_argument('--articles', type=int, default=1000000, help="Articles in the index")
+    parser.add_argument('--vocabulary', type=int, default=20000, help="Distinct words")
+    parser.add_argument('--queries', type=int, default=50, help="Queries per query class")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs of each query")
+    parser.add_argument('--insert-batches', type=int, default=20, help="Incremental insert batches")
+    parser.add_argument('--insert-batch-size', type=int, default=50, help="Articles per incremental insert")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args()
+
+    from scripts.utils.storage import SQLiteBackend, set_storage_backend
+
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(args.vocabulary, rng)
+    generator = ArticleGenerator(vocabulary, rng)
+
+    with tempfile.TemporaryDirectory(prefix='news_fetcher_search_') as workdir:
+        db_path = os.path.join(workdir, 'search.db')
+        set_storage_backend(SQLiteBackend(db_path))
+
+        results = {'articles': args.articles, 'index_articles_per_sec': fill_index(args.articles, generator)}
+        insert_timings = time_incremental_inserts(generator, args.insert_batches, args.insert_batch_size)
+        results['incremental_insert'] = {
+            'batch_size': args.insert_batch_size,
+            'p50_ms': percentile(insert_timings, 0.50) * 1000,
+            'p95_ms': percentile(insert_timings, 0.95) * 1000,
+        }
+
+        common = vocabulary[:20]
+        middle = vocabulary[len(vocabulary) // 20:len(vocabulary) // 10]
+        rare = vocabulary[-len(vocabulary) // 10:]
+        classes = {
+            'common_keyword': [rng.choice(common) for _ in range(args.queries)],
+            'mid_keyword': [rng.choice(middle) for _ in range(args.queries)],
+            'rare_keyword': [rng.choice(rare) for _ in range(args.queries)],
+            'two_keywords': [f"{rng.choice(common)} {rng.choice(middle)}" for _ in range(args.queries)],
+        }
+        results['search'] = {name: time_queries(queries, args.repeat) for name, queries in classes.items()}
+        results['search']['mid_keyword_one_provider'] = time_queries(
+            classes['mid_keyword'], args.repeat, providers=['newsapi'])
+        results['db_size_mb'] = os.path.getsize(db_path) / (1024 * 1024)
+        set_storage_backend(None)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Indexed {results['articles']} articles at {results['index_articles_per_sec']:.0f} articles/sec "
+          f"({results['db_size_mb']:.0f} MiB)")
+    inserts = results['incremental_insert']
+    print(f"insert_data_into_db, {inserts['batch_size']} articles: p50 {inserts['p50_ms']:.1f} ms, "
+          f"p95 {inserts['p95_ms']:.1f} ms")
+    print(f"{'query class':26} {'p50 ms':>8} {'p95 ms':>8} {'results':>8}")
+    for name, r in results['search'].items():
+        print(f"{name:26} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['mean_results']:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
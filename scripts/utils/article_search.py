@@ -0,0 +1,226 @@
+# scripts\utils\article_search.py
+
+import os
+import sys
+import json
+import argparse
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error, get_storage_backend  # noqa: E402
+from scripts.utils.query_planner import interest_terms  # noqa: E402
+from scripts.utils.storage_policy import decode_article  # noqa: E402
+
+# Initialize logger
+logger = get_logger('article_search')
+
+# Load environment variables
+load_dotenv()
+
+# Search index configuration
+SEARCH_CONFIG = {
+    # Index articles as part of insert_data_into_db
+    "enabled": os.getenv("SEARCH_INDEX_ENABLED", "true").lower() in ("1", "true", "yes"),
+    # Relative weight of matches in title, description and content
+    "weights": (10.0, 5.0, 1.0),
+    # Articles read and indexed per batch by rebuild_search_index
+    "rebuild_batch_size": int(os.getenv("SEARCH_REBUILD_BATCH_SIZE", 1000)),
+}
+
+# Per provider table: columns holding the article URL and publication time
+INDEXED_TABLES = {
+    'newsdata': {'url': 'link', 'published_at': 'pubDate'},
+    'newsapi': {'url': 'url', 'published_at': 'publishedAt'},
+    'gnews': {'url': 'url', 'published_at': 'published_at'},
+}
+
+# The index table is created by migration 3 (see migrations.MIGRATIONS), as an FTS5 table on SQLite
+_INSERT_SQL = """
+INSERT INTO article_search (provider, interest, title, description, content, url, published_at)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+def index_articles(cursor, table_name, records):
+    """
+    Add newly inserted articles to the search index, in the caller's transaction.
+
+    An indexing error is raised, so the articles are only committed together with their
+    index rows and an insert never leaves unindexed articles behind.
+
+    Args:
+        cursor: Cursor of the transaction inserting the articles.
+        table_name (str): Provider table the articles were inserted into.
+        records (list): The inserted article dictionaries.
+
+    Returns:
+        int: Number of articles indexed.
+
+    Raises:
+        DatabaseError: If the index rows cannot be inserted.
+    """
+    fields = INDEXED_TABLES.get(table_name)
+    if fields is None or not records or not SEARCH_CONFIG["enabled"]:
+        return 0
+
+    rows = [
+        (table_name, record.get('interest'), record.get('title'), record.get('description'),
+         record.get('content'), record.get(fields['url']), record.get(fields['published_at']))
+        for record in records
+    ]
+    try:
+        cursor.executemany(_INSERT_SQL, rows)
+    except Error as e:
+        logger.error(f"Could not update the search index of {table_name}: {e}")
+        raise
+    return len(rows)
+
+
+def _search_query(terms, match_all, backend_name):
+    if backend_name == 'sqlite':
+        match = (' AND ' if match_all else ' OR ').join(f'"{term}"' for term in terms)
+        weights = ', '.join(str(weight) for weight in SEARCH_CONFIG["weights"])
+        return f"-bm25(article_search, {weights})", "article_search MATCH %s", match
+    against = ' '.join(f"{'+' if match_all else ''}{term}" for term in terms)
+    expression = "MATCH(title, description, content) AGAINST (%s IN BOOLEAN MODE)"
+    return expression, expression, against
+
+
+def search_articles(query, providers=None, interest=None, since=None, limit=20, match_all=True):
+    """
+    Search the stored articles of every provider by keyword.
+
+    Uses FTS5 with BM25 ranking on SQLite and the FULLTEXT index on MySQL.
+
+    Args:
+        query (str): Keywords. Accents, case and boolean operators are ignored.
+        providers (list, optional): Only these provider tables.
+        interest (str, optional): Only articles fetched for this interest.
+        since (datetime or str, optional): Only articles published at or after this time.
+        limit (int, optional): Maximum number of results. Defaults to 20.
+        match_all (bool, optional): If True, articles must contain every keyword, otherwise any. Defaults to True.
+
+    Returns:
+        list: Dictionaries with provider, interest, title, description, url, published_at and score,
+        best match first.
+    """
+    terms = sorted(interest_terms(query))
+    if not terms:
+        return []
+
+    score, condition, match = _search_query(terms, match_all, get_storage_backend().name)
+    conditions = [condition]
+    params = [match]
+    if providers:
+        conditions.append(f"provider IN ({', '.join(['%s'] * len(providers))})")
+        params.extend(providers)
+    if interest is not None:
+        conditions.append("interest = %s")
+        params.append(interest)
+    if since is not None:
+        conditions.append("published_at >= %s")
+        params.append(since)
+
+    sql = f"""
+    SELECT provider, interest, title, description, url, published_at, {score} AS score
+    FROM article_search
+    WHERE {' AND '.join(conditions)}
+    ORDER BY score DESC
+    LIMIT %s
+    """
+    # The score expression of MySQL repeats the MATCH ... AGAINST placeholder
+    params = ([match] if '%s' in score else []) + params + [limit]
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    except Error as e:
+        logger.error(f"Error searching articles for '{query}': {e}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def rebuild_search_index():
+    """
+    Rebuild the search index from the provider tables, e.g. after enabling it on existing data.
+
+    The articles are read in batches and decoded (see storage_policy.decode_article), so
+    compressed descriptions and contents are indexed as text.
+
+    Returns:
+        dict: Number of articles indexed per provider table, empty on failure.
+    """
+    batch_size = SEARCH_CONFIG["rebuild_batch_size"]
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("DELETE FROM article_search")
+        counts = {}
+        for table_name, fields in INDEXED_TABLES.items():
+            counts[table_name] = 0
+            last_id = 0
+            while True:
+                cursor.execute(f"""
+                SELECT id, interest, title, description, content,
+                    {fields['url']} AS url, {fields['published_at']} AS published_at
+                FROM {table_name}
+                WHERE id > %s
+                ORDER BY id
+                LIMIT %s
+                """, (last_id, batch_size))
+                rows = [decode_article(row) for row in cursor.fetchall()]
+                if not rows:
+                    break
+                cursor.executemany(_INSERT_SQL, [
+                    (table_name, row['interest'], row['title'], row['description'], row['content'], row['url'],
+                     row['published_at'])
+                    for row in rows
+                ])
+                counts[table_name] += len(rows)
+                last_id = rows[-1]['id']
+        conn.commit()
+        logger.info(f"Rebuilt the search index: {counts}")
+        return counts
+    except Error as e:
+        logger.error(f"Error rebuilding the search index: {e}")
+        if conn:
+            conn.rollback()
+        return {}
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage and query the article search index.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rebuild', help="Re-index every stored article")
+    search_parser = subparsers.add_parser('search', help="Search the articles")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--provider', action='append', dest='providers')
+    search_parser.add_argument('--limit', type=int, default=20)
+    search_parser.add_argument('--any', action='store_true', help="Match any keyword instead of all")
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        print(json.dumps(rebuild_search_index(), indent=2))
+    else:
+        results = search_articles(args.query, providers=args.providers, limit=args.limit, match_all=not args.any)
+        print(json.dumps(results, indent=2, default=str))
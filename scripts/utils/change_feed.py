@@ -0,0 +1,364 @@
+# scripts\utils\change_feed.py
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error, get_storage_backend  # noqa: E402
+from scripts.utils.article_search import INDEXED_TABLES  # noqa: E402
+
+# Initialize logger
+logger = get_logger('change_feed')
+
+# Load environment variables
+load_dotenv()
+
+# Change feed configuration
+CHANGE_FEED_CONFIG = {
+    # Append every inserted article to article_changes, in the insert transaction
+    "enabled": os.getenv("CHANGE_FEED_ENABLED", "true").lower() in ("1", "true", "yes"),
+    # Changes returned per read
+    "batch_size": int(os.getenv("CHANGE_FEED_BATCH_SIZE", 500)),
+    # Seconds between reads when following the feed and there is nothing new
+    "poll_interval": float(os.getenv("CHANGE_FEED_POLL_INTERVAL", 1.0)),
+    # MySQL only: seconds a read waits at a missing sequence number for its transaction to commit
+    # before skipping it as rolled back, see read_changes. Must exceed the longest article insert.
+    "gap_timeout": float(os.getenv("CHANGE_FEED_GAP_TIMEOUT", 30.0)),
+    # Changes read by every consumer are deleted after this many days (see prune_changes)
+    "retention_days": float(os.getenv("CHANGE_FEED_RETENTION_DAYS", 7)),
+}
+
+# The change feed tables are created by migration 3 (see migrations.MIGRATIONS)
+_INSERT_SQL = """
+INSERT INTO article_changes (provider, interest, title, url, published_at, created_at)
+VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+# First missing sequence number of each gap seen by read_changes -> time it was first seen
+_gaps = {}
+_gaps_lock = threading.Lock()
+
+
+def append_changes(cursor, table_name, records, now=None):
+    """
+    Append newly inserted articles to the change feed, in the caller's transaction.
+
+    The changes become visible with the articles, or not at all: an error is raised, so
+    the articles are not committed without their changes.
+
+    Args:
+        cursor: Cursor of the transaction inserting the articles.
+        table_name (str): Provider table the articles were inserted into.
+        records (list): The inserted article dictionaries.
+        now (datetime, optional): Time of the change. Defaults to datetime.now().
+
+    Returns:
+        int: Number of changes appended.
+
+    Raises:
+        DatabaseError: If the changes cannot be inserted.
+    """
+    fields = INDEXED_TABLES.get(table_name)
+    if fields is None or not records or not CHANGE_FEED_CONFIG["enabled"]:
+        return 0
+
+    now = now or datetime.now()
+    rows = [
+        (table_name, record.get('interest'), record.get('title'), record.get(fields['url']),
+         record.get(fields['published_at']), now)
+        for record in records
+    ]
+    try:
+        cursor.executemany(_INSERT_SQL, rows)
+    except Error as e:
+        logger.error(f"Could not append the changes of {table_name} to the change feed: {e}")
+        raise
+    return len(rows)
+
+
+def _committed_until(cursor, after_seq, last_seq):
+    """
+    Find the first sequence number after after_seq that may still be committed by a running transaction.
+
+    A gap in the sequence numbers is waited for CHANGE_FEED_GAP_TIMEOUT from the first read that
+    saw it, then skipped as a rolled back insert (or numbers InnoDB reserved but did not use).
+
+    Returns:
+        int: The sequence number, or None if every number up to last_seq is committed or skipped.
+    """
+    cursor.execute("SELECT seq FROM article_changes WHERE seq > %s AND seq <= %s ORDER BY seq",
+                   (after_seq, last_seq))
+    now = time.monotonic()
+    # A consumer reading from the start has no previous number; the feed may also have been pruned
+    expected = after_seq + 1 if after_seq else None
+    with _gaps_lock:
+        for seq in list(_gaps):
+            if seq <= after_seq:
+                del _gaps[seq]
+        for row in cursor.fetchall():
+            if expected is not None and row['seq'] != expected:
+                if now - _gaps.setdefault(expected, now) < CHANGE_FEED_CONFIG["gap_timeout"]:
+                    return expected
+                logger.warning(f"Skipping change feed sequence numbers {expected} to {row['seq'] - 1}, "
+                               f"never committed")
+            expected = row['seq'] + 1
+    return None
+
+
+def read_changes(after_seq=0, limit=None, providers=None):
+    """
+    Read the changes following a sequence number, oldest first.
+
+    On MySQL, sequence numbers are allocated when a row is inserted but become visible
+    when its transaction commits, so a lower number may appear after a higher one was
+    read. The read therefore stops at the first missing number, until it is committed
+    or CHANGE_FEED_GAP_TIMEOUT has passed (see _committed_until). SQLite commits one
+    transaction at a time and is read without waiting.
+
+    Args:
+        after_seq (int, optional): Last sequence number already read. Defaults to 0 (from the start).
+        limit (int, optional): Maximum number of changes. Defaults to CHANGE_FEED_BATCH_SIZE.
+        providers (list, optional): Only changes of these provider tables. The returned changes
+            may then skip sequence numbers; continue from the last one returned.
+
+    Returns:
+        list: Change dictionaries (seq, provider, interest, title, url, published_at, created_at).
+
+    Raises:
+        DatabaseError: If the feed cannot be read.
+    """
+    limit = limit or CHANGE_FEED_CONFIG["batch_size"]
+    query = """
+    SELECT seq, provider, interest, title, url, published_at, created_at
+    FROM article_changes
+    WHERE seq > %s
+    """
+    params = [after_seq]
+    if providers:
+        query += f" AND provider IN ({', '.join(['%s'] * len(providers))})"
+        params.extend(providers)
+    query += " ORDER BY seq LIMIT %s"
+    params.append(limit)
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query, params)
+        changes = cursor.fetchall()
+        if not changes or get_storage_backend().embedded:
+            return changes
+        # Every sequence number is checked, including the ones of other providers
+        gap = _committed_until(cursor, after_seq, changes[-1]['seq'])
+        return changes if gap is None else [change for change in changes if change['seq'] < gap]
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def latest_seq():
+    """
+    Get the sequence number of the last change, to start a consumer from now on.
+
+    Returns:
+        int: The sequence number, 0 if the feed is empty.
+
+    Raises:
+        DatabaseError: If the feed cannot be read.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(seq) FROM article_changes")
+        row = cursor.fetchone()
+        return (row[0] or 0) if row else 0
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def get_cursor(consumer):
+    """
+    Get the last sequence number a consumer acknowledged.
+
+    Args:
+        consumer (str): Name of the consumer.
+
+    Returns:
+        int: The sequence number, 0 for a new consumer.
+
+    Raises:
+        DatabaseError: If the cursor cannot be read.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT last_seq FROM change_feed_cursors WHERE consumer = %s", (consumer,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def commit_cursor(consumer, seq, now=None):
+    """
+    Acknowledge the changes of a consumer up to a sequence number.
+
+    Args:
+        consumer (str): Name of the consumer.
+        seq (int): Last sequence number processed.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        bool: True if the cursor was saved, False otherwise.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+        INSERT INTO change_feed_cursors (consumer, last_seq, updated_at)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            last_seq = VALUES(last_seq),
+            updated_at = VALUES(updated_at)
+        """, (consumer, seq, now or datetime.now()))
+        conn.commit()
+        return True
+    except Error as e:
+        logger.error(f"Error saving the change feed cursor of {consumer}: {e}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def tail_changes(consumer, batch_size=None, providers=None, follow=False, poll_interval=None):
+    """
+    Iterate over the changes a consumer has not acknowledged yet, in batches.
+
+    A batch is acknowledged when the next one is requested, so a consumer that stops or
+    crashes while processing a batch gets it again next time (at-least-once delivery).
+
+    Example:
+        for changes in tail_changes('search-sync', follow=True):
+            push(changes)
+
+    Args:
+        consumer (str): Name of the consumer; its cursor is kept in change_feed_cursors.
+        batch_size (int, optional): Changes per batch. Defaults to CHANGE_FEED_BATCH_SIZE.
+        providers (list, optional): Only changes of these provider tables.
+        follow (bool, optional): If True, wait for new changes instead of stopping at the end of the feed.
+        poll_interval (float, optional): Seconds between reads when following. Defaults to CHANGE_FEED_POLL_INTERVAL.
+
+    Yields:
+        list: Non-empty batches of change dictionaries, see read_changes.
+    """
+    poll_interval = CHANGE_FEED_CONFIG["poll_interval"] if poll_interval is None else poll_interval
+    after_seq = get_cursor(consumer)
+    while True:
+        changes = read_changes(after_seq, batch_size, providers)
+        if changes:
+            yield changes
+            after_seq = changes[-1]['seq']
+            commit_cursor(consumer, after_seq)
+            continue
+        if not follow:
+            return
+        time.sleep(poll_interval)
+
+
+def prune_changes(retention_days=None, now=None):
+    """
+    Delete the changes older than the retention that every consumer has acknowledged.
+
+    Args:
+        retention_days (float, optional): Days of changes kept. Defaults to CHANGE_FEED_RETENTION_DAYS.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        int: Number of changes deleted, -1 on failure.
+    """
+    retention_days = CHANGE_FEED_CONFIG["retention_days"] if retention_days is None else retention_days
+    cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(last_seq) FROM change_feed_cursors")
+        row = cursor.fetchone()
+        acknowledged = row[0] if row and row[0] is not None else None
+        query = "DELETE FROM article_changes WHERE created_at < %s"
+        params = [cutoff]
+        if acknowledged is not None:
+            query += " AND seq <= %s"
+            params.append(acknowledged)
+        cursor.execute(query, params)
+        deleted = cursor.rowcount
+        conn.commit()
+        logger.info(f"Pruned {deleted} changes older than {cutoff}")
+        return deleted
+    except Error as e:
+        logger.error(f"Error pruning the change feed: {e}")
+        if conn:
+            conn.rollback()
+        return -1
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage and read the change feed of inserted articles.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    tail_parser = subparsers.add_parser('tail', help="Print the changes a consumer has not read yet, as JSON lines")
+    tail_parser.add_argument('--consumer', default='cli')
+    tail_parser.add_argument('--provider', action='append', dest='providers')
+    tail_parser.add_argument('--batch-size', type=int)
+    tail_parser.add_argument('--follow', action='store_true', help="Wait for new changes")
+    prune_parser = subparsers.add_parser('prune', help="Delete old changes read by every consumer")
+    prune_parser.add_argument('--retention-days', type=float)
+    args = parser.parse_args()
+
+    if args.command == 'tail':
+        try:
+            for batch in tail_changes(args.consumer, args.batch_size, args.providers, args.follow):
+                for change in batch:
+                    print(json.dumps(change, default=str), flush=True)
+        except KeyboardInterrupt:
+            pass
+    else:
+        prune_changes(args.retention_days)
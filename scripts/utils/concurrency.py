@@ -0,0 +1,202 @@
+# scripts\utils\concurrency.py
+
+import os
+import sys
+import time
+import threading
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+
+# Initialize logger
+logger = get_logger('concurrency')
+
+# Load environment variables
+load_dotenv()
+
+# Concurrency configuration
+CONCURRENCY_CONFIG = {
+    # Threads fetching (interest, provider) pairs in interests mode; 1 fetches them one at a time
+    "workers": int(os.getenv("FETCH_WORKERS", 1)),
+    # In-flight requests allowed per provider: starting value and bounds
+    "initial_limit": float(os.getenv("CONCURRENCY_INITIAL_LIMIT", 2)),
+    "min_limit": float(os.getenv("CONCURRENCY_MIN_LIMIT", 1)),
+    "max_limit": float(os.getenv("CONCURRENCY_MAX_LIMIT", 16)),
+    # Limit added per window of successful requests (one window = `limit` responses)
+    "additive_increase": float(os.getenv("CONCURRENCY_ADDITIVE_INCREASE", 1.0)),
+    # Factor applied to the limit on a 429, and on a retryable error or timeout
+    "rate_limit_decrease": float(os.getenv("CONCURRENCY_RATE_LIMIT_DECREASE", 0.5)),
+    "error_decrease": float(os.getenv("CONCURRENCY_ERROR_DECREASE", 0.75)),
+    # Latency above this multiple of the provider's baseline latency is treated as congestion
+    "latency_tolerance": float(os.getenv("CONCURRENCY_LATENCY_TOLERANCE", 2.0)),
+    "latency_decrease": float(os.getenv("CONCURRENCY_LATENCY_DECREASE", 0.9)),
+}
+
+# Outcomes of a request, as reported to AdaptiveConcurrencyLimiter.release
+SUCCESS = 'success'
+RATE_LIMITED = 'rate_limited'
+ERROR = 'error'
+IGNORED = 'ignored'
+
+# Weight of the last response in the smoothed latency
+_LATENCY_SMOOTHING = 0.2
+# Speed at which the baseline latency follows a provider getting slower over the day
+_BASELINE_DRIFT = 0.01
+
+
+def outcome_for_status(status_code):
+    """
+    Classify an HTTP status code for the concurrency limiter.
+
+    Args:
+        status_code (int): The HTTP status code.
+
+    Returns:
+        str: SUCCESS, RATE_LIMITED, ERROR (overload signals: 5xx, 408) or IGNORED (other 4xx,
+        which say nothing about the provider's capacity).
+    """
+    if status_code == 429:
+        return RATE_LIMITED
+    if status_code >= 500 or status_code == 408:
+        return ERROR
+    if status_code >= 400:
+        return IGNORED
+    return SUCCESS
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Per-provider limit on in-flight requests, adjusted with AIMD.
+
+    Every successful response that found the limit fully used raises it by
+    `additive_increase / limit`, i.e. by `additive_increase` per window of responses.
+    A 429, a retryable error, or a smoothed latency above `latency_tolerance` times the
+    provider's baseline latency multiplies it by the matching decrease factor. Decreases
+    are at most once per smoothed latency, so the requests already in flight when
+    the provider pushed back do not cut the limit again.
+    """
+
+    def __init__(self, name, config=CONCURRENCY_CONFIG):
+        self.name = name
+        self.config = config
+        self.limit = min(max(config['initial_limit'], config['min_limit']), config['max_limit'])
+        self.in_flight = 0
+        self.baseline_latency = None
+        self.smoothed_latency = None
+        self.last_decrease = 0.0
+        self.counters = {SUCCESS: 0, RATE_LIMITED: 0, ERROR: 0, IGNORED: 0, 'decreases': 0}
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Wait for an in-flight slot.
+
+        Returns:
+            float: Start time, to pass to release().
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started, outcome):
+        """
+        Free a slot and adjust the limit from the outcome of the request.
+
+        Args:
+            started (float): Value returned by acquire().
+            outcome (str): SUCCESS, RATE_LIMITED, ERROR or IGNORED.
+        """
+        now = time.monotonic()
+        latency = now - started
+        with self._condition:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            self.counters[outcome] += 1
+            if outcome == SUCCESS:
+                self._record_latency(latency)
+                if self.smoothed_latency > self.config['latency_tolerance'] * self.baseline_latency:
+                    self._decrease(now, self.config['latency_decrease'], 'latency')
+                elif saturated:
+                    self.limit = min(self.limit + self.config['additive_increase'] / self.limit,
+                                     self.config['max_limit'])
+            elif outcome == RATE_LIMITED:
+                self._decrease(now, self.config['rate_limit_decrease'], 'rate limited')
+            elif outcome == ERROR:
+                self._decrease(now, self.config['error_decrease'], 'errors')
+            self._condition.notify_all()
+
+    def _record_latency(self, latency):
+        # Caller must hold self._condition
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += (latency - self.baseline_latency) * _BASELINE_DRIFT
+        if self.smoothed_latency is None:
+            self.smoothed_latency = latency
+        else:
+            self.smoothed_latency += (latency - self.smoothed_latency) * _LATENCY_SMOOTHING
+
+    def _decrease(self, now, factor, reason):
+        # Caller must hold self._condition
+        if now - self.last_decrease < (self.smoothed_latency or 0.0):
+            return
+        previous = self.limit
+        self.limit = max(self.limit * factor, self.config['min_limit'])
+        self.last_decrease = now
+        self.counters['decreases'] += 1
+        if int(self.limit) < int(previous):
+            logger.info(f"Concurrency limit for {self.name} lowered to {int(self.limit)} ({reason})")
+
+    def stats(self):
+        """
+        Get the current state of the limiter.
+
+        Returns:
+            dict: Limit, requests in flight, baseline and smoothed latency (ms) and outcome counters.
+        """
+        with self._condition:
+            return {
+                'limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'baseline_latency_ms': round(self.baseline_latency * 1000, 1) if self.baseline_latency else None,
+                'smoothed_latency_ms': round(self.smoothed_latency * 1000, 1) if self.smoothed_latency else None,
+                **self.counters,
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(api_name):
+    """
+    Get the concurrency limiter of a provider, creating it on first use.
+
+    Args:
+        api_name (str): Name of the API.
+
+    Returns:
+        AdaptiveConcurrencyLimiter: The provider's limiter.
+    """
+    with _limiters_lock:
+        if api_name not in _limiters:
+            _limiters[api_name] = AdaptiveConcurrencyLimiter(api_name)
+        return _limiters[api_name]
+
+
+def get_concurrency_stats():
+    """
+    Get the state of every provider's limiter.
+
+    Returns:
+        dict: API name to AdaptiveConcurrencyLimiter.stats().
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {api_name: limiter.stats() for api_name, limiter in limiters.items()}
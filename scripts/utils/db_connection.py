@@ -1,6 +1,7 @@
 import sys
 import os
-from mysql.connector import Error, pooling
+import time
+import threading
 from dotenv import load_dotenv
 
 # Add the project root to the Python path
@@ -8,6 +9,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger # noqa: E402
+from scripts.utils.storage import DatabaseError as Error, get_storage_backend  # noqa: E402
 
 # Initialize logger for this script
 logger = get_logger(os.path.basename(__file__))
@@ -24,37 +26,182 @@ DB_CONFIG = {
     "database": os.getenv("MYSQL_DB")
 }
 
-# Initialize the connection pool
-try:
-    connection_pool = pooling.MySQLConnectionPool(
-        pool_name="mypool",
-        pool_size=5,
-        pool_reset_session=True,
-        **DB_CONFIG
-    )
-    logger.debug("Connection pool created successfully")
-except Error as e:
-    logger.error(f"Error creating connection pool: {e}")
-    raise
-
-def get_db_connection():
+# Connection pool configuration
+POOL_CONFIG = {
+    # mysql.connector caps pools at pooling.CNX_POOL_MAXSIZE (32) connections
+    "pool_size": int(os.getenv("MYSQL_POOL_SIZE", 5)),
+    "pool_reset_session": os.getenv("MYSQL_POOL_RESET_SESSION", "true").lower() in ("1", "true", "yes"),
+    # Seconds get_db_connection waits for a free connection before raising
+    "checkout_timeout": float(os.getenv("MYSQL_POOL_TIMEOUT", 30)),
+    # Ping connections on checkout and reconnect the ones the server dropped
+    "pre_ping": os.getenv("MYSQL_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    # Reconnect connections older than this many seconds (0 disables recycling)
+    "recycle_seconds": float(os.getenv("MYSQL_POOL_RECYCLE", 3600)),
+}
+
+# The connection pool is created on first use, so importing this module never touches the database
+connection_pool = None
+_pool_lock = threading.Lock()
+# Bounds checkouts to the pool size so callers wait for a connection instead of failing
+_pool_slots = None
+# Set once the schema was checked (and migrated if needed) on the first checkout, see migrations.ensure_schema
+_schema_ready = False
+_schema_lock = threading.Lock()
+# id of each checked-out connection -> checkout time
+_checked_out = {}
+# id of each underlying connection -> time it was (re)connected
+_connected_at = {}
+_stats_lock = threading.Lock()
+_pool_stats = {
+    "checkouts": 0,
+    "waits": 0,
+    "wait_seconds": 0.0,
+    "timeouts": 0,
+    "peak_in_use": 0,
+    "recycled": 0,
+    "reconnected": 0,
+}
+
+def get_connection_pool():
+    """
+    Get the connection pool, creating it on first use.
+
+    Returns:
+        mysql.connector.pooling.MySQLConnectionPool: The connection pool
+
+    Raises:
+        Error: If unable to create the connection pool
+    """
+    global connection_pool, _pool_slots
+    if connection_pool is None:
+        with _pool_lock:
+            if connection_pool is None:
+                backend = get_storage_backend()
+                pooling = backend.driver.pooling
+                pool_size = POOL_CONFIG["pool_size"]
+                if pool_size > pooling.CNX_POOL_MAXSIZE:
+                    logger.warning(f"MYSQL_POOL_SIZE={pool_size} exceeds the maximum, using {pooling.CNX_POOL_MAXSIZE}")
+                    pool_size = pooling.CNX_POOL_MAXSIZE
+                try:
+                    with backend.errors():
+                        connection_pool = pooling.MySQLConnectionPool(
+                            pool_name="mypool",
+                            pool_size=pool_size,
+                            pool_reset_session=POOL_CONFIG["pool_reset_session"],
+                            **DB_CONFIG
+                        )
+                    _pool_slots = threading.BoundedSemaphore(pool_size)
+                    logger.debug(f"Connection pool of {pool_size} connections created successfully")
+                except Error as e:
+                    logger.error(f"Error creating connection pool: {e}")
+                    raise
+    return connection_pool
+
+def _check_connection(connection):
+    """
+    Recycle the connection if it is too old, or reconnect it if the server dropped it.
+
+    Args:
+        connection (mysql.connector.pooling.PooledMySQLConnection): A connection taken from the pool
+    """
+    # Pooled connections wrap the actual connection
+    cnx = getattr(connection, '_cnx', connection)
+    now = time.monotonic()
+    connected_at = _connected_at.setdefault(id(cnx), now)
+
+    recycle_seconds = POOL_CONFIG["recycle_seconds"]
+    if recycle_seconds and now - connected_at > recycle_seconds:
+        cnx.reconnect()
+        _connected_at[id(cnx)] = time.monotonic()
+        with _stats_lock:
+            _pool_stats["recycled"] += 1
+        logger.debug("Recycled a stale pooled connection")
+    elif POOL_CONFIG["pre_ping"] and not cnx.is_connected():
+        cnx.reconnect()
+        _connected_at[id(cnx)] = time.monotonic()
+        with _stats_lock:
+            _pool_stats["reconnected"] += 1
+        logger.debug("Reconnected a dropped pooled connection")
+
+def _prepare_schema(connection):
     """
-    Get a connection from the pool.
+    Bring the schema up to date (or check it is) once per process, before the first connection is used.
+
+    Args:
+        connection (storage.MySQLConnection): A connection taken from the pool
+    """
+    global _schema_ready
+    with _schema_lock:
+        if not _schema_ready:
+            # Imported here, as the migrations depend on modules importing this one
+            from scripts.utils.migrations import ensure_schema
+            ensure_schema(connection, 'mysql')
+            _schema_ready = True
+
+def get_db_connection(timeout=None, check_schema=True):
+    """
+    Get a connection from the pool, waiting for one to be returned if all are in use.
+
+    With an embedded storage backend (STORAGE_BACKEND=sqlite) the connection comes from
+    the backend instead, see scripts/utils/storage.py.
     
+    Args:
+        timeout (float, optional): Seconds to wait for a free connection. Defaults to MYSQL_POOL_TIMEOUT.
+        check_schema (bool, optional): Check (or migrate) the schema on the first checkout of the process,
+            see migrations.ensure_schema. Defaults to True; the migration commands themselves skip it.
+
     Returns:
-        mysql.connector.connection.MySQLConnection: A database connection object
+        storage.MySQLConnection: A database connection object (raising storage.DatabaseError)
     
     Raises:
         Error: If unable to get a connection from the pool
     """
+    backend = get_storage_backend()
+    if backend.embedded:
+        return backend.connect()
+
+    pool = get_connection_pool()
+    timeout = POOL_CONFIG["checkout_timeout"] if timeout is None else timeout
+
+    started = time.monotonic()
+    if not _pool_slots.acquire(blocking=False):
+        if not _pool_slots.acquire(timeout=timeout):
+            with _stats_lock:
+                _pool_stats["timeouts"] += 1
+            logger.error(f"Timed out after {timeout}s waiting for a database connection")
+            raise Error(msg=f"Timed out after {timeout}s waiting for a connection from the pool")
+        waited = time.monotonic() - started
+        with _stats_lock:
+            _pool_stats["waits"] += 1
+            _pool_stats["wait_seconds"] += waited
+
+    connection = None
     try:
-        connection = connection_pool.get_connection()
-        logger.debug("Successfully acquired a connection from the pool")
-        return connection
+        with backend.errors():
+            connection = pool.get_connection()
+            _check_connection(connection)
+        connection = backend.wrap(connection)
+        if check_schema and not _schema_ready:
+            _prepare_schema(connection)
     except Error as e:
+        if connection is not None:
+            # Hand the connection back, or the pool loses it for good; it reconnects on its next checkout
+            try:
+                with backend.errors():
+                    connection.close()
+            except Error as close_error:
+                logger.error(f"Error returning a failed connection to the pool: {close_error}")
+        _pool_slots.release()
         logger.error(f"Error getting connection from pool: {e}")
         raise
 
+    with _stats_lock:
+        _checked_out[id(connection)] = time.monotonic()
+        _pool_stats["checkouts"] += 1
+        _pool_stats["peak_in_use"] = max(_pool_stats["peak_in_use"], len(_checked_out))
+    logger.debug("Successfully acquired a connection from the pool")
+    return connection
+
 def close_connection(connection):
     """
     Close the given database connection.
@@ -68,6 +215,31 @@ def close_connection(connection):
             logger.debug("Connection closed and returned to the pool")
         except Error as e:
             logger.error(f"Error closing connection: {e}")
+        finally:
+            with _stats_lock:
+                released = _checked_out.pop(id(connection), None) is not None
+            if released:
+                _pool_slots.release()
+
+def get_pool_stats():
+    """
+    Get the utilization statistics of the connection pool.
+
+    Returns:
+        dict: Pool size, connections in use and available, and counters of checkouts, waits,
+        total wait time, timeouts, peak usage, recycled and reconnected connections.
+    """
+    with _stats_lock:
+        stats = dict(_pool_stats)
+        in_use = len(_checked_out)
+    pool_size = connection_pool.pool_size if connection_pool is not None else POOL_CONFIG["pool_size"]
+    stats.update({
+        "pool_size": pool_size,
+        "in_use": in_use,
+        "available": pool_size - in_use,
+        "utilization": in_use / pool_size if pool_size else 0.0,
+    })
+    return stats
 
 # Example usage
 if __name__ == "__main__":
@@ -80,6 +252,7 @@ if __name__ == "__main__":
             cursor.execute("SELECT 1")
             result = cursor.fetchone()
             logger.debug(f"Test query result: {result}")
+        logger.info(f"Pool stats: {get_pool_stats()}")
         
     except Error as e:
         logger.error(f"Error in database operation: {e}")
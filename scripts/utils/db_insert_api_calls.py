@@ -1,7 +1,6 @@
 import os
 import sys
 import json
-from mysql.connector import Error
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -9,36 +8,37 @@ sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger # noqa: E402
 from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error  # noqa: E402
+from scripts.utils.storage_policy import apply_raw_response_policy, load_raw_response  # noqa: E402
+from scripts.utils.response_envelope import json_default  # noqa: E402
 
 # Initialize logger for this script
 logger = get_logger(os.path.basename(__file__))
 
 def insert_api_response(script_path, payload, response, custom_params=None):
     conn = None
+    cursor = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Convert payload and response to JSON strings
-        payload_json = json.dumps(payload)
-        response_json = json.dumps(response)
+        # Convert payload and response (dict or ResponseEnvelope) to JSON strings; the response may be
+        # compressed or deduplicated
+        payload_json = json.dumps(payload, default=json_default)
+        response_json, response_hash = apply_raw_response_policy(cursor, json.dumps(response, default=json_default))
         
         # Prepare the SQL query
+        row = {'script_path': script_path}
         if custom_params is not None:
-            query = """
-            INSERT INTO api_calls (script_path, custom_params, payload, response) 
-            VALUES (%s, %s, %s, %s)
-            """
-            params = (script_path, custom_params, payload_json, response_json)
-        else:
-            query = """
-            INSERT INTO api_calls (script_path, payload, response) 
-            VALUES (%s, %s, %s)
-            """
-            params = (script_path, payload_json, response_json)
+            row['custom_params'] = custom_params
+        row['payload'] = payload_json
+        row['response'] = response_json
+        if response_hash is not None:
+            row['response_hash'] = response_hash
+        query = f"INSERT INTO api_calls ({', '.join(row)}) VALUES ({', '.join(['%s'] * len(row))})"
 
         # Execute the query
-        cursor.execute(query, params)
+        cursor.execute(query, list(row.values()))
 
         # Commit the transaction
         conn.commit()
@@ -54,6 +54,41 @@ def insert_api_response(script_path, payload, response, custom_params=None):
             cursor.close()
         close_connection(conn)
 
+def get_api_response(api_call_id):
+    """
+    Read the response of an API call as it was received, decompressed and with skipped duplicates resolved.
+
+    Args:
+        api_call_id (int): ID of the api_calls row.
+
+    Returns:
+        dict: The response, or None if the call (or the response it duplicates) is not found or on error.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT response FROM api_calls WHERE id = %s", (api_call_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        response = load_raw_response(row[0])
+        if isinstance(response, dict) and list(response) == ['duplicate_of']:
+            # The first row with the hash holds the full response
+            cursor.execute("SELECT response FROM api_calls WHERE response_hash = %s ORDER BY id LIMIT 1",
+                           (response['duplicate_of'],))
+            row = cursor.fetchone()
+            response = load_raw_response(row[0]) if row is not None else None
+        return response
+    except Error as e:
+        logger.error(f"Failed to read the response of API call {api_call_id}. Error: {e}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        close_connection(conn)
+
 # Example usage
 if __name__ == "__main__":
     try:
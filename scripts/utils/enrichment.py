@@ -0,0 +1,507 @@
+# scripts\utils\enrichment.py
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error  # noqa: E402
+
+# Initialize logger
+logger = get_logger('enrichment')
+
+# Load environment variables
+load_dotenv()
+
+# Enrichment configuration
+ENRICHMENT_CONFIG = {
+    # Check the image URLs and resolve the source domains of newly inserted articles in the background
+    "enabled": os.getenv("ENRICHMENT_ENABLED", "false").lower() in ("1", "true", "yes"),
+    # Threads making HEAD requests
+    "workers": int(os.getenv("ENRICHMENT_WORKERS", 4)),
+    # Checks waiting for a thread; beyond this, new URLs are dropped rather than delaying the inserts
+    "queue_size": int(os.getenv("ENRICHMENT_QUEUE_SIZE", 1000)),
+    "timeout": float(os.getenv("ENRICHMENT_TIMEOUT", 5)),
+    # A result is reused for this long before the URL or domain is checked again
+    "image_ttl_hours": float(os.getenv("ENRICHMENT_IMAGE_TTL_HOURS", 24)),
+    "source_ttl_hours": float(os.getenv("ENRICHMENT_SOURCE_TTL_HOURS", 24 * 7)),
+    # Results remembered in memory, to skip the database lookup of URLs seen during the run
+    "cache_size": int(os.getenv("ENRICHMENT_CACHE_SIZE", 10000)),
+    # Time given to pending checks at the end of a run before they are cancelled
+    "drain_seconds": float(os.getenv("ENRICHMENT_DRAIN_SECONDS", 30)),
+}
+
+# Per article table: column of the image URL, of the source site and of the article URL
+IMAGE_FIELDS = {
+    'newsdata': 'image_url',
+    'newsapi': 'urlToImage',
+    'gnews': 'image',
+}
+SOURCE_FIELDS = {
+    'newsdata': 'source_url',
+}
+LINK_FIELDS = {
+    'newsdata': 'link',
+    'newsapi': 'url',
+    'gnews': 'url',
+}
+
+# Statuses for which the request is repeated with GET (servers that do not implement HEAD)
+HEAD_NOT_SUPPORTED = (403, 405, 501)
+
+
+def url_hash(url):
+    """
+    Hash a URL, to key the image_checks table.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        str: SHA-1 hex digest.
+    """
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def domain_of(url):
+    """
+    Get the domain of a URL, without port or leading 'www.'.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        str or None: The lowercased domain, None if the URL is not an http(s) URL.
+    """
+    if not url or not isinstance(url, str):
+        return None
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def site_origin(url):
+    """
+    Get the home page of the site of a URL.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        str or None: 'scheme://host[:port]/', None if the URL is not an http(s) URL.
+    """
+    if domain_of(url) is None:
+        return None
+    parts = urlsplit(url.strip())
+    return f"{parts.scheme}://{parts.netloc.lower()}/"
+
+
+class _TTLCache:
+    """Bounded map of keys to expiry times; the oldest keys are evicted first."""
+
+    def __init__(self, size):
+        self.size = size
+        self._expiry = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fresh(self, key, now):
+        with self._lock:
+            expires = self._expiry.get(key)
+            if expires is None:
+                return False
+            if expires <= now:
+                del self._expiry[key]
+                return False
+            return True
+
+    def add(self, key, expires):
+        with self._lock:
+            self._expiry[key] = expires
+            self._expiry.move_to_end(key)
+            while len(self._expiry) > self.size:
+                self._expiry.popitem(last=False)
+
+
+class EnrichmentStage:
+    """
+    Background checks of the image URLs and source domains of inserted articles.
+
+    submit() only filters out the URLs checked recently and hands the others to a
+    bounded thread pool: it never waits for the network, and when more than
+    `queue_size` checks are pending, new ones are dropped (and counted) instead.
+    Each check first looks for a result younger than its TTL in the database, then
+    makes a HEAD request (GET if the server does not implement HEAD) and stores the
+    outcome in image_checks or source_domains.
+    """
+
+    def __init__(self, config=ENRICHMENT_CONFIG, session=None):
+        """
+        Args:
+            config (dict, optional): Settings, see ENRICHMENT_CONFIG.
+            session (requests.Session, optional): HTTP session. Defaults to a session of the stage's own.
+        """
+        self.config = config
+        self._session = session
+        self._cache = _TTLCache(config['cache_size'])
+        self._pending = set()
+        self._futures = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=config['workers'], thread_name_prefix='enrichment')
+        self.counters = {'submitted': 0, 'dropped': 0, 'cached': 0, 'checked': 0, 'alive': 0, 'dead': 0,
+                         'errors': 0}
+
+    def _get_session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.config['workers'])
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def submit(self, table_name, records):
+        """
+        Queue the checks of a batch of articles.
+
+        Args:
+            table_name (str): The article table the records were inserted into.
+            records (list): The inserted records, as given to insert_data_into_db.
+
+        Returns:
+            int: Number of checks queued.
+        """
+        now = datetime.now()
+        image_field = IMAGE_FIELDS.get(table_name)
+        source_field = SOURCE_FIELDS.get(table_name)
+        link_field = LINK_FIELDS.get(table_name)
+
+        checks = {}
+        for record in records:
+            image = record.get(image_field) if image_field else None
+            if image and domain_of(image):
+                checks.setdefault(('image', image), None)
+            site = (record.get(source_field) if source_field else None) or (record.get(link_field) if link_field else None)
+            domain = domain_of(site)
+            if domain:
+                checks.setdefault(('source', domain),
+                                  (site_origin(site), record.get('source_name'), record.get('source_icon')))
+
+        queued = 0
+        for key, details in checks.items():
+            if self._cache.fresh(key, now):
+                self._count('cached')
+                continue
+            with self._lock:
+                if key in self._pending:
+                    continue
+                if len(self._pending) >= self.config['queue_size']:
+                    self.counters['dropped'] += 1
+                    continue
+                self._pending.add(key)
+                self.counters['submitted'] += 1
+            future = self._executor.submit(self._run_check, key, details)
+            with self._lock:
+                self._futures.add(future)
+            future.add_done_callback(self._discard_future)
+            queued += 1
+        if queued:
+            logger.debug(f"Queued {queued} enrichment checks for {table_name}")
+        return queued
+
+    def _discard_future(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _run_check(self, key, details):
+        kind, value = key
+        try:
+            if kind == 'image':
+                ttl = timedelta(hours=self.config['image_ttl_hours'])
+                checked_at = self._image_checked_at(value, ttl) or self._check_image(value)
+            else:
+                ttl = timedelta(hours=self.config['source_ttl_hours'])
+                checked_at = self._source_checked_at(value, ttl) or self._check_source(value, *details)
+            if checked_at:
+                self._cache.add(key, checked_at + ttl)
+        except Exception as e:
+            self._count('errors')
+            logger.debug(f"Enrichment check of {kind} {value} failed: {e}", extra={'sample_key': 'enrichment_error'})
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _request(self, url):
+        # Returns the response of a HEAD request, or of a GET if HEAD is not implemented; None if unreachable
+        import requests
+        session = self._get_session()
+        try:
+            response = session.head(url, timeout=self.config['timeout'], allow_redirects=True)
+            if response.status_code in HEAD_NOT_SUPPORTED:
+                response = session.get(url, timeout=self.config['timeout'], allow_redirects=True, stream=True)
+                response.close()
+            return response
+        except requests.RequestException as e:
+            logger.debug(f"Enrichment request to {url} failed: {e}", extra={'sample_key': 'enrichment_request'})
+            return None
+
+    def _image_checked_at(self, url, ttl):
+        return _checked_at("SELECT checked_at FROM image_checks WHERE url_hash = %s AND checked_at >= %s",
+                           url_hash(url), ttl)
+
+    def _source_checked_at(self, domain, ttl):
+        return _checked_at("SELECT checked_at FROM source_domains WHERE domain = %s AND checked_at >= %s",
+                           domain, ttl)
+
+    def _check_image(self, url):
+        response = self._request(url)
+        status_code = response.status_code if response is not None else None
+        content_type = response.headers.get('Content-Type') if response is not None else None
+        content_length = response.headers.get('Content-Length') if response is not None else None
+        alive = status_code is not None and status_code < 400 and (
+            not content_type or content_type.lower().startswith('image/'))
+        self._count('checked')
+        self._count('alive' if alive else 'dead')
+        now = datetime.now()
+        _execute("""
+        INSERT INTO image_checks (url_hash, url, status_code, content_type, content_length, alive, checked_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            status_code = VALUES(status_code),
+            content_type = VALUES(content_type),
+            content_length = VALUES(content_length),
+            alive = VALUES(alive),
+            checked_at = VALUES(checked_at)
+        """, (url_hash(url), url, status_code, content_type,
+              int(content_length) if content_length and content_length.isdigit() else None, int(alive), now))
+        return now
+
+    def _check_source(self, domain, home_url, source_name=None, source_icon=None):
+        response = self._request(home_url)
+        status_code = response.status_code if response is not None else None
+        reachable = status_code is not None and status_code < 400
+        self._count('checked')
+        self._count('alive' if reachable else 'dead')
+        now = datetime.now()
+        _execute("""
+        INSERT INTO source_domains (domain, home_url, source_name, source_icon, status_code, reachable, checked_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            home_url = VALUES(home_url),
+            source_name = COALESCE(VALUES(source_name), source_name),
+            source_icon = COALESCE(VALUES(source_icon), source_icon),
+            status_code = VALUES(status_code),
+            reachable = VALUES(reachable),
+            checked_at = VALUES(checked_at)
+        """, (domain, response.url if response is not None else home_url, source_name, source_icon, status_code,
+              int(reachable), now))
+        return now
+
+    def pending(self):
+        """
+        Get the number of checks queued or running.
+
+        Returns:
+            int: Pending checks.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self, timeout=None):
+        """
+        Wait for the pending checks.
+
+        Args:
+            timeout (float, optional): Seconds to wait at most. Defaults to waiting until they are done.
+
+        Returns:
+            bool: True if no check is pending anymore.
+        """
+        with self._lock:
+            futures = set(self._futures)
+        wait(futures, timeout)
+        return self.pending() == 0
+
+    def stop(self, timeout=None):
+        """
+        Wait up to `timeout` seconds for the pending checks, then cancel the queued ones.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to waiting until they are done.
+
+        Returns:
+            dict: The stage's counters (see stats).
+        """
+        self.drain(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return self.stats()
+
+    def stats(self):
+        """
+        Get the counters of the stage.
+
+        Returns:
+            dict: Checks submitted, dropped (queue full), answered from the cache, made, alive, dead
+            and failed, plus the number still pending.
+        """
+        with self._lock:
+            return {**self.counters, 'pending': len(self._pending)}
+
+
+def _checked_at(query, key, ttl):
+    # Time of the last check of a URL or domain, if within its TTL
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, (key, datetime.now() - ttl))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def _execute(query, params):
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        conn.commit()
+    except Error:
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+_stage = None
+_stage_lock = threading.Lock()
+
+
+def get_enrichment_stage():
+    """
+    Get the enrichment stage, creating it on first use.
+
+    Returns:
+        EnrichmentStage: The stage.
+    """
+    global _stage
+    with _stage_lock:
+        if _stage is None:
+            _stage = EnrichmentStage()
+        return _stage
+
+
+def enrich_articles(table_name, records):
+    """
+    Queue the enrichment of newly inserted articles, if ENRICHMENT_ENABLED is set.
+
+    Args:
+        table_name (str): The article table.
+        records (list): The inserted records.
+
+    Returns:
+        int: Number of checks queued.
+    """
+    if not ENRICHMENT_CONFIG["enabled"] or not records:
+        return 0
+    try:
+        return get_enrichment_stage().submit(table_name, records)
+    except Exception as e:
+        # Enrichment is best effort and must never fail an insert
+        logger.error(f"Error queueing the enrichment of {table_name} articles: {e}")
+        return 0
+
+
+def stop_enrichment(timeout=None):
+    """
+    Finish the enrichment stage at the end of a run: wait for the pending checks for up
+    to `timeout` seconds, then cancel the others. The next submit starts a new stage.
+
+    Args:
+        timeout (float, optional): Seconds to wait. Defaults to ENRICHMENT_DRAIN_SECONDS.
+
+    Returns:
+        dict or None: The stage's counters, None if the stage was not started.
+    """
+    global _stage
+    with _stage_lock:
+        stage, _stage = _stage, None
+    if stage is None:
+        return None
+    stats = stage.stop(ENRICHMENT_CONFIG["drain_seconds"] if timeout is None else timeout)
+    logger.info(f"Enrichment stats: {stats}")
+    return stats
+
+
+def get_source_domains(limit=50):
+    """
+    Get the resolved source domains, most recently checked first.
+
+    Args:
+        limit (int, optional): Number of domains. Defaults to 50.
+
+    Returns:
+        list: Domain dictionaries.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT domain, home_url, source_name, source_icon, status_code, reachable, checked_at
+        FROM source_domains
+        ORDER BY checked_at DESC
+        LIMIT %s
+        """, (limit,))
+        return cursor.fetchall()
+    except Error as e:
+        logger.error(f"Error reading source domains: {e}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage and inspect the enrichment of articles.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    sources_parser = subparsers.add_parser('sources', help="Print the resolved source domains")
+    sources_parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    print(json.dumps(get_source_domains(args.limit), indent=2, default=str))
@@ -0,0 +1,180 @@
+# scripts\utils\fetch_scheduler.py
+
+import os
+import sys
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error  # noqa: E402
+
+# Initialize logger
+logger = get_logger('fetch_scheduler')
+
+# Load environment variables
+load_dotenv()
+
+# Scheduler configuration (all intervals in minutes)
+SCHEDULER_CONFIG = {
+    "default_interval": int(os.getenv("SCHEDULER_DEFAULT_INTERVAL_MINUTES", 60)),
+    "min_interval": int(os.getenv("SCHEDULER_MIN_INTERVAL_MINUTES", 15)),
+    "max_interval": int(os.getenv("SCHEDULER_MAX_INTERVAL_MINUTES", 1440)),
+    # Number of new articles per fetch we aim for; more shortens the interval, fewer lengthens it
+    "target_new_articles": int(os.getenv("SCHEDULER_TARGET_NEW_ARTICLES", 5)),
+    # Maximum factor the interval may grow or shrink by after a single fetch
+    "max_step": float(os.getenv("SCHEDULER_MAX_STEP", 2.0)),
+}
+
+
+def compute_next_interval(current_interval, new_articles, config=SCHEDULER_CONFIG):
+    """
+    Compute the next refresh interval for an (interest, provider) pair.
+
+    The interval is scaled by target / new_articles so that pairs producing many
+    new articles are fetched more often and quiet pairs back off. A fetch with no
+    new articles doubles the interval (bounded by max_step).
+
+    Args:
+        current_interval (int): Current interval in minutes.
+        new_articles (int): Number of genuinely new articles inserted by the last fetch.
+        config (dict, optional): Scheduler configuration. Defaults to SCHEDULER_CONFIG.
+
+    Returns:
+        int: The new interval in minutes, clamped to the configured bounds.
+    """
+    max_step = config['max_step']
+    if new_articles <= 0:
+        factor = max_step
+    else:
+        factor = config['target_new_articles'] / new_articles
+        factor = min(max(factor, 1 / max_step), max_step)
+
+    next_interval = int(round(current_interval * factor))
+    return min(max(next_interval, config['min_interval']), config['max_interval'])
+
+
+def load_schedule():
+    """
+    Load the whole fetch schedule in a single query.
+
+    Returns:
+        dict: Mapping of (interest_id, api_name_id) to the schedule row.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT interest_id, api_name_id, interval_minutes, next_fetch, last_new_articles
+        FROM fetch_schedule
+        """)
+        schedule = {(row['interest_id'], row['api_name_id']): row for row in cursor.fetchall()}
+        logger.info(f"Loaded {len(schedule)} fetch schedule entries")
+        return schedule
+    except Error as e:
+        logger.error(f"Error loading fetch schedule: {e}")
+        return {}
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def get_due_apis(schedule, interest_id, apis_to_fetch, now=None):
+    """
+    Filter the APIs whose refresh interval has elapsed for an interest.
+
+    Args:
+        schedule (dict): Schedule as returned by load_schedule().
+        interest_id (int): ID of the interest.
+        apis_to_fetch (list): Candidate API names.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        list: API names that are due. Pairs never fetched before are always due.
+    """
+    now = now or datetime.now()
+    due_apis = []
+    for api in apis_to_fetch:
+        entry = schedule.get((interest_id, api))
+        if entry is None or entry['next_fetch'] is None or entry['next_fetch'] <= now:
+            due_apis.append(api)
+    return due_apis
+
+
+def record_fetch_result(schedule, interest_id, api_name_id, new_articles, now=None):
+    """
+    Record the outcome of a fetch and reschedule the (interest, provider) pair.
+
+    Args:
+        schedule (dict): Schedule as returned by load_schedule(); updated in place.
+        interest_id (int): ID of the interest.
+        api_name_id (str): Name of the API.
+        new_articles (int): Number of new articles inserted by the fetch.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        bool: True if the schedule was updated, False otherwise.
+    """
+    now = now or datetime.now()
+    entry = schedule.get((interest_id, api_name_id))
+    current_interval = entry['interval_minutes'] if entry else SCHEDULER_CONFIG['default_interval']
+    interval = compute_next_interval(current_interval, new_articles)
+    next_fetch = now + timedelta(minutes=interval)
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        query = """
+        INSERT INTO fetch_schedule
+            (interest_id, api_name_id, interval_minutes, last_fetch, next_fetch,
+             last_new_articles, total_fetches, total_new_articles)
+        VALUES (%s, %s, %s, %s, %s, %s, 1, %s)
+        ON DUPLICATE KEY UPDATE
+            interval_minutes = VALUES(interval_minutes),
+            last_fetch = VALUES(last_fetch),
+            next_fetch = VALUES(next_fetch),
+            last_new_articles = VALUES(last_new_articles),
+            total_fetches = total_fetches + 1,
+            total_new_articles = total_new_articles + VALUES(total_new_articles)
+        """
+        cursor.execute(query, (interest_id, api_name_id, interval, now, next_fetch, new_articles, new_articles))
+        conn.commit()
+
+        schedule[(interest_id, api_name_id)] = {
+            'interest_id': interest_id,
+            'api_name_id': api_name_id,
+            'interval_minutes': interval,
+            'next_fetch': next_fetch,
+            'last_new_articles': new_articles,
+        }
+        logger.info(
+            f"Interest {interest_id} / {api_name_id}: {new_articles} new articles, "
+            f"interval {current_interval} -> {interval} minutes"
+        )
+        return True
+    except Error as e:
+        logger.error(f"Error updating fetch schedule for interest {interest_id} / {api_name_id}: {e}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    for new in [0, 1, 5, 20]:
+        print(f"{new} new articles: 60 -> {compute_next_interval(60, new)} minutes")
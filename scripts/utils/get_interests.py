@@ -7,33 +7,93 @@ import sys
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
+import threading
 from scripts.utils.db_connection import get_db_connection, close_connection
 from scripts.utils.logger_config import get_logger
+from scripts.utils.sharding import filter_shard
 
 # Initialize logger
 logger = get_logger('get_interests')
 
-def get_interests():
+INTEREST_COLUMNS = "id, formatted_interest, category, language, country"
+
+# How the shared repository detects changed interests: 'updated_at' or 'checksum' (see InterestRepository)
+INTEREST_CHANGE_DETECTION = os.getenv("INTEREST_CHANGE_DETECTION", "updated_at").lower()
+
+def build_interest_filters(status=1, ids=None, min_id=None, max_id=None, language=None,
+                           min_priority=None):
+    """
+    Build the WHERE clause selecting interests.
+
+    Shards are not selected in SQL: the interests of a shard are those it owns on the
+    hash ring of sharding.py (see filter_shard), which has no SQL equivalent.
+
+    Args:
+        status (int, optional): Interest status. None selects every status. Defaults to 1 (active).
+        ids (list, optional): Only these interest IDs.
+        min_id (int, optional): Lowest interest ID (inclusive).
+        max_id (int, optional): Highest interest ID (inclusive).
+        language (str or list, optional): Only interests in these languages.
+        min_priority (int, optional): Only interests with at least this priority.
+
+    Returns:
+        tuple: (where clause, list of query parameters).
+    """
+    conditions = []
+    params = []
+    if status is not None:
+        conditions.append("status = %s")
+        params.append(status)
+    if ids:
+        conditions.append(f"id IN ({', '.join(['%s'] * len(ids))})")
+        params.extend(ids)
+    if min_id is not None:
+        conditions.append("id >= %s")
+        params.append(min_id)
+    if max_id is not None:
+        conditions.append("id <= %s")
+        params.append(max_id)
+    if language:
+        languages = [language] if isinstance(language, str) else list(language)
+        conditions.append(f"language IN ({', '.join(['%s'] * len(languages))})")
+        params.extend(languages)
+    if min_priority is not None:
+        conditions.append("priority >= %s")
+        params.append(min_priority)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+def get_interests(shard_index=None, num_shards=None, **filters):
     """
     Fetch interests from the database.
 
+    Args:
+        shard_index (int, optional): Only the interests of this shard (0-based), with num_shards.
+        num_shards (int, optional): Total number of shards.
+        **filters: Filters accepted by build_interest_filters (status, ids, min_id, max_id,
+            language, min_priority). Defaults to every active interest.
+
     Returns:
         list: A list of dictionaries containing interest data.
     """
     conn = None
+    cursor = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
-        query = """
-        SELECT id, formatted_interest, category, language, country
+        where, params = build_interest_filters(**filters)
+        query = f"""
+        SELECT {INTEREST_COLUMNS}
         FROM interests
-        WHERE status = 1
-        AND id IN (35);
+        {where}
+        ORDER BY id;
         """
 
-        cursor.execute(query)
+        cursor.execute(query, params)
         interests = cursor.fetchall()
+        if num_shards and num_shards > 1:
+            interests = filter_shard(interests, shard_index or 0, num_shards)
 
         logger.info(f"Successfully fetched {len(interests)} interests from the database")
         return interests
@@ -48,6 +108,168 @@ def get_interests():
         if conn:
             close_connection(conn)
 
+class InterestRepository:
+    """
+    In-memory cache of the interests matching a set of filters.
+
+    Each refresh() first runs a cheap query to detect changes and only re-reads what
+    changed, so daemon and scheduler modes can call it every cycle:
+
+    - 'updated_at' mode reads the rows modified since the last seen updated_at (of any
+      status, so deactivated interests are dropped) and falls back to a full reload when
+      the row count no longer matches (deleted rows). The rows of the last seen second are
+      read again, as updated_at has a one-second precision, and only count as changed if
+      they differ from the cached ones.
+    - 'checksum' mode compares a server-side checksum of the matching rows and reloads
+      everything when it changes; use it when the table has no updated_at column.
+    """
+
+    def __init__(self, change_detection='updated_at', **filters):
+        """
+        Args:
+            change_detection (str, optional): 'updated_at' or 'checksum'. Defaults to 'updated_at'.
+            **filters: Filters accepted by build_interest_filters.
+        """
+        if change_detection not in ('updated_at', 'checksum'):
+            raise ValueError("change_detection must be 'updated_at' or 'checksum'.")
+        self.change_detection = change_detection
+        self.filters = filters
+        self._interests = {}
+        self._high_water = None
+        self._checksum = None
+        self._loaded = False
+
+    def get_interests(self):
+        """
+        Get the cached interests, refreshing them if the table changed.
+
+        Returns:
+            list: A list of dictionaries containing interest data, ordered by ID.
+        """
+        self.refresh()
+        # Copies, so callers cannot alter the cache
+        return [dict(self._interests[interest_id]) for interest_id in sorted(self._interests)]
+
+    def refresh(self, force=False):
+        """
+        Bring the cache up to date with the interests table.
+
+        Args:
+            force (bool, optional): If True, reload every interest. Defaults to False.
+
+        Returns:
+            bool: True if the cached interests changed, False otherwise.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            if force or not self._loaded:
+                self._reload(cursor)
+                return True
+            if self.change_detection == 'checksum':
+                return self._refresh_by_checksum(cursor)
+            return self._refresh_by_updated_at(cursor)
+        except Exception as e:
+            logger.error(f"Error refreshing interests from database: {e}")
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                close_connection(conn)
+
+    def _checksum_query(self, cursor):
+        where, params = build_interest_filters(**self.filters)
+        cursor.execute(f"""
+        SELECT COUNT(*) AS row_count,
+               BIT_XOR(CRC32(CONCAT_WS('|', id, formatted_interest, category, language, country))) AS checksum
+        FROM interests
+        {where}
+        """, params)
+        row = cursor.fetchone()
+        return (row['row_count'], row['checksum'])
+
+    def _reload(self, cursor):
+        where, params = build_interest_filters(**self.filters)
+        columns = INTEREST_COLUMNS if self.change_detection == 'checksum' else f"{INTEREST_COLUMNS}, updated_at"
+        cursor.execute(f"SELECT {columns} FROM interests {where} ORDER BY id", params)
+        rows = cursor.fetchall()
+        self._interests = {}
+        for row in rows:
+            updated_at = row.pop('updated_at', None)
+            if updated_at is not None and (self._high_water is None or updated_at > self._high_water):
+                self._high_water = updated_at
+            self._interests[row['id']] = row
+        if self.change_detection == 'checksum':
+            self._checksum = self._checksum_query(cursor)
+        self._loaded = True
+        logger.info(f"Loaded {len(self._interests)} interests into the cache")
+
+    def _refresh_by_checksum(self, cursor):
+        checksum = self._checksum_query(cursor)
+        if checksum == self._checksum:
+            return False
+        self._reload(cursor)
+        return True
+
+    def _refresh_by_updated_at(self, cursor):
+        # Changed rows of any status, so deactivated interests are seen and dropped
+        status = self.filters.get('status', 1)
+        filters = {**self.filters, 'status': None}
+        where, params = build_interest_filters(**filters)
+        if self._high_water is not None:
+            where = f"{where} AND updated_at >= %s" if where else "WHERE updated_at >= %s"
+            params.append(self._high_water)
+        cursor.execute(f"SELECT {INTEREST_COLUMNS}, status, updated_at FROM interests {where}", params)
+
+        changed = []
+        for row in cursor.fetchall():
+            updated_at = row.pop('updated_at')
+            row_status = row.pop('status')
+            if updated_at is not None and (self._high_water is None or updated_at > self._high_water):
+                self._high_water = updated_at
+            if status is None or row_status == status:
+                if self._interests.get(row['id']) != row:
+                    self._interests[row['id']] = row
+                    changed.append(row['id'])
+            elif self._interests.pop(row['id'], None) is not None:
+                changed.append(row['id'])
+
+        # Deleted rows leave no updated_at trace; a count mismatch triggers a full reload
+        where, params = build_interest_filters(**self.filters)
+        cursor.execute(f"SELECT COUNT(*) AS row_count FROM interests {where}", params)
+        if cursor.fetchone()['row_count'] != len(self._interests):
+            logger.info("Interest count changed, reloading all interests")
+            self._reload(cursor)
+            return True
+
+        if changed:
+            logger.info(f"Refreshed {len(changed)} changed interests")
+        return bool(changed)
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_interest_repository():
+    """
+    Get the process-wide repository of the active interests, created on first use.
+
+    Successive runs in the same process (e.g. a scheduler loop) only re-read the interests
+    that changed, see InterestRepository.
+
+    Returns:
+        InterestRepository: The repository, with INTEREST_CHANGE_DETECTION.
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = InterestRepository(change_detection=INTEREST_CHANGE_DETECTION)
+    return _repository
+
 if __name__ == "__main__":
     # Test the function
     fetched_interests = get_interests()
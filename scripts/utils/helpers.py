@@ -3,12 +3,18 @@
 import os
 import time
 import json
-import requests
+import threading
 from datetime import datetime
 from scripts.utils.logger_config import get_logger
 from scripts.utils.db_insert_api_calls import insert_api_response
 from scripts.utils.track_api_calls import track_api_call
 from scripts.utils.process_fetched_data import process_and_insert_data
+from scripts.utils.retry_policy import RETRY_CONFIG, is_retryable, compute_delay, get_circuit_breaker
+from scripts.utils.single_flight import SingleFlight, request_key
+from scripts.utils.http_cassette import get_cassette
+from scripts.utils.response_envelope import ResponseEnvelope, json_default
+from scripts.utils.json_stream import STREAM_CONFIG, StreamingJSONObject, iter_batches, strip_heavy_fields
+from scripts.utils.concurrency import CONCURRENCY_CONFIG, get_concurrency_limiter, outcome_for_status, ERROR
 
 # Initialize logger
 logger = get_logger('helpers')
@@ -18,27 +24,185 @@ import sys
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
+# Identical requests in flight at the same time share a single call
+_in_flight_requests = SingleFlight()
 
-def fetch_news(url, params, api_name, api_script_path, max_retries=3):
+# Shared HTTP session (keeps connections to the providers alive), created on first use
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Get the shared HTTP session, importing requests and creating the session on first use.
+
+    Returns:
+        requests.Session: The HTTP session.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                _http_session = requests.Session()
+                # Keep a connection per request each provider may have in flight
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=int(CONCURRENCY_CONFIG['max_limit']))
+                _http_session.mount('http://', adapter)
+                _http_session.mount('https://', adapter)
+    return _http_session
+
+
+def fetch_news(url, params, api_name, api_script_path, max_retries=3, stats=None, process=True, track=True,
+               stream=None):
     """
     Fetch news data from a given API.
 
+    Concurrent calls with the same URL, parameters and process/track/stream options are
+    coalesced: only the first caller hits the API and inserts the articles, the others
+    receive its result and insertion counts.
+
     Args:
         url (str): API endpoint URL.
         params (dict): Parameters for the API call.
         api_name (str): Name of the API.
         api_script_path (str): Path to the specific API script file.
         max_retries (int, optional): Maximum number of retries. Defaults to 3.
+        stats (dict, optional): If provided, filled as described in _fetch_news (with the counts of the
+            call that was made, for a shared result), plus 'shared' (True if the result came from
+            another caller's in-flight request).
+        process (bool, optional): If True, insert the articles into the provider's table. Defaults to True.
+        track (bool, optional): If True, count the call in the api_usage table. Defaults to True.
+        stream (bool, optional): If True, parse the response incrementally (see _fetch_news).
+            Defaults to the JSON_STREAMING environment variable.
 
     Returns:
-        dict or None: JSON response from the API or None if failed.
+        ResponseEnvelope or None: JSON response from the API, with its request metadata, or None if failed.
     """
-    response = None  # Initialize response
+    stream = (STREAM_CONFIG["enabled"] if stream is None else stream) and process
+    call_stats = {}
+    # Calls only share a flight if they would also process and count the response the same way
+    (data, leader_stats), shared = _in_flight_requests.do(
+        (request_key(url, params), process, track, stream),
+        lambda: (_fetch_news(url, params, api_name, api_script_path, max_retries, call_stats, process, track, stream),
+                call_stats)
+    )
+    if shared:
+        logger.info(f"Reused in-flight {api_name} request with identical parameters")
+    if stats is not None:
+        stats.update(leader_stats)
+        stats['shared'] = shared
+    return data
+
+
+def _stream_news(response, api_name, interest, params, stats=None):
+    """
+    Parse a response incrementally, inserting its articles in batches as they are decoded.
+
+    Args:
+        response (requests.Response): Response opened with stream=True.
+        api_name (str): Name of the API.
+        interest (str): Interest the request was made for.
+        params (dict): Request parameters, with the API key redacted.
+        stats (dict, optional): If provided, filled with the summed insertion counts.
+
+    Returns:
+        ResponseEnvelope: The response, with its first JSON_STREAM_MAX_RETURNED_ITEMS articles
+        without their content fields.
+    """
+    parsed = StreamingJSONObject(response.iter_content(STREAM_CONFIG["chunk_size"]))
+    max_returned = STREAM_CONFIG["max_returned_items"]
+    articles = []
+    for batch in iter_batches(parsed.items()):
+        batch_stats = {}
+        batch_response = ResponseEnvelope({parsed.items_key: batch}, api_name, interest)
+        if not process_and_insert_data(api_name, batch_response, batch_stats):
+            logger.error(f"Failed to insert a batch of {len(batch)} {api_name} articles into the database.")
+        if stats is not None:
+            for name, value in batch_stats.items():
+                stats[name] = stats.get(name, 0) + value
+        articles.extend(strip_heavy_fields(article) for article in batch[:max_returned - len(articles)])
+
+    if parsed.items_count > len(articles):
+        logger.info(f"Inserted {parsed.items_count} streamed {api_name} articles, returning the first {len(articles)}")
+    payload = parsed.fields
+    if parsed.items_key is not None:
+        payload[parsed.items_key] = articles
+    logger.debug(f"Streamed {parsed.items_count} {api_name} articles from {parsed.bytes_read} bytes")
+    return ResponseEnvelope(payload, api_name, interest, params, elapsed=response.elapsed.total_seconds(),
+                            raw_size=parsed.bytes_read)
+
+
+def _fetch_news(url, params, api_name, api_script_path, max_retries=3, stats=None, process=True, track=True,
+                stream=None):
+    """
+    Fetch news data from a given API, without request coalescing.
+
+    Args:
+        url (str): API endpoint URL.
+        params (dict): Parameters for the API call.
+        api_name (str): Name of the API.
+        api_script_path (str): Path to the specific API script file.
+        max_retries (int, optional): Maximum number of retries. Defaults to 3.
+        stats (dict, optional): If provided, filled with insertion counts for the fetched articles,
+            'requests_sent' (requests that reached the provider, not replayed ones).
+        process (bool, optional): If True, insert the articles into the provider's table. Set it to
+            False when the caller processes the response itself (e.g. batched queries). Defaults to True.
+        track (bool, optional): If True, count the call in the api_usage table. Set it to False when
+            the call was already counted by reserve_api_call (sharded runs). Defaults to True.
+        stream (bool, optional): If True (and process is True), read the response in chunks and
+            insert its articles in batches of JSON_STREAM_BATCH_SIZE while they are decoded, so a
+            large response is never held whole. The returned response (also the one logged in
+            api_calls) then only has its first JSON_STREAM_MAX_RETURNED_ITEMS articles, without
+            their content fields. Defaults to the JSON_STREAMING environment variable.
+
+    With HTTP_CASSETTE_MODE=record every response is also archived, and with
+    HTTP_CASSETTE_MODE=replay responses are served from the archive instead of the
+    network (and not counted in api_usage), see scripts/utils/http_cassette.py.
+
+    Requests wait for a slot of the provider's adaptive concurrency limit, which is
+    adjusted from their latency, 429s and errors (see scripts/utils/concurrency.py).
+    A provider that does not answer within HTTP_REQUEST_TIMEOUT fails with a retryable timeout.
+
+    Returns:
+        ResponseEnvelope or None: JSON response from the API, with its interest and request
+        metadata, or None if failed.
+    """
+    import requests  # Imported on first fetch rather than at startup
+
+    session = get_http_session()
+    cassette = get_cassette()
+    if cassette is not None and cassette.replaying:
+        track = False
+    stream = (STREAM_CONFIG["enabled"] if stream is None else stream) and process
+    breaker = get_circuit_breaker(api_name)
+    limiter = get_concurrency_limiter(api_name)
     for attempt in range(max_retries):
+        if breaker.is_open():
+            logger.warning(f"Circuit for {api_name} is open, skipping request.")
+            return None
+        wait_time = breaker.wait_time()
+        if wait_time:
+            time.sleep(wait_time)
+        if not breaker.allow_request():
+            logger.warning(f"Circuit for {api_name} does not allow requests, skipping request.")
+            return None
+
+        response = None  # Initialize response
         try:
-            response = requests.get(url, params=params)
+            started = limiter.acquire()
+            outcome = ERROR
+            if stats is not None and not (cassette is not None and cassette.replaying):
+                stats['requests_sent'] = stats.get('requests_sent', 0) + 1
+            try:
+                if cassette is not None:
+                    response = cassette.get(session, url, params, api_name, timeout=RETRY_CONFIG["request_timeout"],
+                                            stream=stream)
+                else:
+                    response = session.get(url, params=params, stream=stream, timeout=RETRY_CONFIG["request_timeout"])
+                outcome = outcome_for_status(response.status_code)
+            finally:
+                limiter.release(started, outcome)
             response.raise_for_status()
-            data = response.json()
 
              # Log the API call without the API key
             safe_params = params.copy()
@@ -52,26 +216,34 @@ def fetch_news(url, params, api_name, api_script_path, max_retries=3):
             # Extract the interest from the 'q' parameter
             interest = safe_params.get('q', '')
 
-            # Add interest as the first key in the JSON response
-            if isinstance(data, dict):
-                # Insert interest as the first key in the dictionary
-                data = {'interest': interest, **data}
+            if stream:
+                # The articles are inserted while the response is read
+                try:
+                    data = _stream_news(response, api_name, interest, safe_params, stats)
+                finally:
+                    response.close()
             else:
-                # If the data isn't a dictionary, log an error or handle it accordingly
-                # Optionally, raise an exception or log this case
-                raise ValueError("Expected data to be a dictionary but got something else.")
-            
+                payload = response.json()
+                if not isinstance(payload, dict):
+                    raise ValueError("Expected data to be a dictionary but got something else.")
+                # The interest and request metadata travel next to the untouched payload
+                data = ResponseEnvelope(payload, api_name, interest, safe_params,
+                                        elapsed=response.elapsed.total_seconds(), raw_size=len(response.content))
+
             insert_api_response(api_script_path, safe_params, data, custom_params)
 
             # Track the API call
-            track_api_call(api_name)
+            if track:
+                track_api_call(api_name)
 
             # NEW: Process and insert data into the database
-            if not process_and_insert_data(api_name, data):
-                logger.error(f"Failed to insert data from {api_name} into the database.")
-            else:
-                logger.info(f"Data from {api_name} successfully inserted into the database.")
+            if process and not stream:
+                if not process_and_insert_data(api_name, data, stats):
+                    logger.error(f"Failed to insert data from {api_name} into the database.")
+                else:
+                    logger.info(f"Data from {api_name} successfully inserted into the database.")
 
+            breaker.record_success()
             logger.info(f"Successfully fetched data from {api_name}")
             return data
         except requests.RequestException as e:
@@ -85,32 +257,45 @@ def fetch_news(url, params, api_name, api_script_path, max_retries=3):
                     logger.error(f"Response content is not JSON: {response.text}")
             else:
                 logger.error("No response received from the server.")
+            breaker.record_failure(e)
+            if not is_retryable(e):
+                logger.error(f"Permanent error for {api_name}, not retrying.")
+                return None
             if attempt == max_retries - 1:
                 logger.error(f"Max retries reached for {api_name}. Giving up.")
                 return None
-            time.sleep(2 ** attempt)  # Exponential backoff
+            # Exponential backoff with jitter, or the provider's Retry-After; shared with other callers
+            breaker.defer(compute_delay(attempt, e))
+        except Exception as e:
+            # Not retried (e.g. an unexpected payload), but still recorded, so a half-open
+            # circuit does not keep waiting for the outcome of its trial request
+            logger.error(f"Attempt {attempt + 1} failed for {api_name}: {str(e)}", exc_info=True)
+            breaker.record_failure(e)
+            return None
 
-def save_news_data(news_data):
+def save_news_data(news_data, suffix=None):
     """
     Save the fetched news data to JSON files in a daily folder.
 
     Args:
         news_data (dict): Dictionary containing news data from each API.
+        suffix (str, optional): Appended to the file names, e.g. to keep shards from overwriting each other.
     """
     # Get current date (for daily folder) and current time (for each file)
     date_str = datetime.now().strftime('%Y%m%d')
     time_str = datetime.now().strftime('%H%M%S')
     
     # Create a daily folder based on the date
-    folder_path = os.path.join(project_root, 'fetched_news', date_str)
+    output_root = os.getenv("FETCHED_NEWS_DIR", os.path.join(project_root, 'fetched_news'))
+    folder_path = os.path.join(output_root, date_str)
     os.makedirs(folder_path, exist_ok=True)
 
     # Save each API data file with a timestamp in the filename
     for api_name, api_data in news_data.items():
-        filename = f'{api_name}_{time_str}.json'
+        filename = f'{api_name}_{time_str}_{suffix}.json' if suffix else f'{api_name}_{time_str}.json'
         file_path = os.path.join(folder_path, filename)
 
         with open(file_path, 'w') as f:
-            json.dump(api_data, f, indent=4)
+            json.dump(api_data, f, indent=4, default=json_default)
 
         logger.debug(f"{api_name} data saved to {file_path}")
\ No newline at end of file
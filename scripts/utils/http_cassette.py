@@ -0,0 +1,350 @@
+# scripts\utils\http_cassette.py
+
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import timedelta
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.single_flight import request_key  # noqa: E402
+from scripts.utils.response_envelope import ResponseEnvelope  # noqa: E402
+
+# Initialize logger
+logger = get_logger('http_cassette')
+
+# Load environment variables
+load_dotenv()
+
+# Cassette configuration
+CASSETTE_CONFIG = {
+    # '' (disabled), 'record' (call the providers and archive the responses) or 'replay' (serve the archive)
+    "mode": os.getenv("HTTP_CASSETTE_MODE", "").lower(),
+    "path": os.getenv("HTTP_CASSETTE_PATH", os.path.join(project_root, 'cassettes', 'http_cassette.db')),
+    # Parameters left out of the request key: API keys, and the date windows that change every run
+    "ignored_params": {
+        name.strip() for name in
+        os.getenv("HTTP_CASSETTE_IGNORE_PARAMS", "apikey,api_key,apiKey,key,token,access_key,from,to").split(',')
+        if name.strip()
+    },
+}
+
+CASSETTE_MODES = ('record', 'replay')
+
+# Response headers kept in the archive; the pipeline only reads these
+RECORDED_HEADERS = ('Content-Type', 'Retry-After')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    request_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    api_name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (request_key, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_responses_api_name ON responses (api_name);
+"""
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def cassette_key(url, params, ignored_params=None):
+    """
+    Build the archive key of a request.
+
+    The key is the hashed request_key() of the request without the ignored parameters,
+    so a recording made with another API key or on another day still matches.
+
+    Args:
+        url (str): API endpoint URL.
+        params (dict): Parameters of the request.
+        ignored_params (set, optional): Parameter names left out. Defaults to CASSETTE_CONFIG's.
+
+    Returns:
+        str: The key.
+    """
+    ignored = CASSETTE_CONFIG["ignored_params"] if ignored_params is None else ignored_params
+    key = request_key(url, {k: v for k, v in params.items() if k not in ignored})
+    return hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+
+
+class HttpCassette:
+    """
+    Archive of raw provider responses, recorded from live requests and replayed offline.
+
+    Responses are stored zlib-compressed in an indexed SQLite file, under the key of their
+    request. A request made several times (e.g. retried after an error) keeps every response
+    in order, and replay serves them back in the same order, repeating the last one once
+    the recording is exhausted, so runs are deterministic.
+    """
+
+    def __init__(self, path, mode='replay'):
+        """
+        Args:
+            path (str): Path of the archive file, created if missing.
+            mode (str, optional): 'record' or 'replay'. Defaults to 'replay'.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Invalid cassette mode '{mode}'. Valid modes are: {', '.join(CASSETTE_MODES)}")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        # Next sequence number to replay, per request key
+        self._replay_positions = {}
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+    @property
+    def replaying(self):
+        """bool: True if responses are served from the archive."""
+        return self.mode == 'replay'
+
+    def get(self, session, url, params, api_name, timeout=None, stream=False):
+        """
+        Perform a GET request through the cassette.
+
+        Args:
+            session (requests.Session): Session used for live requests.
+            url (str): API endpoint URL.
+            params (dict): Parameters of the request.
+            api_name (str): Name of the API.
+            timeout (float, optional): Timeout of live requests, in seconds.
+            stream (bool, optional): Open live responses with stream=True; a successful one is
+                archived once its body has been read with iter_content(). Defaults to False.
+
+        Returns:
+            requests.Response: The live response (recorded) or the archived one.
+        """
+        if self.replaying:
+            return self.replay(url, params)
+        response = session.get(url, params=params, stream=stream, timeout=timeout)
+        if stream and response.ok:
+            self._record_stream(url, params, api_name, response)
+        else:
+            self.record(url, params, api_name, response)
+        return response
+
+    def record(self, url, params, api_name, response):
+        """
+        Archive a response.
+
+        Args:
+            url (str): API endpoint URL.
+            params (dict): Parameters of the request.
+            api_name (str): Name of the API.
+            response (requests.Response): The response received.
+        """
+        self._store(url, params, api_name, response, zlib.compress(response.content))
+
+    def _record_stream(self, url, params, api_name, response):
+        # Compress the chunks as the caller reads them and archive the body after the last one,
+        # so a streamed response is never held whole; a body not read to the end is not archived
+        iter_content = response.iter_content
+
+        def recording_iter_content(chunk_size=1, decode_unicode=False):
+            compressor = zlib.compressobj()
+            parts = []
+            for chunk in iter_content(chunk_size, decode_unicode):
+                parts.append(compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk))
+                yield chunk
+            parts.append(compressor.flush())
+            self._store(url, params, api_name, response, b''.join(parts))
+
+        response.iter_content = recording_iter_content
+
+    def _store(self, url, params, api_name, response, body):
+        key = cassette_key(url, params)
+        safe_params = {k: v for k, v in params.items() if k not in CASSETTE_CONFIG["ignored_params"]}
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM responses WHERE request_key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO responses (request_key, seq, api_name, url, params, status_code, headers, body, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, row[0], api_name, url, json.dumps(safe_params, default=str), response.status_code,
+                 json.dumps(headers), body, time.time())
+            )
+            self._conn.commit()
+            self.stats["recorded"] += 1
+        logger.debug(f"Recorded {api_name} response {key}#{row[0]} ({response.status_code})")
+
+    def replay(self, url, params):
+        """
+        Serve the archived response of a request.
+
+        Args:
+            url (str): API endpoint URL.
+            params (dict): Parameters of the request.
+
+        Returns:
+            requests.Response: The archived response, or a 404 response if the request was never recorded.
+        """
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        key = cassette_key(url, params)
+        with self._lock:
+            seq = self._replay_positions.get(key, 0)
+            row = self._conn.execute(
+                "SELECT seq, status_code, headers, body FROM responses "
+                "WHERE request_key = ? AND seq <= ? ORDER BY seq DESC LIMIT 1", (key, seq)
+            ).fetchone()
+            if row is not None:
+                self._replay_positions[key] = row[0] + 1
+                self.stats["replayed"] += 1
+            else:
+                self.stats["misses"] += 1
+
+        response = requests.Response()
+        response.url = requests.Request('GET', url, params=params).prepare().url
+        response.elapsed = timedelta(0)
+        response.encoding = 'utf-8'
+        # The body is in memory, so iter_content() serves it in slices instead of reading response.raw
+        response._content_consumed = True
+        if row is None:
+            logger.warning(f"No recorded response for request {key}")
+            response.status_code = 404
+            response.reason = 'Not Recorded'
+            response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+            response._content = json.dumps({'status': 'error', 'message': 'No recorded response'}).encode('utf-8')
+            return response
+
+        _, status_code, headers, body = row
+        response.status_code = status_code
+        response.reason = 'OK' if status_code < 400 else 'Recorded Error'
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = zlib.decompress(body)
+        return response
+
+    def iter_responses(self, api_name=None, status_code=200):
+        """
+        Iterate over the archived responses, in recording order.
+
+        Args:
+            api_name (str, optional): Only this API's responses.
+            status_code (int, optional): Only responses with this status. None for all. Defaults to 200.
+
+        Yields:
+            tuple: (api_name, params dict, decoded JSON body).
+        """
+        conditions, values = [], []
+        if api_name:
+            conditions.append("api_name = ?")
+            values.append(api_name)
+        if status_code is not None:
+            conditions.append("status_code = ?")
+            values.append(status_code)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT api_name, params, body FROM responses {where} ORDER BY recorded_at", values
+            ).fetchall()
+        for name, params, body in rows:
+            try:
+                yield name, json.loads(params), json.loads(zlib.decompress(body))
+            except ValueError:
+                logger.warning(f"Skipping archived {name} response that is not JSON")
+
+    def summary(self):
+        """
+        Summarize the archive.
+
+        Returns:
+            dict: Per API: number of responses, of distinct requests and stored bytes.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT api_name, COUNT(*), COUNT(DISTINCT request_key), SUM(LENGTH(body)) "
+                "FROM responses GROUP BY api_name ORDER BY api_name"
+            ).fetchall()
+        return {name: {"responses": count, "requests": keys, "bytes": size} for name, count, keys, size in rows}
+
+    def close(self):
+        """Close the archive file."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_cassette():
+    """
+    Get the cassette configured by HTTP_CASSETTE_MODE, opening the archive on first use.
+
+    Returns:
+        HttpCassette or None: The cassette, or None if record/replay is disabled.
+    """
+    global _cassette
+    if CASSETTE_CONFIG["mode"] not in CASSETTE_MODES:
+        return None
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = HttpCassette(CASSETTE_CONFIG["path"], CASSETTE_CONFIG["mode"])
+                logger.info(f"HTTP cassette in {_cassette.mode} mode: {_cassette.path}")
+    return _cassette
+
+
+def reprocess_archive(path, api_name=None):
+    """
+    Run the processing and insertion of every archived successful response, without HTTP.
+
+    Args:
+        path (str): Path of the archive file.
+        api_name (str, optional): Only this API's responses.
+
+    Returns:
+        dict: Per API: responses processed and articles inserted.
+    """
+    from scripts.utils.process_fetched_data import process_and_insert_data
+
+    cassette = HttpCassette(path, 'replay')
+    totals = {}
+    try:
+        for name, params, data in cassette.iter_responses(api_name):
+            if not isinstance(data, dict):
+                continue
+            stats = {}
+            process_and_insert_data(name, ResponseEnvelope(data, name, params.get('q', ''), params), stats)
+            api_totals = totals.setdefault(name, {"responses": 0, "inserted": 0})
+            api_totals["responses"] += 1
+            api_totals["inserted"] += stats.get('inserted', 0)
+    finally:
+        cassette.close()
+    return totals
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or reprocess an HTTP cassette archive.")
+    parser.add_argument('command', choices=['summary', 'reprocess'])
+    parser.add_argument('--path', default=CASSETTE_CONFIG["path"])
+    parser.add_argument('--api', help="Only this API's responses")
+    args = parser.parse_args()
+
+    if args.command == 'summary':
+        archive = HttpCassette(args.path, 'replay')
+        print(json.dumps(archive.summary(), indent=2))
+        archive.close()
+    else:
+        print(json.dumps(reprocess_archive(args.path, args.api), indent=2))
@@ -3,6 +3,7 @@
 import os
 import sys
 import json
+import logging
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -37,11 +38,12 @@ def load_and_insert_newsdata_files(root_folder):
                         # Load the file content
                         with open(file_path, 'r') as f:
                             raw_content = f.read()
-                            logger.debug(f"Raw content from {file_path}: {raw_content[:500]}...")  # Log the first 500 characters for debugging
-                            
+                            if logger.isEnabledFor(logging.DEBUG):
+                                # Log the first 500 characters for debugging
+                                logger.debug(f"Raw content from {file_path}: {raw_content[:500]}...")
+
                             # Attempt to parse the JSON content
                             newsdata_content = json.loads(raw_content)
-                            logger.debug(f"Parsed JSON content from {file_path}: {newsdata_content}")
 
                             # Check if JSON content is valid
                             if not newsdata_content or not isinstance(newsdata_content, dict):
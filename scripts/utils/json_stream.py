@@ -0,0 +1,192 @@
+# scripts\utils\json_stream.py
+
+import os
+import sys
+import json
+import codecs
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+# Load environment variables
+load_dotenv()
+
+# Streaming parse configuration
+STREAM_CONFIG = {
+    # Parse responses incrementally instead of with response.json() (see fetch_news)
+    "enabled": os.getenv("JSON_STREAMING", "false").lower() in ("1", "true", "yes"),
+    # Bytes read from the socket at a time
+    "chunk_size": int(os.getenv("JSON_STREAM_CHUNK_SIZE", 64 * 1024)),
+    # Articles normalized and inserted together
+    "batch_size": int(os.getenv("JSON_STREAM_BATCH_SIZE", 100)),
+    # Articles kept in the response returned by a streamed fetch; the others are only inserted, so
+    # memory stays bounded whatever the size of the response
+    "max_returned_items": int(os.getenv("JSON_STREAM_MAX_RETURNED_ITEMS", 100)),
+}
+
+# Keys of the article list in the responses of the providers
+ITEMS_KEYS = ('results', 'articles', 'news', 'data')
+
+# Article fields not kept in the response returned by a streamed fetch (they are stored in the database)
+HEAVY_FIELDS = ('content', 'full_content')
+
+_WHITESPACE = ' \t\n\r'
+
+
+class StreamingJSONObject:
+    """
+    Incremental parser for a JSON object holding one large array of items.
+
+    The items of the first array found under one of `items_keys` are decoded one at
+    a time from the byte chunks, so only the current item and the unread part of the
+    current chunk are held in memory. The other top-level fields are collected in
+    `fields`, which is complete once items() has been exhausted.
+
+    Example:
+        parsed = StreamingJSONObject(response.iter_content(65536))
+        for article in parsed.items():
+            ...
+        total = parsed.fields.get('totalResults')
+    """
+
+    def __init__(self, chunks, items_keys=ITEMS_KEYS):
+        """
+        Args:
+            chunks (iterable): Byte strings (e.g. response.iter_content()).
+            items_keys (tuple, optional): Keys whose array is streamed. Defaults to ITEMS_KEYS.
+        """
+        self.items_keys = items_keys
+        self.items_key = None
+        self.fields = {}
+        self.bytes_read = 0
+        self.items_count = 0
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        # Read the next chunk, dropping the consumed part of the buffer; False at the end of the stream
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self.bytes_read += len(chunk)
+            self._buffer = self._buffer[self._pos:] + self._decoder.decode(chunk)
+            self._pos = 0
+            return True
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(b'', final=True)
+        self._pos = 0
+        self._eof = True
+        return False
+
+    def _peek(self):
+        # Next non-whitespace character, '' at the end of the stream
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, characters):
+        char = self._peek()
+        if not char or char not in characters:
+            raise json.JSONDecodeError(f"Expecting one of {characters!r}", self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may have more digits in the next chunk
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self):
+        """
+        Iterate over the items of the streamed array.
+
+        Yields:
+            The decoded items, in order.
+
+        Raises:
+            json.JSONDecodeError: If the stream is not a valid JSON object.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if self.items_key is None and key in self.items_keys and self._peek() == '[':
+                self.items_key = key
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        self.items_count += 1
+                        if self._expect(',]') == ']':
+                            break
+            else:
+                self.fields[key] = self._value()
+            if self._expect(',}') == '}':
+                # Read the stream to its end, so the response is released (and archived by a recording cassette)
+                if self._peek():
+                    raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+                return
+
+
+def iter_batches(items, batch_size=None):
+    """
+    Group items in lists.
+
+    Args:
+        items (iterable): The items.
+        batch_size (int, optional): Items per list. Defaults to JSON_STREAM_BATCH_SIZE.
+
+    Yields:
+        list: Up to batch_size items.
+    """
+    batch_size = batch_size or STREAM_CONFIG["batch_size"]
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def strip_heavy_fields(item):
+    """
+    Drop the content fields of an article.
+
+    Args:
+        item: An article (non-dict items are returned unchanged).
+
+    Returns:
+        The article without HEAVY_FIELDS.
+    """
+    if not isinstance(item, dict):
+        return item
+    return {key: value for key, value in item.items() if key not in HEAVY_FIELDS}
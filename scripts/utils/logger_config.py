@@ -1,11 +1,247 @@
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+import uuid
+
+
+def _flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+# Logging configuration
+LOGGING_CONFIG = {
+    # Write records from a background thread; the logging call only enqueues them
+    "async": _flag("LOG_ASYNC", "true"),
+    # Format of the log files: 'text' or 'json' (one JSON object per line)
+    "format": os.getenv("LOG_FORMAT", "text").lower(),
+    "directory": os.getenv("LOG_DIR", "logs"),
+    # Log files are rotated at this size, keeping this many old files
+    "max_bytes": int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024)),
+    "backup_count": int(os.getenv("LOG_BACKUP_COUNT", 5)),
+    # Sampled messages (logged with extra={'sample_key': ...}) emitted per key and per second
+    "sample_rate_per_second": float(os.getenv("LOG_SAMPLE_RATE_PER_SECOND", 5)),
+}
+
+# Fields added to every record of the current run, interest and provider (see log_context)
+CONTEXT_FIELDS = ('run_id', 'interest_id', 'provider')
+
+_log_context = contextvars.ContextVar('log_context', default={})
+
+
+def new_run_id():
+    """
+    Generate an ID for a run.
+
+    Returns:
+        str: 12 hexadecimal characters.
+    """
+    return uuid.uuid4().hex[:12]
+
+
+def bind_log_context(**fields):
+    """
+    Add fields to the context of the records logged by the current thread or task.
+
+    Args:
+        **fields: Values of CONTEXT_FIELDS (run_id, interest_id, provider).
+
+    Returns:
+        contextvars.Token: Token to restore the previous context with reset_log_context().
+    """
+    return _log_context.set({**_log_context.get(), **fields})
+
+
+def reset_log_context(token):
+    """Restore the context that was current before bind_log_context()."""
+    _log_context.reset(token)
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """
+    Context manager adding fields to the records logged inside the block.
+
+    Example:
+        with log_context(interest_id=interest['id'], provider='gnews'):
+            ...
+    """
+    token = bind_log_context(**fields)
+    try:
+        yield
+    finally:
+        reset_log_context(token)
+
+
+def get_log_context():
+    """
+    Get the current log context.
+
+    Returns:
+        dict: The bound CONTEXT_FIELDS.
+    """
+    return dict(_log_context.get())
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log context onto the record, in the thread that logs it."""
+
+    def filter(self, record):
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limit per-item messages.
+
+    Records logged with extra={'sample_key': key} are let through at most `rate` times
+    per second for each key; the next record let through reports how many were dropped.
+    Records without a sample key are never dropped.
+    """
+
+    def __init__(self, rate=None):
+        super().__init__()
+        self.rate = LOGGING_CONFIG["sample_rate_per_second"] if rate is None else rate
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample_key', None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            window_start, emitted, dropped = self._windows.get(key, (now, 0, 0))
+            if now - window_start >= 1.0:
+                window_start, emitted = now, 0
+            if emitted >= self.rate:
+                self._windows[key] = (window_start, emitted, dropped + 1)
+                return False
+            self._windows[key] = (window_start, emitted + 1, 0)
+        if dropped:
+            record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, with the log context fields."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class LazyFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that creates its directory and opens the file when the first record is written."""
+
+    def __init__(self, filename, mode='a', encoding=None, max_bytes=0, backup_count=0):
+        super().__init__(filename, mode, max_bytes, backup_count, encoding, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps the exception of a record for the formatters of the listener thread."""
+
+    def prepare(self, record):
+        # The queue never leaves the process, so unlike QueueHandler.prepare the traceback is not folded
+        # into the message: each handler's formatter renders it (JsonFormatter as its 'exception' field).
+        # Only the arguments are merged, as they may change before the listener formats the record.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+class _RoutingHandler(logging.Handler):
+    """Hand each dequeued record to the handlers of the logger that produced it."""
+
+    def __init__(self):
+        super().__init__()
+        self.targets = {}
+
+    def handle(self, record):
+        for handler in self.targets.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+
+_queue = queue.SimpleQueue()
+_router = _RoutingHandler()
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_queue, _router)
+            _listener.start()
+            atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Write the queued records and stop the background logging thread (registered with atexit)."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+    for handlers in _router.targets.values():
+        for handler in handlers:
+            handler.flush()
+
+
+def _build_handlers(name):
+    c_handler = logging.StreamHandler()
+    f_handler = LazyFileHandler(os.path.join(LOGGING_CONFIG["directory"], f'{name}.log'),
+                                max_bytes=LOGGING_CONFIG["max_bytes"], backup_count=LOGGING_CONFIG["backup_count"])
+    c_handler.setLevel(logging.INFO)
+    f_handler.setLevel(logging.DEBUG)
+
+    c_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    if LOGGING_CONFIG["format"] == 'json':
+        f_handler.setFormatter(JsonFormatter())
+    else:
+        f_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    return [c_handler, f_handler]
 
 
 def get_logger(name):
     """
     Configure and return a logger.
 
+    With LOG_ASYNC (the default), the logger only enqueues its records; a single background
+    thread writes them to the console and to logs/<name>.log, so slow I/O never blocks the
+    fetch loop. Messages logged with extra={'sample_key': ...} are rate-limited.
+
     Args:
         name (str): Name of the logger.
 
@@ -13,23 +249,25 @@ def get_logger(name):
         logging.Logger: Configured logger object.
     """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
 
-    # Create handlers
-    c_handler = logging.StreamHandler()
-    f_handler = logging.FileHandler(os.path.join('logs', f'{name}.log'))
-    c_handler.setLevel(logging.INFO)
-    f_handler.setLevel(logging.DEBUG)
+    # Handlers are created once per logger
+    if logger.handlers:
+        return logger
 
-    # Create formatters and add them to handlers
-    c_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    f_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    c_handler.setFormatter(c_format)
-    f_handler.setFormatter(f_format)
+    logger.setLevel(logging.INFO)
+    logger.addFilter(SamplingFilter())
 
-    # Add handlers to the logger
-    if not logger.handlers:
-        logger.addHandler(c_handler)
-        logger.addHandler(f_handler)
+    # The log file is only opened when the first record is written
+    handlers = _build_handlers(name)
+    if LOGGING_CONFIG["async"]:
+        _router.targets[name] = handlers
+        q_handler = _RecordQueueHandler(_queue)
+        q_handler.addFilter(ContextFilter())
+        logger.addHandler(q_handler)
+        _start_listener()
+    else:
+        for handler in handlers:
+            handler.addFilter(ContextFilter())
+            logger.addHandler(handler)
 
     return logger
@@ -0,0 +1,667 @@
+# scripts\utils\migrations.py
+
+import os
+import re
+import sys
+import json
+import argparse
+from datetime import date, datetime
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error, SQLITE_SCHEMA, get_storage_backend  # noqa: E402
+from scripts.utils.text_normalization import KEYED_TABLES  # noqa: E402
+
+# Initialize logger
+logger = get_logger('migrations')
+
+# Load environment variables
+load_dotenv()
+
+# Migration configuration
+MIGRATION_CONFIG = {
+    # Apply pending MySQL migrations on the first connection of a process. Disabled by default: concurrent
+    # shards would race to run them before any API call, so a database behind the code fails that connection
+    # and is migrated with the migrate command instead (SQLite databases are always migrated when opened)
+    "auto_migrate": os.getenv("SCHEMA_AUTO_MIGRATE", "false").lower() in ("1", "true", "yes"),
+}
+
+# MySQL errors of a column or index created meanwhile by another process migrating the same database
+_ALREADY_EXISTS_ERRNOS = (1060, 1061)
+
+MIGRATIONS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at DATETIME NOT NULL
+)
+"""
+
+# Core tables of the pipeline on MySQL. Text columns looked up by value get a prefix index,
+# as MySQL cannot index whole TEXT columns.
+MYSQL_BASE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS interests (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        formatted_interest VARCHAR(512) NOT NULL,
+        category VARCHAR(64) NULL,
+        language VARCHAR(16) NULL,
+        country VARCHAR(16) NULL,
+        priority INT NOT NULL DEFAULT 0,
+        status TINYINT NOT NULL DEFAULT 1,
+        updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS api_info (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        api_name_id VARCHAR(32) NOT NULL,
+        daily_limit INT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS api_usage (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        api_id INT NOT NULL,
+        api_name_id VARCHAR(32) NOT NULL,
+        date DATE NOT NULL,
+        shard_id INT NOT NULL DEFAULT 0,
+        last_fetch DATETIME NULL,
+        total_calls_made INT NOT NULL DEFAULT 0
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS api_calls (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        script_path VARCHAR(255) NULL,
+        custom_params TEXT,
+        payload TEXT,
+        response LONGTEXT,
+        response_hash CHAR(40) NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fetch_schedule (
+        interest_id INT NOT NULL,
+        api_name_id VARCHAR(32) NOT NULL,
+        interval_minutes INT NOT NULL,
+        last_fetch DATETIME NULL,
+        next_fetch DATETIME NULL,
+        last_new_articles INT NOT NULL DEFAULT 0,
+        total_fetches INT NOT NULL DEFAULT 0,
+        total_new_articles INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (interest_id, api_name_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS newsdata (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        article_id VARCHAR(64), interest VARCHAR(512), title TEXT, link TEXT, keywords TEXT, creator TEXT,
+        video_url TEXT, description TEXT, content MEDIUMTEXT, pubDate DATETIME NULL, pubDateTZ VARCHAR(16),
+        image_url TEXT, source_id VARCHAR(255), source_priority INT NULL, source_name VARCHAR(255), source_url TEXT,
+        source_icon TEXT, language VARCHAR(32), country TEXT, category TEXT, ai_tag TEXT, sentiment TEXT,
+        sentiment_stats TEXT, ai_region TEXT, ai_org TEXT, duplicate TINYINT(1) NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS newsapi (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        interest VARCHAR(512), source_id VARCHAR(255), source_name VARCHAR(255), author TEXT, title TEXT,
+        description TEXT, url TEXT, urlToImage TEXT, publishedAt DATETIME NULL, content MEDIUMTEXT
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gnews (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        interest VARCHAR(512), title TEXT, description TEXT, url TEXT, image TEXT,
+        published_at DATETIME NULL, content MEDIUMTEXT
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+)
+
+# Full-text index of the stored articles (see article_search.py); an FTS5 table on SQLite
+MYSQL_SEARCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_search (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    provider VARCHAR(32) NOT NULL,
+    interest VARCHAR(512),
+    title TEXT,
+    description TEXT,
+    content MEDIUMTEXT,
+    url VARCHAR(2048),
+    published_at DATETIME NULL,
+    KEY idx_article_search_published_at (published_at),
+    FULLTEXT KEY ft_article_search (title, description, content)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+# Best articles of each interest (see ranking.py)
+MYSQL_RANKING_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interest_top_articles (
+    interest_id INT NOT NULL,
+    position SMALLINT NOT NULL,
+    provider VARCHAR(32) NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    url VARCHAR(2048),
+    published_at DATETIME NULL,
+    source_priority INT NULL,
+    score DOUBLE NOT NULL,
+    ranked_at DATETIME NOT NULL,
+    PRIMARY KEY (interest_id, position)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+# Runs and their interest/API jobs, to resume interrupted runs (see run_manifest.py)
+MYSQL_MANIFEST_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS fetch_runs (
+        run_id VARCHAR(32) PRIMARY KEY,
+        options_hash CHAR(40) NOT NULL,
+        options TEXT,
+        status VARCHAR(16) NOT NULL,
+        started_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        finished_at DATETIME NULL,
+        KEY idx_fetch_runs_options (options_hash, status, started_at)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fetch_run_jobs (
+        run_id VARCHAR(32) NOT NULL,
+        interest_id INT NOT NULL,
+        api_name_id VARCHAR(32) NOT NULL,
+        status VARCHAR(16) NOT NULL,
+        cursor_value VARCHAR(255) NULL,
+        new_articles INT NOT NULL DEFAULT 0,
+        error TEXT,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (run_id, interest_id, api_name_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+)
+
+# Source domains and image URLs checked by the enrichment stage (see enrichment.py)
+MYSQL_ENRICHMENT_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS source_domains (
+        domain VARCHAR(255) PRIMARY KEY,
+        home_url VARCHAR(2048) NULL,
+        source_name VARCHAR(255) NULL,
+        source_icon VARCHAR(2048) NULL,
+        status_code INT NULL,
+        reachable TINYINT(1) NOT NULL DEFAULT 0,
+        checked_at DATETIME NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS image_checks (
+        url_hash CHAR(40) PRIMARY KEY,
+        url TEXT NOT NULL,
+        status_code INT NULL,
+        content_type VARCHAR(255) NULL,
+        content_length BIGINT NULL,
+        alive TINYINT(1) NOT NULL DEFAULT 0,
+        checked_at DATETIME NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+)
+
+# Inserted articles in insertion order, and the position of each consumer (see change_feed.py)
+MYSQL_CHANGE_FEED_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS article_changes (
+        seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+        provider VARCHAR(32) NOT NULL,
+        interest VARCHAR(512),
+        title TEXT,
+        url VARCHAR(2048),
+        published_at DATETIME NULL,
+        created_at DATETIME NOT NULL,
+        KEY idx_article_changes_created_at (created_at)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS change_feed_cursors (
+        consumer VARCHAR(64) PRIMARY KEY,
+        last_seq BIGINT NOT NULL,
+        updated_at DATETIME NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+)
+
+# Indexes of the hot lookups: (name, table, MySQL columns, SQLite columns, unique).
+# On SQLite, the api_info and api_usage keys are UNIQUE constraints of the base schema.
+HOT_LOOKUP_INDEXES = (
+    ('idx_newsdata_title', 'newsdata', 'title(255)', 'title', False),
+    ('idx_newsapi_title', 'newsapi', 'title(255)', 'title', False),
+    ('idx_gnews_title', 'gnews', 'title(255)', 'title', False),
+    ('uq_api_info_api_name_id', 'api_info', 'api_name_id', None, True),
+    ('uq_api_usage_day', 'api_usage', 'api_id, date, shard_id', None, True),
+    ('idx_interests_status', 'interests', 'status, id', 'status, id', False),
+    ('idx_api_calls_response_hash', 'api_calls', 'response_hash', 'response_hash', False),
+    ('idx_api_calls_created_at', 'api_calls', 'created_at', 'created_at', False),
+    ('idx_newsdata_pubDate', 'newsdata', 'pubDate', 'pubDate', False),
+    ('idx_newsapi_publishedAt', 'newsapi', 'publishedAt', 'publishedAt', False),
+    ('idx_gnews_published_at', 'gnews', 'published_at', 'published_at', False),
+)
+
+# Merge the api_usage rows of one API, day and shard into the oldest one, as reserve_api_call and
+# track_api_call rely on the uq_api_usage_day key
+MERGE_DUPLICATE_USAGE = (
+    """
+    UPDATE api_usage keep
+    JOIN (
+        SELECT MIN(id) AS id, SUM(total_calls_made) AS total_calls_made, MAX(last_fetch) AS last_fetch
+        FROM api_usage
+        GROUP BY api_id, date, shard_id
+        HAVING COUNT(*) > 1
+    ) merged ON keep.id = merged.id
+    SET keep.total_calls_made = merged.total_calls_made, keep.last_fetch = merged.last_fetch
+    """,
+    """
+    DELETE duplicate FROM api_usage duplicate
+    JOIN api_usage keep
+        ON keep.api_id = duplicate.api_id AND keep.date = duplicate.date
+        AND keep.shard_id = duplicate.shard_id AND keep.id < duplicate.id
+    """,
+)
+
+# Queries run for every fetch, with representative parameters, checked by check_query_plans
+HOT_QUERIES = (
+    ('newsdata title dedup', "SELECT title, dedup_key FROM newsdata WHERE dedup_key IN (%s, %s) OR title IN (%s, %s)",
+     ('0' * 16, '1' * 16, 'a', 'b')),
+    ('newsapi title dedup', "SELECT title, dedup_key FROM newsapi WHERE dedup_key IN (%s, %s) OR title IN (%s, %s)",
+     ('0' * 16, '1' * 16, 'a', 'b')),
+    ('gnews title dedup', "SELECT title, dedup_key FROM gnews WHERE dedup_key IN (%s, %s) OR title IN (%s, %s)",
+     ('0' * 16, '1' * 16, 'a', 'b')),
+    ('api info by name', "SELECT * FROM api_info WHERE api_name_id = %s", ('newsdata',)),
+    ('api usage of the day',
+     "SELECT id, total_calls_made FROM api_usage WHERE api_id = %s AND date = %s AND shard_id = %s",
+     (1, date(2024, 1, 1), 0)),
+    ('active interests',
+     "SELECT id, formatted_interest, category, language, country FROM interests WHERE status = %s ORDER BY id",
+     (1,)),
+    ('raw response dedup', "SELECT id FROM api_calls WHERE response_hash = %s LIMIT 1", ('0' * 40,)),
+)
+
+
+def _statements(script):
+    """Split a schema (a string of ';'-separated statements, or a tuple of statements) into statements."""
+    if isinstance(script, str):
+        script = script.split(';')
+    return [statement.strip() for statement in script if statement.strip()]
+
+
+def _mysql_has(cursor, query, params):
+    cursor.execute(query, params)
+    return cursor.fetchone()[0] > 0
+
+
+def _mysql_alter(cursor, statement):
+    try:
+        cursor.execute(statement)
+    except Error as e:
+        if getattr(e, 'errno', None) not in _ALREADY_EXISTS_ERRNOS:
+            raise
+        logger.debug(f"Skipped, already applied: {statement}")
+
+
+def ensure_column(table, column, definition):
+    """
+    Build a MySQL migration step adding a column unless it exists.
+
+    Args:
+        table (str): The table.
+        column (str): The column.
+        definition (str): Its type and options, e.g. "INT NOT NULL DEFAULT 0".
+
+    Returns:
+        callable: The step, called with a cursor.
+    """
+    def step(cursor):
+        if not _mysql_has(cursor, """
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column)):
+            _mysql_alter(cursor, f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def ensure_index(name, table, columns, unique=False):
+    """
+    Build a MySQL migration step creating an index unless it exists (MySQL has no CREATE INDEX IF NOT EXISTS).
+
+    Args:
+        name (str): The index name.
+        table (str): The table.
+        columns (str): The indexed columns, e.g. "api_id, date".
+        unique (bool, optional): Create a unique index. Defaults to False.
+
+    Returns:
+        callable: The step, called with a cursor.
+    """
+    def step(cursor):
+        if not _mysql_has(cursor, """
+            SELECT COUNT(*) FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        """, (table, name)):
+            _mysql_alter(cursor, f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({columns})")
+    return step
+
+
+def ensure_sqlite_column(table, column, definition):
+    """
+    Build a SQLite migration step adding a column unless it exists.
+
+    Args:
+        table (str): The table.
+        column (str): The column.
+        definition (str): Its type and options, e.g. "TEXT".
+
+    Returns:
+        callable: The step, called with a cursor.
+    """
+    def step(cursor):
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+# Schema versions, applied in order. Steps are SQL statements or callables taking a cursor, and
+# must be safe to repeat: a migration interrupted half-way is run again in full.
+# Schema changes go in a new migration; applied migrations are never edited. Data rewrites of whole
+# tables (e.g. recomputing the dedup keys, see text_normalization) are commands run separately, not migrations.
+MIGRATIONS = (
+    {
+        'version': 1,
+        'description': "Base tables",
+        'mysql': MYSQL_BASE_SCHEMA,
+        'sqlite': _statements(SQLITE_SCHEMA),
+    },
+    {
+        'version': 2,
+        'description': "Columns added to existing tables",
+        'mysql': (
+            ensure_column('api_usage', 'shard_id', "INT NOT NULL DEFAULT 0"),
+            ensure_column('api_calls', 'response_hash', "CHAR(40) NULL"),
+        ),
+        'sqlite': (),
+    },
+    {
+        'version': 3,
+        'description': "Search, ranking, run manifest, enrichment and change feed tables",
+        'mysql': (_statements(MYSQL_SEARCH_SCHEMA) + _statements(MYSQL_RANKING_SCHEMA)
+                  + _statements(MYSQL_MANIFEST_SCHEMA) + _statements(MYSQL_ENRICHMENT_SCHEMA)
+                  + _statements(MYSQL_CHANGE_FEED_SCHEMA)),
+        'sqlite': (),
+    },
+    {
+        'version': 4,
+        'description': "Indexes of the hot lookups",
+        # Duplicate usage rows (from before the unique key) are merged first, or the key cannot be created.
+        # Both statements commit with the first CREATE INDEX, so a rerun never merges twice.
+        'mysql': MERGE_DUPLICATE_USAGE + tuple(ensure_index(name, table, columns, unique)
+                                               for name, table, columns, _, unique in HOT_LOOKUP_INDEXES),
+        'sqlite': tuple(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+                        for name, table, _, columns, _ in HOT_LOOKUP_INDEXES if columns),
+    },
+    {
+        'version': 5,
+        'description': "Normalized title dedup keys of the article tables",
+        'mysql': tuple(step for table in KEYED_TABLES for step in (
+            ensure_column(table, 'dedup_key', "CHAR(16) NULL"),
+            ensure_index(f"idx_{table}_dedup_key", table, 'dedup_key'),
+        )),
+        'sqlite': tuple(step for table in KEYED_TABLES for step in (
+            ensure_sqlite_column(table, 'dedup_key', "TEXT"),
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_dedup_key ON {table} (dedup_key)",
+        )),
+    },
+)
+
+LATEST_VERSION = MIGRATIONS[-1]['version']
+
+
+def applied_versions(cursor):
+    """
+    Get the applied schema versions.
+
+    Args:
+        cursor: A cursor of the database.
+
+    Returns:
+        dict: Version -> time it was applied.
+    """
+    cursor.execute(MIGRATIONS_TABLE_SCHEMA)
+    cursor.execute("SELECT version, applied_at FROM schema_migrations")
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def migrate_connection(conn, backend_name, target=None):
+    """
+    Apply the pending migrations on a connection.
+
+    Each migration is committed with its schema_migrations row, so an interrupted run resumes
+    with the first migration it did not finish.
+
+    Args:
+        conn: A connection of the database (storage.MySQLConnection or storage.SQLiteConnection).
+        backend_name (str): 'mysql' or 'sqlite'.
+        target (int, optional): Stop after this version. Defaults to the latest version.
+
+    Returns:
+        list: The versions applied.
+
+    Raises:
+        DatabaseError: If a migration fails; the versions before it stay applied.
+    """
+    cursor = conn.cursor()
+    try:
+        applied = applied_versions(cursor)
+        conn.commit()
+        done = []
+        for migration in MIGRATIONS:
+            version = migration['version']
+            if version in applied or (target is not None and version > target):
+                continue
+            for step in migration[backend_name]:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(
+                "INSERT IGNORE INTO schema_migrations (version, description, applied_at) VALUES (%s, %s, %s)",
+                (version, migration['description'], datetime.now().replace(microsecond=0))
+            )
+            conn.commit()
+            done.append(version)
+            logger.info(f"Applied migration {version}: {migration['description']}")
+        return done
+    finally:
+        cursor.close()
+
+
+def ensure_schema(conn, backend_name):
+    """
+    Make sure the schema of a newly opened database is at LATEST_VERSION, migrating it if SCHEMA_AUTO_MIGRATE allows.
+
+    The pipeline relies on the latest schema (e.g. the uq_api_usage_day key of reserve_api_call), so
+    a database it cannot migrate fails here instead of on the first query needing the new schema.
+
+    Args:
+        conn: A connection of the database.
+        backend_name (str): 'mysql' or 'sqlite'.
+
+    Returns:
+        list: The versions applied.
+
+    Raises:
+        DatabaseError: If a migration fails, or the schema is behind and SCHEMA_AUTO_MIGRATE is disabled.
+    """
+    if MIGRATION_CONFIG["auto_migrate"] or backend_name == 'sqlite':
+        return migrate_connection(conn, backend_name)
+    cursor = conn.cursor()
+    try:
+        applied = applied_versions(cursor)
+        conn.commit()
+    finally:
+        cursor.close()
+    current = max(applied, default=0)
+    if current < LATEST_VERSION:
+        raise Error(msg=f"Database schema is at version {current}, the code needs version {LATEST_VERSION}; "
+                        f"run 'python -m scripts.utils.migrations migrate'")
+    return []
+
+
+def migrate(target=None):
+    """
+    Bring the database schema up to date. SQLite databases are migrated when opened, see storage.SQLiteBackend.
+
+    Args:
+        target (int, optional): Stop after this version. Defaults to the latest version.
+
+    Returns:
+        list: The versions applied, or None on error.
+    """
+    conn = None
+    try:
+        conn = get_db_connection(check_schema=False)
+        return migrate_connection(conn, get_storage_backend().name, target)
+    except Error as e:
+        logger.error(f"Error migrating the database schema: {e}")
+        if conn:
+            conn.rollback()
+        return None
+    finally:
+        if conn:
+            close_connection(conn)
+
+
+def get_schema_status():
+    """
+    Get the applied and pending migrations.
+
+    Returns:
+        list: One dict per migration with 'version', 'description' and 'applied_at' (None if pending).
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection(check_schema=False)
+        cursor = conn.cursor()
+        applied = applied_versions(cursor)
+        conn.commit()
+        return [{'version': migration['version'], 'description': migration['description'],
+                 'applied_at': str(applied[migration['version']]) if migration['version'] in applied else None}
+                for migration in MIGRATIONS]
+    except Error as e:
+        logger.error(f"Error reading the schema version: {e}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+_SQLITE_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)|USING (INTEGER PRIMARY KEY)')
+
+
+def explain_query(cursor, backend_name, query, params=()):
+    """
+    Get how the database runs a query, and whether it uses an index rather than a full table scan.
+
+    Args:
+        cursor: A cursor of the database.
+        backend_name (str): 'mysql' or 'sqlite'.
+        query (str): The query.
+        params (tuple, optional): Its parameters.
+
+    Returns:
+        dict: 'uses_index' (bool), 'index' (name of the index used, or None) and 'plan' (list of str).
+    """
+    if backend_name == 'sqlite':
+        cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        plan = [row[-1] for row in cursor.fetchall()]
+        indexes = [match.group(1) or match.group(2) for match in map(_SQLITE_INDEX.search, plan) if match]
+        full_scan = any(step.startswith('SCAN ') and 'INDEX' not in step for step in plan)
+        return {'uses_index': bool(indexes) and not full_scan, 'index': indexes[0] if indexes else None,
+                'plan': plan}
+
+    cursor.execute(f"EXPLAIN {query}", params)
+    columns = [column[0] for column in cursor.description]
+    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    plan = [f"{row.get('table')}: type={row.get('type')} key={row.get('key')} extra={row.get('Extra')}"
+            for row in rows]
+    # Lookups the optimizer resolved from the index statistics alone (e.g. on an empty table) need no key
+    resolved = all(row.get('table') is None for row in rows)
+    keys = [row.get('key') for row in rows if row.get('key')]
+    full_scan = any(row.get('type') == 'ALL' for row in rows)
+    return {'uses_index': resolved or (bool(keys) and not full_scan), 'index': keys[0] if keys else None,
+            'plan': plan}
+
+
+def check_query_plans():
+    """
+    Check that the hot queries (see HOT_QUERIES) use an index.
+
+    On MySQL the plans depend on the table statistics, so check a database holding representative data.
+
+    Returns:
+        list: One dict per query with 'name', 'query' and the explain_query result, or None on error.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        backend_name = get_storage_backend().name
+        results = []
+        for name, query, params in HOT_QUERIES:
+            result = explain_query(cursor, backend_name, query, params)
+            results.append(dict(name=name, query=query, **result))
+            if not result['uses_index']:
+                logger.warning(f"Hot query '{name}' does not use an index: {result['plan']}")
+        return results
+    except Error as e:
+        logger.error(f"Error checking the query plans: {e}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the database schema versions.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    migrate_parser = subparsers.add_parser('migrate', help="Apply the pending migrations")
+    migrate_parser.add_argument('--target', type=int, help="Stop after this version")
+    subparsers.add_parser('status', help="Print the applied and pending migrations")
+    subparsers.add_parser('check', help="Check that the hot queries use an index; exits with 1 if one does not")
+    args = parser.parse_args()
+
+    if args.command == 'migrate':
+        applied = migrate(args.target)
+        if applied is None:
+            sys.exit(1)
+        print(f"Applied migrations: {applied or 'none'}")
+    elif args.command == 'status':
+        print(json.dumps(get_schema_status(), indent=2))
+    else:
+        results = check_query_plans()
+        if results is None:
+            sys.exit(1)
+        print(json.dumps(results, indent=2))
+        if not all(result['uses_index'] for result in results):
+            sys.exit(1)
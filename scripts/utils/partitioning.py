@@ -0,0 +1,477 @@
+# scripts\utils\partitioning.py
+
+import os
+import sys
+import json
+import gzip
+import argparse
+from datetime import date, datetime
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error, get_storage_backend  # noqa: E402
+from scripts.utils.article_search import INDEXED_TABLES  # noqa: E402
+
+# Initialize logger
+logger = get_logger('partitioning')
+
+# Load environment variables
+load_dotenv()
+
+# Partitioning and retention configuration
+PARTITION_CONFIG = {
+    # Months kept in the article tables and in api_calls, besides the current one
+    "article_retention_months": int(os.getenv("ARTICLE_RETENTION_MONTHS", 12)),
+    "api_calls_retention_months": int(os.getenv("API_CALLS_RETENTION_MONTHS", 3)),
+    # Directory of the archives of dropped months, as <table>/<table>_<YYYYMM>.jsonl.gz
+    "archive_dir": os.getenv("ARCHIVE_DIR", os.path.join(project_root, 'data', 'archive')),
+    # MySQL: monthly partitions created in advance
+    "months_ahead": int(os.getenv("PARTITION_MONTHS_AHEAD", 3)),
+    # Rows read per query when archiving
+    "archive_batch_size": int(os.getenv("ARCHIVE_BATCH_SIZE", 5000)),
+}
+
+# Partitioned tables and the column their rows are partitioned on
+PARTITIONED_TABLES = {
+    'newsdata': 'pubDate',
+    'newsapi': 'publishedAt',
+    'gnews': 'published_at',
+    'api_calls': 'created_at',
+}
+
+# MySQL: partition below the first month (rows without a date, which RANGE partitioning puts
+# in the lowest partition, and very old rows) and partition above the last month; neither is dropped
+FIRST_PARTITION = 'p_start'
+LAST_PARTITION = 'p_future'
+
+
+def month_start(value):
+    """
+    Get the first day of the month of a date.
+
+    Args:
+        value (date or datetime): The date.
+
+    Returns:
+        date: First day of its month.
+    """
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    """
+    Shift the first day of a month by a number of months.
+
+    Args:
+        month (date): First day of a month.
+        count (int): Months to add (may be negative).
+
+    Returns:
+        date: First day of the resulting month.
+    """
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """
+    Get the name of the partition holding a month.
+
+    Args:
+        month (date): First day of the month.
+
+    Returns:
+        str: 'pYYYYMM'.
+    """
+    return f"p{month:%Y%m}"
+
+
+def retention_cutoff(table_name, now=None):
+    """
+    Get the first month kept in a table; older months are archived and dropped.
+
+    Args:
+        table_name (str): The table.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        date: First day of the oldest month kept.
+    """
+    months = (PARTITION_CONFIG["api_calls_retention_months"] if table_name == 'api_calls'
+              else PARTITION_CONFIG["article_retention_months"])
+    return add_months(month_start(now or datetime.now()), -months)
+
+
+def _partition_definition(month):
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{add_months(month, 1):%Y-%m-%d}'))"
+
+
+def get_partitions(table_name):
+    """
+    Get the monthly partitions of a MySQL table.
+
+    Args:
+        table_name (str): The table.
+
+    Returns:
+        list: (partition name, rows estimate) pairs in order; empty if the table is not partitioned.
+
+    Raises:
+        DatabaseError: If the partitions cannot be read.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+        SELECT PARTITION_NAME, TABLE_ROWS
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """, (table_name,))
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def partition_table(table_name, now=None):
+    """
+    Convert a MySQL table to monthly RANGE partitions on its date column.
+
+    MySQL requires every unique key of a partitioned table to contain the partitioning
+    column, which a nullable date column cannot be part of: the primary key on `id` is
+    replaced by a plain index (ids stay unique through AUTO_INCREMENT). Partitions are
+    created from the month of the oldest row to PARTITION_MONTHS_AHEAD months ahead.
+    This rebuilds the table; run it once, during a quiet period.
+
+    Args:
+        table_name (str): One of PARTITIONED_TABLES.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        bool: True if the table is partitioned, False otherwise.
+    """
+    column = PARTITIONED_TABLES[table_name]
+    if get_storage_backend().embedded:
+        logger.info(f"SQLite has no partitioning; months of {table_name} are archived by range instead")
+        return True
+    if get_partitions(table_name):
+        logger.info(f"{table_name} is already partitioned")
+        return True
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT MIN({column}) FROM {table_name}")
+        oldest = cursor.fetchone()[0]
+        now = now or datetime.now()
+        # Months older than the retention get their partition too, so the next maintenance archives them
+        first = month_start(oldest) if oldest else month_start(now)
+        months = []
+        month = first
+        while month <= add_months(month_start(now), PARTITION_CONFIG["months_ahead"]):
+            months.append(month)
+            month = add_months(month, 1)
+
+        cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_TYPE = 'PRIMARY KEY'
+        """, (table_name,))
+        if cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE {table_name} DROP PRIMARY KEY, ADD KEY idx_{table_name}_id (id)")
+        definitions = ',\n'.join(
+            [f"PARTITION {FIRST_PARTITION} VALUES LESS THAN (TO_DAYS('{first:%Y-%m-%d}'))"]
+            + [_partition_definition(month) for month in months]
+            + [f"PARTITION {LAST_PARTITION} VALUES LESS THAN MAXVALUE"]
+        )
+        cursor.execute(f"ALTER TABLE {table_name} PARTITION BY RANGE (TO_DAYS({column})) (\n{definitions}\n)")
+        logger.info(f"Partitioned {table_name} by month of {column}: {len(months)} monthly partitions")
+        return True
+    except Error as e:
+        logger.error(f"Error partitioning {table_name}: {e}")
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def add_partitions(table_name, now=None):
+    """
+    Create the monthly partitions of the next PARTITION_MONTHS_AHEAD months of a MySQL table.
+
+    Args:
+        table_name (str): A partitioned table.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        int: Number of partitions created, -1 on failure.
+    """
+    if get_storage_backend().embedded:
+        return 0
+    conn = None
+    cursor = None
+    try:
+        names = [name for name, _ in get_partitions(table_name)]
+        monthly = [name for name in names if name not in (FIRST_PARTITION, LAST_PARTITION)]
+        if LAST_PARTITION not in names or not monthly:
+            logger.warning(f"{table_name} is not partitioned; run 'python -m scripts.utils.partitioning partition'")
+            return 0
+        last = datetime.strptime(max(monthly)[1:], '%Y%m').date()
+        month = add_months(last, 1)
+        months = []
+        while month <= add_months(month_start(now or datetime.now()), PARTITION_CONFIG["months_ahead"]):
+            months.append(month)
+            month = add_months(month, 1)
+        if not months:
+            return 0
+
+        # Rows already dated in these months move from the last partition to their own
+        definitions = ',\n'.join([_partition_definition(month) for month in months]
+                                 + [f"PARTITION {LAST_PARTITION} VALUES LESS THAN MAXVALUE"])
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"ALTER TABLE {table_name} REORGANIZE PARTITION {LAST_PARTITION} INTO (\n{definitions}\n)")
+        logger.info(f"Added {len(months)} partitions to {table_name} up to {partition_name(months[-1])}")
+        return len(months)
+    except Error as e:
+        logger.error(f"Error adding partitions to {table_name}: {e}")
+        return -1
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def _expired_months(table_name, cursor, cutoff):
+    # Months before the cutoff: partitions on MySQL, months from the oldest row on SQLite (dictionary cursor)
+    if not get_storage_backend().embedded:
+        months = []
+        for name, _ in get_partitions(table_name):
+            if name in (FIRST_PARTITION, LAST_PARTITION):
+                continue
+            month = datetime.strptime(name[1:], '%Y%m').date()
+            if month < cutoff:
+                months.append(month)
+        return months
+
+    column = PARTITIONED_TABLES[table_name]
+    cursor.execute(f"SELECT MIN({column}) AS oldest FROM {table_name} WHERE {column} IS NOT NULL")
+    oldest = cursor.fetchone()['oldest']
+    if isinstance(oldest, str):
+        # Aggregates are returned as text by SQLite
+        try:
+            oldest = datetime.fromisoformat(oldest)
+        except ValueError:
+            return []
+    if not isinstance(oldest, (date, datetime)):
+        return []
+    months = []
+    month = month_start(oldest)
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def _archive_path(table_name, month):
+    return os.path.join(PARTITION_CONFIG["archive_dir"], table_name, f"{table_name}_{month:%Y%m}.jsonl.gz")
+
+
+def archive_month(table_name, month, cursor):
+    """
+    Write the rows of one month of a table to a gzip-compressed JSON lines file.
+
+    Values are written as stored (compressed values keep their prefix, see storage_policy).
+    The file is written under a temporary name and renamed once complete.
+
+    Args:
+        table_name (str): The table.
+        month (date): First day of the month.
+        cursor: Cursor to read the rows with.
+
+    Returns:
+        tuple: (archive path, number of rows).
+    """
+    column = PARTITIONED_TABLES[table_name]
+    if get_storage_backend().embedded:
+        source = f"{table_name} WHERE {column} >= %s AND {column} < %s AND id > %s"
+        bounds = [datetime.combine(month, datetime.min.time()),
+                  datetime.combine(add_months(month, 1), datetime.min.time())]
+    else:
+        source = f"{table_name} PARTITION ({partition_name(month)}) WHERE id > %s"
+        bounds = []
+
+    path = _archive_path(table_name, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    rows = 0
+    last_id = 0
+    with gzip.open(temporary, 'wt', encoding='utf-8') as f:
+        while True:
+            cursor.execute(f"SELECT * FROM {source} ORDER BY id LIMIT %s",
+                           bounds + [last_id, PARTITION_CONFIG["archive_batch_size"]])
+            batch = cursor.fetchall()
+            if not batch:
+                break
+            for row in batch:
+                f.write(json.dumps(row, default=str) + '\n')
+            rows += len(batch)
+            last_id = batch[-1]['id']
+    os.replace(temporary, path)
+    return path, rows
+
+
+def _drop_month(table_name, month, cursor):
+    # Drop the month's rows, and their search index entries
+    column = PARTITIONED_TABLES[table_name]
+    start = datetime.combine(month, datetime.min.time())
+    end = datetime.combine(add_months(month, 1), datetime.min.time())
+    if get_storage_backend().embedded:
+        cursor.execute(f"DELETE FROM {table_name} WHERE {column} >= %s AND {column} < %s", (start, end))
+    else:
+        cursor.execute(f"ALTER TABLE {table_name} DROP PARTITION {partition_name(month)}")
+    if table_name in INDEXED_TABLES:
+        try:
+            cursor.execute("DELETE FROM article_search WHERE provider = %s AND published_at >= %s AND published_at < %s",
+                           (table_name, start, end))
+        except Error as e:
+            logger.warning(f"Could not remove the archived {table_name} articles from the search index: {e}")
+
+
+def apply_retention(table_names=None, now=None, dry_run=False):
+    """
+    Archive and drop the months of each table older than its retention.
+
+    Each month is written to ARCHIVE_DIR (see archive_month) and only dropped once its
+    archive is complete: on MySQL the partition is dropped, on SQLite the rows are deleted.
+    Rows without a date are never dropped.
+
+    Args:
+        table_names (list, optional): Tables to process. Defaults to PARTITIONED_TABLES.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+        dry_run (bool, optional): If True, only report the months that would be archived.
+
+    Returns:
+        dict: Table name to list of {'month', 'rows', 'archive'} dictionaries; rows is None in a dry run.
+    """
+    report = {}
+    for table_name in table_names or PARTITIONED_TABLES:
+        cutoff = retention_cutoff(table_name, now)
+        report[table_name] = []
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            for month in _expired_months(table_name, cursor, cutoff):
+                if dry_run:
+                    report[table_name].append({'month': f"{month:%Y-%m}", 'rows': None,
+                                               'archive': _archive_path(table_name, month)})
+                    continue
+                path, rows = archive_month(table_name, month, cursor)
+                _drop_month(table_name, month, cursor)
+                conn.commit()
+                report[table_name].append({'month': f"{month:%Y-%m}", 'rows': rows, 'archive': path})
+                logger.info(f"Archived {rows} rows of {table_name} for {month:%Y-%m} to {path}")
+        except (Error, OSError) as e:
+            logger.error(f"Error applying the retention of {table_name}: {e}")
+            if conn:
+                conn.rollback()
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                close_connection(conn)
+    return report
+
+
+def maintain(now=None, dry_run=False):
+    """
+    Run the periodic partition maintenance: create the coming months' partitions (MySQL),
+    then archive and drop the expired months.
+
+    Args:
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+        dry_run (bool, optional): If True, only report what would be archived.
+
+    Returns:
+        dict: Report of apply_retention().
+    """
+    if not dry_run:
+        for table_name in PARTITIONED_TABLES:
+            add_partitions(table_name, now)
+    return apply_retention(now=now, dry_run=dry_run)
+
+
+def get_table_months(table_name):
+    """
+    Get the number of rows per month of a table.
+
+    Args:
+        table_name (str): The table.
+
+    Returns:
+        dict: Partition name ('pYYYYMM', FIRST_PARTITION, LAST_PARTITION) to row count
+        (an estimate on MySQL); on SQLite rows without a date are under 'none'.
+    """
+    if not get_storage_backend().embedded:
+        try:
+            return dict(get_partitions(table_name))
+        except Error as e:
+            logger.error(f"Error reading the partitions of {table_name}: {e}")
+            return {}
+
+    column = PARTITIONED_TABLES[table_name]
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+        SELECT COALESCE('p' || substr(replace({column}, '-', ''), 1, 6), 'none'), COUNT(*)
+        FROM {table_name}
+        GROUP BY 1
+        ORDER BY 1
+        """)
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    except Error as e:
+        logger.error(f"Error reading the months of {table_name}: {e}")
+        return {}
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the monthly partitions and the retention of the large tables.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('partition', help="Convert the tables to monthly partitions (MySQL, once)")
+    maintain_parser = subparsers.add_parser('maintain', help="Add the coming partitions, archive and drop expired months")
+    maintain_parser.add_argument('--dry-run', action='store_true', help="Only print the months that would be archived")
+    subparsers.add_parser('status', help="Print the rows per month of each table")
+    args = parser.parse_args()
+
+    if args.command == 'partition':
+        for table in PARTITIONED_TABLES:
+            partition_table(table)
+    elif args.command == 'maintain':
+        print(json.dumps(maintain(dry_run=args.dry_run), indent=2))
+    else:
+        print(json.dumps({table: get_table_months(table) for table in PARTITIONED_TABLES}, indent=2))
@@ -3,8 +3,13 @@
 import os
 import sys
 import json
-from mysql.connector import Error
 from scripts.utils.db_connection import get_db_connection, close_connection
+from scripts.utils.storage import DatabaseError as Error
+from scripts.utils.article_search import index_articles
+from scripts.utils.change_feed import append_changes
+from scripts.utils.storage_policy import apply_article_policy
+from scripts.utils.enrichment import enrich_articles
+from scripts.utils.text_normalization import text_keys, find_duplicates
 from scripts.utils.logger_config import get_logger
 from datetime import datetime
 
@@ -15,88 +20,126 @@ sys.path.insert(0, project_root)
 
 logger = get_logger('process_fetched_data')
 
-def process_and_insert_data(api_name, api_response):
+def process_and_insert_data(api_name, api_response, stats=None):
     """
     Process the API response and insert the results into the appropriate table.
     
     Args:
         api_name (str): The name of the API (e.g., 'newsdata', 'newsapi', etc.)
-        api_response (dict): The JSON response from the API
+        api_response (ResponseEnvelope or dict): The JSON response from the API
+        stats (dict, optional): If provided, filled with insertion counts (see insert_data_into_db)
     
     Returns:
         bool: True if processing and insertion were successful, False otherwise
     """
     if api_name == 'newsdata':
-        return process_and_insert_newsdata(api_response)
+        return process_and_insert_newsdata(api_response, stats)
     elif api_name == 'newsapi':
-        return process_and_insert_newsapi(api_response)
+        return process_and_insert_newsapi(api_response, stats)
     elif api_name == 'gnews':
-        return process_and_insert_gnews(api_response)
+        return process_and_insert_gnews(api_response, stats)
     elif api_name == 'mediastack':
-        return process_and_insert_mediastack(api_response)
+        return process_and_insert_mediastack(api_response, stats)
     elif api_name == 'currentsapi':
-        return process_and_insert_currentsapi(api_response)
+        return process_and_insert_currentsapi(api_response, stats)
     else:
         logger.error(f"Unsupported API: {api_name}")
         return False
     
-def insert_data_into_db(data_list, table_name):
+def insert_data_into_db(data_list, table_name, stats=None):
     """
     Insert data into the given table, skipping duplicate entries based on title.
+
+    Titles are compared by their normalized dedup key (see text_normalization.py), so case,
+    accents, punctuation, articles and a trailing publisher name do not matter; titles of
+    the batch nearly identical to one kept before them are skipped too.
+
+    The new records are written with a single executemany per column set, and added to the
+    search index (see article_search.py) and the change feed (see change_feed.py), in one transaction. The stored values go through
+    the storage policy (truncation, compression); the search index gets the full text.
+    Once committed, the new records are queued for enrichment (see enrichment.py).
+    Relies on the dedup_key columns of migration 5, checked when the database is first
+    opened (see migrations.ensure_schema).
     
     Args:
         data_list (list): A list of dictionaries containing the data to be inserted.
         table_name (str): The name of the table where the data should be inserted.
+        stats (dict, optional): If provided, filled with 'inserted' and 'duplicates' counts. If it holds
+            an 'inserted_titles' set, the titles of the inserted records are added to it.
     
     Returns:
         bool: True if the insertion was successful, False otherwise
     """
     conn = None
+    cursor = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Collect all titles from data_list
-        titles = [data.get('title') for data in data_list if data.get('title')]
-        titles_set = set(titles)
-
-        if not titles_set:
+        # Normalize the titles of the batch in one pass (see text_normalization.py)
+        titled = [data for data in data_list if data.get('title')]
+        if not titled:
             logger.error("No titles found in data_list.")
             return False
+        keys = text_keys([data['title'] for data in titled],
+                         languages=[data.get('language') for data in titled],
+                         context=[data.get('description') for data in titled])
+        for data, key in zip(titled, keys):
+            data['dedup_key'] = key['dedup_key']
+
+        # Get the stored articles with the same keys, or the same titles for rows stored before the keys
+        dedup_keys = list({key['dedup_key'] for key in keys})
+        titles = list({data['title'] for data in titled})
+        sql = (f"SELECT title, dedup_key FROM {table_name} "
+               f"WHERE dedup_key IN ({', '.join(['%s'] * len(dedup_keys))}) "
+               f"OR title IN ({', '.join(['%s'] * len(titles))})")
+        cursor.execute(sql, dedup_keys + titles)
+        rows = cursor.fetchall()
+        existing_keys = {row[1] for row in rows if row[1]}
+        existing_keys.update(key['dedup_key'] for key in text_keys([row[0] for row in rows if not row[1]]))
+
+        logger.info(f"Found {len(rows)} existing titles in {table_name} table.")
+
+        # Now, collect the records that are not duplicates, grouped by column set
+        batches = {}
+        missing_titles = len(data_list) - len(titled)
+        duplicate_titles = 0
+        for data, duplicate in zip(titled, find_duplicates(keys, existing_keys)):
+            if duplicate:
+                duplicate_titles += 1
+                logger.debug("Duplicate title found: '%s', skipping this record.", data['title'],
+                             extra={'sample_key': 'duplicate_title'})
+                continue
 
-        # Prepare the SQL to get existing titles
-        placeholders = ', '.join(['%s'] * len(titles_set))
-        sql = f"SELECT title FROM {table_name} WHERE title IN ({placeholders})"
-        cursor.execute(sql, list(titles_set))
-        existing_titles = set(row[0] for row in cursor.fetchall())
+            batches.setdefault(tuple(data.keys()), []).append(data)
 
-        logger.info(f"Found {len(existing_titles)} existing titles in {table_name} table.")
+        if missing_titles:
+            logger.warning(f"Skipped {missing_titles} records missing 'title' for {table_name} table.")
+        if duplicate_titles:
+            logger.info(f"Skipped {duplicate_titles} records with duplicate titles for {table_name} table.")
 
-        # Now, insert records whose title is not in existing_titles
+        # Insert each batch with a single prepared INSERT
         inserted_count = 0
-        for data in data_list:
-            title = data.get('title', None)
-            if title is None:
-                logger.warning("Data record missing 'title', skipping.")
-                continue
-
-            if title in existing_titles:
-                logger.warning(f"Duplicate title found: '{title}', skipping this record.")
-                continue
-
-            # Prepare the INSERT statement
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['%s'] * len(data))
-            sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        for columns, records in batches.items():
+            placeholders = ', '.join(['%s'] * len(columns))
+            sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
 
             try:
-                cursor.execute(sql, list(data.values()))
-                inserted_count += 1
+                cursor.executemany(sql, [tuple(apply_article_policy(record).values()) for record in records])
+                inserted_count += len(records)
             except Error as e:
                 logger.error(f"Error inserting data into {table_name} table: {e}")
                 raise  # Re-raise the exception if it's a different error
+            index_articles(cursor, table_name, records)
+            append_changes(cursor, table_name, records)
 
         conn.commit()
+        enrich_articles(table_name, [record for records in batches.values() for record in records])
+        if stats is not None:
+            stats['inserted'] = inserted_count
+            stats['duplicates'] = duplicate_titles
+            if 'inserted_titles' in stats:
+                stats['inserted_titles'].update(record['title'] for records in batches.values() for record in records)
         logger.info(f"Successfully inserted {inserted_count} records into {table_name} table (excluding duplicates)")
         return True
 
@@ -113,12 +156,13 @@ def insert_data_into_db(data_list, table_name):
             close_connection(conn)
 
 
-def process_and_insert_newsdata(api_response):
+def process_and_insert_newsdata(api_response, stats=None):
     """
     Process the NewsData.io API response and insert the results into the newsdata table.
     
     Args:
-        api_response (dict): The JSON response from the NewsData.io API
+        api_response (ResponseEnvelope or dict): The JSON response from the NewsData.io API
+        stats (dict, optional): Filled with insertion counts, see insert_data_into_db
     
     Returns:
         bool: True if processing and insertion were successful, False otherwise
@@ -175,14 +219,15 @@ def process_and_insert_newsdata(api_response):
         logger.error("No valid articles to insert.")
         return False
 
-    return insert_data_into_db(processed_articles, 'newsdata')
+    return insert_data_into_db(processed_articles, 'newsdata', stats)
 
-def process_and_insert_newsapi(api_response):
+def process_and_insert_newsapi(api_response, stats=None):
     """
     Process the NewsAPI response and insert the results into the newsapi table.
     
     Args:
-        api_response (dict): The JSON response from the NewsAPI
+        api_response (ResponseEnvelope or dict): The JSON response from the NewsAPI
+        stats (dict, optional): Filled with insertion counts, see insert_data_into_db
     
     Returns:
         bool: True if processing and insertion were successful, False otherwise
@@ -213,7 +258,7 @@ def process_and_insert_newsapi(api_response):
             try:
                 published_at = datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M:%S")
             except ValueError:
-                logger.warning(f"Invalid date format for publishedAt: {published_at}")
+                logger.warning(f"Invalid date format for publishedAt: {published_at}", extra={'sample_key': 'invalid_date'})
                 published_at = None
 
         # Prepare the data for insertion
@@ -234,14 +279,15 @@ def process_and_insert_newsapi(api_response):
         logger.error("No valid articles to insert.")
         return False
 
-    return insert_data_into_db(processed_articles, 'newsapi')
+    return insert_data_into_db(processed_articles, 'newsapi', stats)
 
-def process_and_insert_gnews(api_response):
+def process_and_insert_gnews(api_response, stats=None):
     """
     Process the GNews API response and insert the results into the gnews table.
 
     Args:
-        api_response (dict): The JSON response from the GNews API
+        api_response (ResponseEnvelope or dict): The JSON response from the GNews API
+        stats (dict, optional): Filled with insertion counts, see insert_data_into_db
 
     Returns:
         bool: True if processing and insertion were successful, False otherwise
@@ -269,7 +315,7 @@ def process_and_insert_gnews(api_response):
             try:
                 published_at = datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M:%S")
             except ValueError:
-                logger.warning(f"Invalid date format for publishedAt: {published_at}")
+                logger.warning(f"Invalid date format for publishedAt: {published_at}", extra={'sample_key': 'invalid_date'})
                 published_at = None
 
         # Prepare the data for insertion
@@ -287,11 +333,11 @@ def process_and_insert_gnews(api_response):
         logger.error("No valid articles to insert for GNews.")
         return False
 
-    return insert_data_into_db(processed_articles, 'gnews')  # Ensure you have a 'gnews' table
+    return insert_data_into_db(processed_articles, 'gnews', stats)  # Ensure you have a 'gnews' table
 
 
-def process_and_insert_mediastack(api_response):
+def process_and_insert_mediastack(api_response, stats=None):
     pass
 
-def process_and_insert_currentsapi(api_response):
+def process_and_insert_currentsapi(api_response, stats=None):
     pass
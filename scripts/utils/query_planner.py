@@ -0,0 +1,252 @@
+# scripts\utils\query_planner.py
+
+import os
+import re
+import sys
+import unicodedata
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.response_envelope import as_envelope  # noqa: E402
+
+# Initialize logger
+logger = get_logger('query_planner')
+
+# Load environment variables
+load_dotenv()
+
+# Providers whose 'q' accepts boolean OR expressions.
+#   max_length: maximum length of the 'q' parameter
+#   max_batch_size: maximum number of interests packed in one request (results are shared between them)
+#   group_by: interest fields sent to the provider besides 'q'; only interests that agree on them can share a request
+#   results_key: key of the article list in the provider's response
+#   page_size_param: parameter setting the number of articles of a response
+#   interest_page_size: articles a request for a single interest gets (the provider's default, or
+#       the value build_interest_params sends); a batch asks for this many per interest
+#   max_page_size: most articles one response can hold on the account's plan; batches are capped at
+#       max_page_size // interest_page_size interests, so no interest gets fewer articles than alone
+BATCHABLE_PROVIDERS = {
+    'newsdata': {
+        'max_length': 512,
+        'max_batch_size': 5,
+        'group_by': ('language', 'country', 'category'),
+        'results_key': 'results',
+        'page_size_param': 'size',
+        'interest_page_size': 10,
+        # 10 on the free plan
+        'max_page_size': int(os.getenv("NEWSDATA_MAX_PAGE_SIZE", 50)),
+    },
+    'newsapi': {
+        'max_length': 500,
+        'max_batch_size': 10,
+        'group_by': ('language',),
+        'results_key': 'articles',
+        'page_size_param': 'pageSize',
+        'interest_page_size': 100,
+        'max_page_size': int(os.getenv("NEWSAPI_MAX_PAGE_SIZE", 100)),
+    },
+    'gnews': {
+        'max_length': 200,
+        'max_batch_size': 5,
+        'group_by': ('language',),
+        'results_key': 'articles',
+        'page_size_param': 'max',
+        'interest_page_size': 10,
+        # 10 on the free plan
+        'max_page_size': int(os.getenv("GNEWS_MAX_PAGE_SIZE", 100)),
+    },
+}
+
+_OPERATORS = {'and', 'or', 'not'}
+
+
+def tokenize(text):
+    """
+    Split text into lowercase, accent-free word tokens.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        list: Word tokens.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r'\w+', text.lower())
+
+
+def interest_terms(formatted_interest):
+    """
+    Get the search terms of an interest, without boolean operators.
+
+    Args:
+        formatted_interest (str): The interest's query string.
+
+    Returns:
+        set: Lowercase, accent-free terms.
+    """
+    return {token for token in tokenize(formatted_interest) if token not in _OPERATORS}
+
+
+def format_query_term(formatted_interest):
+    """
+    Wrap an interest's query so it can be OR-combined with others.
+
+    Args:
+        formatted_interest (str): The interest's query string.
+
+    Returns:
+        str: The query, in parentheses if it contains more than one word.
+    """
+    query = formatted_interest.strip()
+    return f"({query})" if ' ' in query else query
+
+
+def combine_queries(interests):
+    """
+    OR-combine the queries of several interests.
+
+    Args:
+        interests (list): Interest dictionaries.
+
+    Returns:
+        str: The combined query.
+    """
+    if len(interests) == 1:
+        return interests[0]['formatted_interest']
+    return ' OR '.join(format_query_term(interest['formatted_interest']) for interest in interests)
+
+
+def batch_size_limit(api_name):
+    """
+    Get the most interests one request of a provider can serve without losing articles.
+
+    Args:
+        api_name (str): Name of the API.
+
+    Returns:
+        int: The limit, 1 for providers that do not support boolean queries.
+    """
+    limits = BATCHABLE_PROVIDERS.get(api_name)
+    if limits is None:
+        return 1
+    return max(1, min(limits['max_batch_size'], limits['max_page_size'] // limits['interest_page_size']))
+
+
+def batch_page_params(api_name, batch_size):
+    """
+    Get the page size parameter of a batched request, so each interest gets as many articles as alone.
+
+    Args:
+        api_name (str): Name of the API.
+        batch_size (int): Number of interests of the request.
+
+    Returns:
+        dict: The parameter, empty for single-interest requests.
+    """
+    limits = BATCHABLE_PROVIDERS.get(api_name)
+    if limits is None or batch_size <= 1:
+        return {}
+    return {limits['page_size_param']: min(limits['interest_page_size'] * batch_size, limits['max_page_size'])}
+
+
+def plan_query_batches(api_name, interests):
+    """
+    Pack compatible interests into batches that fit in one provider request.
+
+    Interests are grouped by the fields the provider receives besides 'q' and then
+    packed greedily, in ID order, while the combined query stays within the
+    provider's length limit and batch_size_limit(). Providers that do not support
+    boolean queries get one batch per interest.
+
+    Args:
+        api_name (str): Name of the API.
+        interests (list): Interest dictionaries.
+
+    Returns:
+        list: Lists of interests, one per request.
+    """
+    limits = BATCHABLE_PROVIDERS.get(api_name)
+    max_batch_size = batch_size_limit(api_name)
+    if limits is None or max_batch_size == 1:
+        return [[interest] for interest in interests]
+
+    groups = {}
+    for interest in sorted(interests, key=lambda i: i['id']):
+        key = tuple(interest.get(field) for field in limits['group_by'])
+        groups.setdefault(key, []).append(interest)
+
+    batches = []
+    for group in groups.values():
+        batch = []
+        for interest in group:
+            candidate = batch + [interest]
+            if batch and (len(candidate) > max_batch_size
+                          or len(combine_queries(candidate)) > limits['max_length']):
+                batches.append(batch)
+                candidate = [interest]
+            batch = candidate
+        if batch:
+            batches.append(batch)
+
+    logger.info(f"Planned {len(batches)} {api_name} requests for {len(interests)} interests")
+    return batches
+
+
+def split_response(api_name, api_response, interests):
+    """
+    Assign the articles of a batched response back to the interests they match.
+
+    An article goes to every interest whose terms all appear in its title or
+    description. Articles matching none fully go to the interest with the largest
+    term overlap (the provider may have matched on content or keywords); articles
+    with no overlap at all are dropped.
+
+    Args:
+        api_name (str): Name of the API.
+        api_response (ResponseEnvelope or dict): The JSON response from the API.
+        interests (list): Interest dictionaries of the batch.
+
+    Returns:
+        dict: Mapping of interest ID to a ResponseEnvelope holding only that interest's articles,
+        with the request metadata of the batched response.
+    """
+    envelope = as_envelope(api_response, api_name)
+    if len(interests) == 1:
+        return {interests[0]['id']: envelope.derive(interest=interests[0]['formatted_interest'])}
+
+    results_key = BATCHABLE_PROVIDERS[api_name]['results_key']
+    articles = envelope.get(results_key) or []
+    terms = [(interest, interest_terms(interest['formatted_interest'])) for interest in interests]
+    assigned = {interest['id']: [] for interest in interests}
+
+    dropped = 0
+    for article in articles:
+        words = set(tokenize(f"{article.get('title') or ''} {article.get('description') or ''}"))
+        matches = [interest for interest, interest_words in terms if interest_words and interest_words <= words]
+        if not matches:
+            best_interest, best_words = max(terms, key=lambda t: len(t[1] & words))
+            if best_words & words:
+                matches = [best_interest]
+        if not matches:
+            dropped += 1
+            continue
+        for interest in matches:
+            assigned[interest['id']].append(article)
+
+    if dropped:
+        logger.debug(f"Dropped {dropped} {api_name} articles matching no interest of the batch")
+
+    return {
+        interest['id']: envelope.derive(
+            payload={**envelope.payload, results_key: assigned[interest['id']]},
+            interest=interest['formatted_interest'],
+        )
+        for interest in interests
+    }
@@ -0,0 +1,331 @@
+# scripts\utils\ranking.py
+
+import os
+import sys
+import json
+import math
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error  # noqa: E402
+from scripts.utils.query_planner import interest_terms  # noqa: E402
+from scripts.utils.text_normalization import text_keys  # noqa: E402
+
+# Initialize logger
+logger = get_logger('ranking')
+
+# Load environment variables
+load_dotenv()
+
+# Ranking configuration
+RANKING_CONFIG = {
+    # Articles kept per interest
+    "top_k": int(os.getenv("RANKING_TOP_K", 50)),
+    # BM25 term frequency saturation and length normalization
+    "k1": float(os.getenv("RANKING_BM25_K1", 1.2)),
+    "b": float(os.getenv("RANKING_BM25_B", 0.75)),
+    # Weights of the relevance, recency and source priority components (each between 0 and 1)
+    "relevance_weight": float(os.getenv("RANKING_RELEVANCE_WEIGHT", 0.6)),
+    "recency_weight": float(os.getenv("RANKING_RECENCY_WEIGHT", 0.25)),
+    "priority_weight": float(os.getenv("RANKING_PRIORITY_WEIGHT", 0.15)),
+    # Age at which the recency component is halved
+    "recency_half_life_hours": float(os.getenv("RANKING_RECENCY_HALF_LIFE_HOURS", 24)),
+}
+
+# Per provider: key of the article list, and article fields holding the URL and publication time
+PROVIDER_FIELDS = {
+    'newsdata': {'results_key': 'results', 'url': 'link', 'published_at': 'pubDate'},
+    'newsapi': {'results_key': 'articles', 'url': 'url', 'published_at': 'publishedAt'},
+    'gnews': {'results_key': 'articles', 'url': 'url', 'published_at': 'publishedAt'},
+}
+
+_DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S%z')
+
+
+def parse_published_at(value):
+    """
+    Parse a provider's publication time.
+
+    Args:
+        value (str or datetime or None): The value from the API or the database.
+
+    Returns:
+        datetime or None: Naive UTC datetime, None if missing or unparseable.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    for date_format in _DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc)
+        return parsed.replace(tzinfo=None)
+    return None
+
+
+def extract_candidates(api_name, api_response):
+    """
+    Get the rankable fields of the articles of a response.
+
+    Args:
+        api_name (str): Name of the API.
+        api_response (ResponseEnvelope or dict): The JSON response from the API.
+
+    Returns:
+        list: Dictionaries with provider, title, description, url, published_at and source_priority.
+    """
+    fields = PROVIDER_FIELDS.get(api_name)
+    if fields is None or not api_response:
+        return []
+    candidates = []
+    for article in api_response.get(fields['results_key']) or []:
+        title = article.get('title')
+        if not title:
+            continue
+        candidates.append({
+            'provider': api_name,
+            'title': title,
+            'description': article.get('description'),
+            'url': article.get(fields['url']),
+            'published_at': parse_published_at(article.get(fields['published_at'])),
+            'source_priority': article.get('source_priority'),
+        })
+    return candidates
+
+
+def bm25_scores(query_terms, documents, k1=None, b=None):
+    """
+    Score a batch of documents against a query with BM25.
+
+    Document frequencies and the average length are computed over the whole batch
+    in a single pass, then every document is scored against the same statistics.
+
+    Args:
+        query_terms (set): Query terms, as produced by interest_terms().
+        documents (list): Token lists, one per document.
+        k1 (float, optional): Term frequency saturation. Defaults to RANKING_BM25_K1.
+        b (float, optional): Length normalization. Defaults to RANKING_BM25_B.
+
+    Returns:
+        list: Scores, in document order.
+    """
+    k1 = RANKING_CONFIG["k1"] if k1 is None else k1
+    b = RANKING_CONFIG["b"] if b is None else b
+    if not documents or not query_terms:
+        return [0.0] * len(documents)
+
+    term_counts = [Counter(token for token in tokens if token in query_terms) for tokens in documents]
+    lengths = [len(tokens) for tokens in documents]
+    average_length = (sum(lengths) / len(lengths)) or 1.0
+    document_frequency = Counter(term for counts in term_counts for term in counts)
+    num_documents = len(documents)
+    idf = {
+        term: math.log(1 + (num_documents - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+        for term in query_terms
+    }
+
+    scores = []
+    for counts, length in zip(term_counts, lengths):
+        norm = k1 * (1 - b + b * length / average_length)
+        scores.append(sum(idf[term] * tf * (k1 + 1) / (tf + norm) for term, tf in counts.items()))
+    return scores
+
+
+def recency_scores(published, now, half_life_hours=None):
+    """
+    Score publication times with exponential decay: 1 when just published, 0.5 after one half-life.
+
+    Args:
+        published (list): Publication datetimes (None scores 0).
+        now (datetime): Reference time.
+        half_life_hours (float, optional): Defaults to RANKING_RECENCY_HALF_LIFE_HOURS.
+
+    Returns:
+        list: Scores between 0 and 1.
+    """
+    half_life = (RANKING_CONFIG["recency_half_life_hours"] if half_life_hours is None else half_life_hours) * 3600
+    decay = math.log(2) / half_life
+    return [
+        0.0 if value is None else math.exp(-decay * max((now - value).total_seconds(), 0.0))
+        for value in published
+    ]
+
+
+def priority_scores(priorities):
+    """
+    Score NewsData source priorities (1 is the most prominent source, larger is less prominent).
+
+    Args:
+        priorities (list): Source priorities; None (providers without one) scores a neutral 0.5.
+
+    Returns:
+        list: Scores between 0 and 1.
+    """
+    return [
+        0.5 if not value else max(0.0, 1.0 - math.log10(max(int(value), 1)) / 7.0)
+        for value in priorities
+    ]
+
+
+def score_candidates(formatted_interest, candidates, now=None):
+    """
+    Score articles against an interest.
+
+    The score combines BM25 relevance over title and description (normalized to the
+    best article of the batch), recency and source priority, with the weights of
+    RANKING_CONFIG. Titles are counted twice so title matches weigh more. Documents are the
+    search keys of the texts (see text_normalization.py), without their language's stop words.
+
+    Args:
+        formatted_interest (str): The interest's query string.
+        candidates (list): Articles as returned by extract_candidates().
+        now (datetime, optional): Naive UTC reference time for recency, as publication times are stored.
+            Defaults to the current UTC time.
+
+    Returns:
+        list: Scores, in candidate order.
+    """
+    if not candidates:
+        return []
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    titles = text_keys([candidate['title'] for candidate in candidates])
+    descriptions = text_keys([candidate.get('description') or '' for candidate in candidates],
+                             languages=[key['language'] for key in titles])
+    documents = [
+        title['search_key'].split() * 2 + description['search_key'].split()
+        for title, description in zip(titles, descriptions)
+    ]
+    relevance = bm25_scores(interest_terms(formatted_interest), documents)
+    best = max(relevance) or 1.0
+    recency = recency_scores([candidate.get('published_at') for candidate in candidates], now)
+    priority = priority_scores([candidate.get('source_priority') for candidate in candidates])
+    return [
+        RANKING_CONFIG["relevance_weight"] * r / best
+        + RANKING_CONFIG["recency_weight"] * a
+        + RANKING_CONFIG["priority_weight"] * p
+        for r, a, p in zip(relevance, recency, priority)
+    ]
+
+
+def update_top_articles(interest, api_name, api_response, now=None):
+    """
+    Merge the articles of a response into the interest's top-K.
+
+    The stored top-K and the new articles are scored together, so every kept article
+    is scored with the same statistics and reference time, and the best K are written
+    back by position. Articles with the same title dedup key (see text_normalization.py)
+    are kept once, the stored one first, even across providers.
+
+    Args:
+        interest (dict): Interest dictionary (id and formatted_interest).
+        api_name (str): Name of the API.
+        api_response (ResponseEnvelope or dict): The JSON response from the API for this interest.
+        now (datetime, optional): Naive UTC reference time for recency, as publication times are stored.
+            Defaults to the current UTC time.
+
+    Returns:
+        bool: True if the top-K was updated, False otherwise.
+    """
+    candidates = extract_candidates(api_name, api_response)
+    if not candidates:
+        return False
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    top_k = RANKING_CONFIG["top_k"]
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT provider, title, description, url, published_at, source_priority
+        FROM interest_top_articles
+        WHERE interest_id = %s
+        """, (interest['id'],))
+        pool = cursor.fetchall() + candidates
+        merged = {}
+        for candidate, key in zip(pool, text_keys([candidate['title'] for candidate in pool])):
+            merged.setdefault(key['dedup_key'], candidate)
+        pool = list(merged.values())
+
+        scores = score_candidates(interest['formatted_interest'], pool, now)
+        ranked = sorted(zip(scores, pool), key=lambda item: item[0], reverse=True)[:top_k]
+
+        cursor.execute("DELETE FROM interest_top_articles WHERE interest_id = %s", (interest['id'],))
+        cursor.executemany("""
+        INSERT INTO interest_top_articles
+            (interest_id, position, provider, title, description, url, published_at, source_priority, score, ranked_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, [
+            (interest['id'], position, article['provider'], article['title'], article.get('description'),
+             article.get('url'), article.get('published_at'), article.get('source_priority'), score, now)
+            for position, (score, article) in enumerate(ranked)
+        ])
+        conn.commit()
+        logger.info(f"Ranked {len(pool)} articles for interest ID '{interest['id']}', kept {len(ranked)}")
+        return True
+    except Error as e:
+        logger.error(f"Error ranking articles for interest ID '{interest['id']}': {e}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def get_top_articles(interest_id, limit=10):
+    """
+    Get the best articles of an interest.
+
+    Args:
+        interest_id (int): ID of the interest.
+        limit (int, optional): Number of articles (at most RANKING_TOP_K). Defaults to 10.
+
+    Returns:
+        list: Article dictionaries with their score, best first.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT position, provider, title, description, url, published_at, source_priority, score, ranked_at
+        FROM interest_top_articles
+        WHERE interest_id = %s AND position < %s
+        ORDER BY position
+        """, (interest_id, limit))
+        return cursor.fetchall()
+    except Error as e:
+        logger.error(f"Error reading top articles for interest ID '{interest_id}': {e}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage and read the per-interest article rankings.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    top_parser = subparsers.add_parser('top', help="Print the best articles of an interest")
+    top_parser.add_argument('interest_id', type=int)
+    top_parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    print(json.dumps(get_top_articles(args.interest_id, args.limit), indent=2, default=str))
@@ -0,0 +1,124 @@
+# scripts\utils\response_envelope.py
+
+from datetime import datetime
+
+
+class ResponseEnvelope:
+    """
+    A provider response with the metadata of its request.
+
+    The payload is the decoded JSON exactly as the provider sent it; the interest,
+    provider, request parameters, timing and raw size are kept next to it instead of
+    being merged in. Read access mirrors the historical response dict, where 'interest'
+    was the first key, so consumers may call get('results') or get('interest') on
+    either form. The merged dict is only built when a response is serialized (see
+    to_json), at the edges: api_calls rows and the saved JSON files.
+    """
+
+    __slots__ = ('payload', 'provider', 'interest', 'params', 'elapsed', 'raw_size', 'fetched_at')
+
+    def __init__(self, payload, provider=None, interest=None, params=None, elapsed=None, raw_size=None,
+                 fetched_at=None):
+        """
+        Args:
+            payload (dict): The decoded JSON response.
+            provider (str, optional): Name of the API.
+            interest (str, optional): Interest the request was made for.
+            params (dict, optional): Request parameters, with the API key redacted.
+            elapsed (float, optional): Seconds between sending the request and receiving the response headers.
+            raw_size (int, optional): Size of the response body in bytes.
+            fetched_at (datetime, optional): When the response was received. Defaults to now.
+        """
+        self.payload = payload
+        self.provider = provider
+        self.interest = interest
+        self.params = params
+        self.elapsed = elapsed
+        self.raw_size = raw_size
+        self.fetched_at = fetched_at or datetime.now()
+
+    def get(self, key, default=None):
+        """Get a payload field, or the interest for 'interest'."""
+        if key == 'interest':
+            return self.interest if self.interest is not None else self.payload.get(key, default)
+        return self.payload.get(key, default)
+
+    def __getitem__(self, key):
+        if key == 'interest' and self.interest is not None:
+            return self.interest
+        return self.payload[key]
+
+    def __contains__(self, key):
+        return (key == 'interest' and self.interest is not None) or key in self.payload
+
+    def __bool__(self):
+        return bool(self.payload)
+
+    def derive(self, payload=None, interest=None):
+        """
+        Create an envelope sharing this one's request metadata.
+
+        Args:
+            payload (dict, optional): New payload. Defaults to this envelope's (not copied).
+            interest (str, optional): New interest. Defaults to this envelope's.
+
+        Returns:
+            ResponseEnvelope: The new envelope.
+        """
+        return ResponseEnvelope(self.payload if payload is None else payload, self.provider,
+                                self.interest if interest is None else interest, self.params,
+                                self.elapsed, self.raw_size, self.fetched_at)
+
+    def to_json(self):
+        """
+        Build the serialized form: the payload with 'interest' as its first key.
+
+        Returns:
+            dict: A shallow merge, for json.dump.
+        """
+        return {'interest': self.interest, **self.payload} if self.interest is not None else self.payload
+
+    def metadata(self):
+        """
+        Get the request metadata.
+
+        Returns:
+            dict: provider, interest, params, elapsed, raw_size and fetched_at.
+        """
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'payload'}
+
+    def __repr__(self):
+        return (f"ResponseEnvelope(provider={self.provider!r}, interest={self.interest!r}, "
+                f"raw_size={self.raw_size!r}, keys={list(self.payload)!r})")
+
+
+def as_envelope(response, provider=None):
+    """
+    Wrap a plain response dict (e.g. loaded from a saved file) in an envelope.
+
+    Args:
+        response (dict or ResponseEnvelope): The response; an envelope is returned unchanged.
+        provider (str, optional): Name of the API.
+
+    Returns:
+        ResponseEnvelope: The envelope. A dict's 'interest' key, if any, becomes its interest.
+    """
+    if isinstance(response, ResponseEnvelope):
+        return response
+    return ResponseEnvelope(response, provider, response.get('interest') if response else None)
+
+
+def json_default(value):
+    """
+    json.dump(s) hook for the values the pipeline passes around.
+
+    Envelopes are serialized with to_json(), sets (accepted in request parameters) as lists.
+
+    Raises:
+        TypeError: For other values, like json's default.
+    """
+    if isinstance(value, ResponseEnvelope):
+        return value.to_json()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
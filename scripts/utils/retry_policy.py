@@ -0,0 +1,264 @@
+# scripts\utils\retry_policy.py
+
+import os
+import sys
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+
+# Initialize logger
+logger = get_logger('retry_policy')
+
+# Load environment variables
+load_dotenv()
+
+# Retry and circuit breaker configuration (delays in seconds)
+RETRY_CONFIG = {
+    "base_delay": float(os.getenv("RETRY_BASE_DELAY", 1.0)),
+    "max_delay": float(os.getenv("RETRY_MAX_DELAY", 60.0)),
+    # Consecutive retryable failures before a provider's circuit opens
+    "failure_threshold": int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5)),
+    # Time an open circuit waits before letting a single trial request through
+    "reset_timeout": float(os.getenv("CIRCUIT_RESET_TIMEOUT", 300.0)),
+    # Seconds to wait for a provider to connect, and between bytes of its response (raises requests.Timeout)
+    "request_timeout": float(os.getenv("HTTP_REQUEST_TIMEOUT", 30.0)),
+}
+
+# Errors caused by the request itself; retrying them only burns quota
+PERMANENT_STATUS_CODES = {400, 401, 403, 404, 405, 410, 422}
+# Errors that mean the provider is unusable for the rest of the run (bad or exhausted key)
+FATAL_STATUS_CODES = {401, 403}
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def get_status_code(error):
+    """
+    Get the HTTP status code attached to a requests exception, if any.
+
+    Args:
+        error (requests.RequestException): The exception raised by requests.
+
+    Returns:
+        int or None: The HTTP status code, or None if no response was received.
+    """
+    response = getattr(error, 'response', None)
+    return response.status_code if response is not None else None
+
+
+def is_retryable(error):
+    """
+    Classify a requests exception as retryable or permanent.
+
+    Connection errors, timeouts, 429 and 5xx responses are retryable. Other 4xx
+    responses (bad key, invalid parameters) are permanent.
+
+    Args:
+        error (requests.RequestException): The exception raised by requests.
+
+    Returns:
+        bool: True if the request may succeed when retried, False otherwise.
+    """
+    status_code = get_status_code(error)
+    if status_code is None:
+        import requests  # Only needed on the error path; keeps this module cheap to import
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    if status_code in PERMANENT_STATUS_CODES:
+        return False
+    return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+
+
+def parse_retry_after(response):
+    """
+    Parse the Retry-After header of a response.
+
+    Args:
+        response (requests.Response): The HTTP response.
+
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_delay(attempt, error=None, config=RETRY_CONFIG):
+    """
+    Compute how long to wait before the next attempt.
+
+    Honors Retry-After when the provider sends one, otherwise uses exponential
+    backoff with full jitter so concurrent callers do not retry in lockstep.
+
+    Args:
+        attempt (int): Zero-based index of the attempt that just failed.
+        error (requests.RequestException, optional): The exception raised by requests.
+        config (dict, optional): Retry configuration. Defaults to RETRY_CONFIG.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    retry_after = parse_retry_after(getattr(error, 'response', None))
+    if retry_after is not None:
+        return min(retry_after, config['max_delay'])
+    backoff = min(config['base_delay'] * (2 ** attempt), config['max_delay'])
+    return random.uniform(0, backoff)
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    The circuit opens after `failure_threshold` consecutive retryable failures, or
+    immediately on a fatal error such as 401/403. While open, requests are rejected
+    until `reset_timeout` has elapsed; then one trial request is let through and its
+    outcome closes or re-opens the circuit. The breaker also holds a "not before" time
+    set from Retry-After, so other callers back off without sleeping.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, config=RETRY_CONFIG):
+        self.name = name
+        self.config = config
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.not_before = 0.0
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _wait_time(self, now):
+        # Caller must hold self._lock
+        if self.state == self.OPEN:
+            if self.opened_at is None:
+                return None
+            remaining = self.opened_at + self.config['reset_timeout'] - now
+            if remaining > 0:
+                return remaining
+            self.state = self.HALF_OPEN
+            self.trial_in_flight = False
+            logger.info(f"Circuit for {self.name} is half-open, allowing a trial request")
+        if self.state == self.HALF_OPEN and self.trial_in_flight:
+            return self.config['base_delay']
+        return max(self.not_before - now, 0.0)
+
+    def wait_time(self):
+        """
+        Get the time until the provider may be called again.
+
+        Returns:
+            float or None: Seconds to wait (0 if a request is allowed now), or None if the
+            circuit is open for good (fatal error).
+        """
+        with self._lock:
+            return self._wait_time(time.monotonic())
+
+    def is_open(self):
+        """
+        Check whether the circuit is open, i.e. the provider should be skipped.
+
+        Returns:
+            bool: True if the circuit is open, False if closed or half-open.
+        """
+        with self._lock:
+            self._wait_time(time.monotonic())
+            return self.state == self.OPEN
+
+    def allow_request(self):
+        """
+        Check whether a request to the provider may be made right now.
+
+        In the half-open state only the first caller is allowed through.
+
+        Returns:
+            bool: True if the request is allowed, False otherwise.
+        """
+        with self._lock:
+            if self._wait_time(time.monotonic()) != 0.0:
+                return False
+            if self.state == self.HALF_OPEN:
+                self.trial_in_flight = True
+            return True
+
+    def defer(self, seconds):
+        """
+        Ask every caller to hold off the provider for the given number of seconds.
+
+        Args:
+            seconds (float): Delay in seconds.
+        """
+        with self._lock:
+            self.not_before = max(self.not_before, time.monotonic() + seconds)
+
+    def record_success(self):
+        """Record a successful request and close the circuit."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self, error):
+        """
+        Record a failed request and open the circuit if needed.
+
+        Args:
+            error (requests.RequestException): The exception raised by requests.
+        """
+        status_code = get_status_code(error)
+        with self._lock:
+            self.trial_in_flight = False
+            if status_code in FATAL_STATUS_CODES:
+                self.state = self.OPEN
+                self.opened_at = None
+                logger.error(f"Circuit for {self.name} opened for the rest of the run (HTTP {status_code})")
+                return
+            if not is_retryable(error):
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.config['failure_threshold']:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                logger.error(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(api_name):
+    """
+    Get the circuit breaker of a provider, creating it on first use.
+
+    Args:
+        api_name (str): Name of the API.
+
+    Returns:
+        CircuitBreaker: The provider's circuit breaker.
+    """
+    with _breakers_lock:
+        if api_name not in _breakers:
+            _breakers[api_name] = CircuitBreaker(api_name)
+        return _breakers[api_name]
@@ -0,0 +1,295 @@
+# scripts\utils\run_manifest.py
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger, new_run_id  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error  # noqa: E402
+
+# Initialize logger
+logger = get_logger('run_manifest')
+
+# Load environment variables
+load_dotenv()
+
+# Run manifest configuration
+MANIFEST_CONFIG = {
+    # Record the (interest, provider) jobs of interest runs so an interrupted run can be resumed
+    "enabled": os.getenv("RUN_MANIFEST_ENABLED", "true").lower() in ("1", "true", "yes"),
+    # Unfinished runs older than this are not resumed; a new run starts instead
+    "resume_hours": float(os.getenv("RUN_MANIFEST_RESUME_HOURS", 12)),
+}
+
+# Per provider: response field holding the cursor of the next page, if the provider has one
+CURSOR_FIELDS = {
+    'newsdata': 'nextPage',
+    'currents': 'page',
+}
+
+RUN_STATUSES = ('running', 'completed', 'failed')
+
+
+def options_hash(options):
+    """
+    Hash the options of a run, so a run is only resumed by a run doing the same work.
+
+    Args:
+        options (dict): JSON-serializable run options (APIs, batching, shard...).
+
+    Returns:
+        str: SHA-1 hex digest.
+    """
+    return hashlib.sha1(json.dumps(options, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def response_cursor(api_name, api_response):
+    """
+    Get the cursor of the next page from a provider response.
+
+    Args:
+        api_name (str): Name of the API.
+        api_response (ResponseEnvelope or dict or None): The JSON response.
+
+    Returns:
+        str or None: The cursor, None if the provider has none or the response has no next page.
+    """
+    field = CURSOR_FIELDS.get(api_name)
+    if field is None or not api_response or api_response.get(field) is None:
+        return None
+    return str(api_response[field])
+
+
+def open_run(options, run_id=None, resume=True, now=None):
+    """
+    Start a run, or resume the latest unfinished run with the same options.
+
+    An unfinished run is one that crashed (still 'running') or failed, started less than
+    RUN_MANIFEST_RESUME_HOURS ago. Its completed jobs are loaded so they can be skipped.
+
+    Args:
+        options (dict): Run options; only a run with identical options is resumed.
+        run_id (str, optional): ID of a new run. Defaults to a generated ID.
+        resume (bool, optional): If False, always start a new run. Defaults to True.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        dict: Manifest with 'run_id', 'started_at', 'resumed' and 'completed' (set of
+        (interest_id, api_name_id) pairs already done), or None if the manifest is
+        disabled or unavailable (the run then proceeds without checkpoints).
+    """
+    if not MANIFEST_CONFIG["enabled"]:
+        return None
+    now = now or datetime.now()
+    digest = options_hash(options)
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        previous = None
+        if resume:
+            cursor.execute("""
+            SELECT run_id, started_at
+            FROM fetch_runs
+            WHERE options_hash = %s AND status <> 'completed' AND started_at >= %s
+            ORDER BY started_at DESC
+            LIMIT 1
+            """, (digest, now - timedelta(hours=MANIFEST_CONFIG["resume_hours"])))
+            previous = cursor.fetchone()
+
+        if previous:
+            run_id, started_at = previous['run_id'], previous['started_at']
+            cursor.execute("""
+            SELECT interest_id, api_name_id
+            FROM fetch_run_jobs
+            WHERE run_id = %s AND status = 'completed'
+            """, (run_id,))
+            completed = {(row['interest_id'], row['api_name_id']) for row in cursor.fetchall()}
+            cursor.execute("UPDATE fetch_runs SET status = 'running', updated_at = %s WHERE run_id = %s",
+                           (now, run_id))
+            logger.info(f"Resuming run {run_id} started at {started_at}: {len(completed)} jobs already completed")
+        else:
+            run_id, started_at, completed = run_id or new_run_id(), now, set()
+            cursor.execute("""
+            INSERT INTO fetch_runs (run_id, options_hash, options, status, started_at, updated_at)
+            VALUES (%s, %s, %s, 'running', %s, %s)
+            """, (run_id, digest, json.dumps(options, sort_keys=True, default=str), now, now))
+            logger.info(f"Started run {run_id}")
+        conn.commit()
+        return {'run_id': run_id, 'started_at': started_at, 'resumed': previous is not None, 'completed': completed}
+    except Error as e:
+        logger.error(f"Error opening the run manifest, running without checkpoints: {e}")
+        if conn:
+            conn.rollback()
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def is_job_done(manifest, interest_id, api_name_id):
+    """
+    Check whether a job was completed by an earlier attempt of the run.
+
+    Args:
+        manifest (dict or None): Manifest as returned by open_run().
+        interest_id (int): ID of the interest.
+        api_name_id (str): Name of the API.
+
+    Returns:
+        bool: True if the job can be skipped.
+    """
+    return manifest is not None and (interest_id, api_name_id) in manifest['completed']
+
+
+def record_job(manifest, interest_id, api_name_id, status, cursor_value=None, new_articles=0, error=None, now=None):
+    """
+    Checkpoint the outcome of an (interest, provider) job.
+
+    Args:
+        manifest (dict or None): Manifest as returned by open_run(); updated in place. Nothing
+            is recorded if None.
+        interest_id (int): ID of the interest.
+        api_name_id (str): Name of the API.
+        status (str): 'completed' or 'failed'. Failed jobs are retried when the run is resumed.
+        cursor_value (str, optional): Cursor of the next page (see response_cursor).
+        new_articles (int, optional): Number of new articles inserted. Defaults to 0.
+        error (str, optional): Reason of a failure.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        bool: True if the job was recorded, False otherwise.
+    """
+    if manifest is None:
+        return False
+    now = now or datetime.now()
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+        INSERT INTO fetch_run_jobs
+            (run_id, interest_id, api_name_id, status, cursor_value, new_articles, error, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            status = VALUES(status),
+            cursor_value = VALUES(cursor_value),
+            new_articles = VALUES(new_articles),
+            error = VALUES(error),
+            updated_at = VALUES(updated_at)
+        """, (manifest['run_id'], interest_id, api_name_id, status, cursor_value, new_articles, error, now))
+        conn.commit()
+        if status == 'completed':
+            manifest['completed'].add((interest_id, api_name_id))
+        return True
+    except Error as e:
+        logger.error(f"Error recording job {interest_id} / {api_name_id} of run {manifest['run_id']}: {e}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def finish_run(manifest, status='completed', now=None):
+    """
+    Mark a run as finished. A 'failed' run is resumed by the next run with the same options.
+
+    Args:
+        manifest (dict or None): Manifest as returned by open_run(). Nothing is recorded if None.
+        status (str, optional): 'completed' or 'failed'. Defaults to 'completed'.
+        now (datetime, optional): Reference time. Defaults to datetime.now().
+
+    Returns:
+        bool: True if the run was updated, False otherwise.
+    """
+    if manifest is None:
+        return False
+    now = now or datetime.now()
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+        UPDATE fetch_runs SET status = %s, updated_at = %s, finished_at = %s WHERE run_id = %s
+        """, (status, now, now, manifest['run_id']))
+        conn.commit()
+        logger.info(f"Run {manifest['run_id']} {status}")
+        return True
+    except Error as e:
+        logger.error(f"Error finishing run {manifest['run_id']}: {e}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+def get_runs(limit=10):
+    """
+    Get the latest runs with their number of completed and failed jobs.
+
+    Args:
+        limit (int, optional): Number of runs. Defaults to 10.
+
+    Returns:
+        list: Run dictionaries, latest first.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT r.run_id, r.status, r.started_at, r.finished_at, r.options,
+               SUM(CASE WHEN j.status = 'completed' THEN 1 ELSE 0 END) AS completed_jobs,
+               SUM(CASE WHEN j.status = 'failed' THEN 1 ELSE 0 END) AS failed_jobs
+        FROM fetch_runs r
+        LEFT JOIN fetch_run_jobs j ON j.run_id = r.run_id
+        GROUP BY r.run_id, r.status, r.started_at, r.finished_at, r.options
+        ORDER BY r.started_at DESC
+        LIMIT %s
+        """, (limit,))
+        return cursor.fetchall()
+    except Error as e:
+        logger.error(f"Error reading runs: {e}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage and inspect the run manifest.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    runs_parser = subparsers.add_parser('runs', help="Print the latest runs")
+    runs_parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    print(json.dumps(get_runs(args.limit), indent=2, default=str))
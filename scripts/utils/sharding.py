@@ -0,0 +1,111 @@
+# scripts\utils\sharding.py
+
+import os
+import sys
+import bisect
+import hashlib
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+
+# Initialize logger
+logger = get_logger('sharding')
+
+# Virtual nodes per shard; more nodes spread interests more evenly
+DEFAULT_REPLICAS = 128
+
+
+def stable_hash(value):
+    """
+    Hash a value to a 64-bit integer that is identical across processes and hosts.
+
+    Args:
+        value: Value to hash (converted to str).
+
+    Returns:
+        int: The hash.
+    """
+    return int.from_bytes(hashlib.md5(str(value).encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping interest IDs to shards.
+
+    Every node computes the same ring from the shard count, so shards agree on the
+    slice each one owns without coordinating. Changing the shard count only moves
+    about 1/N of the interests.
+    """
+
+    def __init__(self, num_shards, replicas=DEFAULT_REPLICAS):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1.")
+        self.num_shards = num_shards
+        points = sorted(
+            (stable_hash(f"shard-{shard}-{replica}"), shard)
+            for shard in range(num_shards)
+            for replica in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key):
+        """
+        Get the shard owning a key.
+
+        Args:
+            key: The key, e.g. an interest ID.
+
+        Returns:
+            int: The shard index, from 0 to num_shards - 1.
+        """
+        index = bisect.bisect(self._hashes, stable_hash(key)) % len(self._hashes)
+        return self._shards[index]
+
+
+def filter_shard(interests, shard_index, num_shards):
+    """
+    Keep the interests owned by a shard.
+
+    Args:
+        interests (list): Interest dictionaries.
+        shard_index (int): Index of the shard, from 0 to num_shards - 1.
+        num_shards (int): Total number of shards.
+
+    Returns:
+        list: The interests of the shard.
+    """
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be between 0 and {num_shards - 1}.")
+    ring = HashRing(num_shards)
+    shard_interests = [interest for interest in interests if ring.shard_for(interest['id']) == shard_index]
+    logger.info(f"Shard {shard_index}/{num_shards} owns {len(shard_interests)} of {len(interests)} interests")
+    return shard_interests
+
+
+def get_shard_quota(daily_limit, shard_index, num_shards):
+    """
+    Split a provider's daily quota between shards.
+
+    Args:
+        daily_limit (int): The provider's daily call limit.
+        shard_index (int): Index of the shard.
+        num_shards (int): Total number of shards.
+
+    Returns:
+        int: The number of calls the shard may make today.
+    """
+    quota, remainder = divmod(daily_limit, num_shards)
+    return quota + (1 if shard_index < remainder else 0)
+
+
+# Example usage
+if __name__ == "__main__":
+    ring = HashRing(4)
+    counts = [0] * 4
+    for interest_id in range(1, 10001):
+        counts[ring.shard_for(interest_id)] += 1
+    print(f"Interests per shard: {counts}")
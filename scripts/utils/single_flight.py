@@ -0,0 +1,101 @@
+# scripts\utils\single_flight.py
+
+import os
+import sys
+import threading
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+
+# Initialize logger
+logger = get_logger('single_flight')
+
+
+def request_key(url, params):
+    """
+    Build a normalized key identifying a request.
+
+    Parameter order, surrounding whitespace, empty values and list vs comma-joined
+    values do not change the key.
+
+    Args:
+        url (str): API endpoint URL.
+        params (dict): Parameters for the API call.
+
+    Returns:
+        tuple: A hashable key for the request.
+    """
+    normalized = []
+    for k, v in params.items():
+        if isinstance(v, (list, tuple, set)):
+            v = ','.join(str(item).strip() for item in v if item not in [None, ''])
+        if v in [None, '']:
+            continue
+        normalized.append((k, str(v).strip()))
+    return (url.rstrip('/'), tuple(sorted(normalized)))
+
+
+class _Call:
+    """An in-flight call whose result is shared by every caller with the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is in
+    flight wait for it and receive the same result (or exception). Once the call
+    completes the key is forgotten, so later calls run again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key (hashable): Key identifying the call.
+            fn (callable): Function to run, without arguments.
+
+        Returns:
+            tuple: (result, shared) where shared is True if the result came from another caller's call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Shared one in-flight call with {call.waiters} duplicate callers")
+            call.done.set()
+        return call.result, False
@@ -0,0 +1,576 @@
+# scripts\utils\storage.py
+
+import os
+import re
+import sys
+import zlib
+import sqlite3
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import date, datetime
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+
+
+class DatabaseError(Exception):
+    """Database error, raised by every backend in place of its driver's errors."""
+
+    def __init__(self, msg=None, errno=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+
+# Initialize logger
+logger = get_logger('storage')
+
+# Load environment variables
+load_dotenv()
+
+# Storage configuration
+STORAGE_CONFIG = {
+    # 'mysql' (server, see db_connection.DB_CONFIG) or 'sqlite' (embedded, no server)
+    "backend": os.getenv("STORAGE_BACKEND", "mysql").lower(),
+    "sqlite_path": os.getenv("SQLITE_PATH", os.path.join(project_root, 'data', 'news_fetcher.db')),
+    # NORMAL is durable in WAL mode except for the last transactions on power loss
+    "sqlite_synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper(),
+    # Idle connections kept per thread; each keeps its own prepared statement cache
+    "sqlite_idle_connections": int(os.getenv("SQLITE_IDLE_CONNECTIONS", 2)),
+}
+
+STORAGE_BACKENDS = ('mysql', 'sqlite')
+
+# Tables of the SQLite backend, applied as migration 1 (see migrations.py); later schema changes go in new
+# migrations. DATETIME and DATE columns are returned as datetime and date objects.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interests (
+    id INTEGER PRIMARY KEY,
+    formatted_interest TEXT NOT NULL,
+    category TEXT,
+    language TEXT,
+    country TEXT,
+    priority INTEGER DEFAULT 0,
+    status INTEGER DEFAULT 1,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS api_info (
+    id INTEGER PRIMARY KEY,
+    api_name_id TEXT UNIQUE NOT NULL,
+    daily_limit INTEGER
+);
+CREATE TABLE IF NOT EXISTS api_usage (
+    id INTEGER PRIMARY KEY,
+    api_id INTEGER NOT NULL,
+    api_name_id TEXT NOT NULL,
+    date DATE NOT NULL,
+    shard_id INTEGER NOT NULL DEFAULT 0,
+    last_fetch DATETIME,
+    total_calls_made INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (api_id, date, shard_id)
+);
+CREATE TABLE IF NOT EXISTS api_calls (
+    id INTEGER PRIMARY KEY,
+    script_path TEXT,
+    custom_params TEXT,
+    payload TEXT,
+    response TEXT,
+    response_hash TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_api_calls_response_hash ON api_calls (response_hash);
+CREATE INDEX IF NOT EXISTS idx_api_calls_created_at ON api_calls (created_at);
+CREATE TABLE IF NOT EXISTS fetch_schedule (
+    interest_id INTEGER NOT NULL,
+    api_name_id TEXT NOT NULL,
+    interval_minutes INTEGER NOT NULL,
+    last_fetch DATETIME,
+    next_fetch DATETIME,
+    last_new_articles INTEGER NOT NULL DEFAULT 0,
+    total_fetches INTEGER NOT NULL DEFAULT 0,
+    total_new_articles INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (interest_id, api_name_id)
+);
+CREATE TABLE IF NOT EXISTS newsdata (
+    id INTEGER PRIMARY KEY,
+    article_id TEXT, interest TEXT, title TEXT, link TEXT, keywords TEXT, creator TEXT,
+    video_url TEXT, description TEXT, content TEXT, pubDate DATETIME, pubDateTZ TEXT,
+    image_url TEXT, source_id TEXT, source_priority INTEGER, source_name TEXT, source_url TEXT,
+    source_icon TEXT, language TEXT, country TEXT, category TEXT, ai_tag TEXT, sentiment TEXT,
+    sentiment_stats TEXT, ai_region TEXT, ai_org TEXT, duplicate INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_newsdata_title ON newsdata (title);
+CREATE INDEX IF NOT EXISTS idx_newsdata_pubDate ON newsdata (pubDate);
+CREATE TABLE IF NOT EXISTS newsapi (
+    id INTEGER PRIMARY KEY,
+    interest TEXT, source_id TEXT, source_name TEXT, author TEXT, title TEXT, description TEXT,
+    url TEXT, urlToImage TEXT, publishedAt DATETIME, content TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_newsapi_title ON newsapi (title);
+CREATE INDEX IF NOT EXISTS idx_newsapi_publishedAt ON newsapi (publishedAt);
+CREATE TABLE IF NOT EXISTS gnews (
+    id INTEGER PRIMARY KEY,
+    interest TEXT, title TEXT, description TEXT, url TEXT, image TEXT, published_at DATETIME, content TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_gnews_title ON gnews (title);
+CREATE INDEX IF NOT EXISTS idx_gnews_published_at ON gnews (published_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS article_search USING fts5(
+    title, description, content,
+    provider UNINDEXED, interest UNINDEXED, url UNINDEXED, published_at UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS interest_top_articles (
+    interest_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    provider TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    url TEXT,
+    published_at DATETIME,
+    source_priority INTEGER,
+    score REAL NOT NULL,
+    ranked_at DATETIME NOT NULL,
+    PRIMARY KEY (interest_id, position)
+);
+CREATE TABLE IF NOT EXISTS fetch_runs (
+    run_id TEXT PRIMARY KEY,
+    options_hash TEXT NOT NULL,
+    options TEXT,
+    status TEXT NOT NULL,
+    started_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    finished_at DATETIME
+);
+CREATE INDEX IF NOT EXISTS idx_fetch_runs_options ON fetch_runs (options_hash, status, started_at);
+CREATE TABLE IF NOT EXISTS fetch_run_jobs (
+    run_id TEXT NOT NULL,
+    interest_id INTEGER NOT NULL,
+    api_name_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    cursor_value TEXT,
+    new_articles INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (run_id, interest_id, api_name_id)
+);
+CREATE TABLE IF NOT EXISTS source_domains (
+    domain TEXT PRIMARY KEY,
+    home_url TEXT,
+    source_name TEXT,
+    source_icon TEXT,
+    status_code INTEGER,
+    reachable INTEGER NOT NULL DEFAULT 0,
+    checked_at DATETIME NOT NULL
+);
+CREATE TABLE IF NOT EXISTS image_checks (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status_code INTEGER,
+    content_type TEXT,
+    content_length INTEGER,
+    alive INTEGER NOT NULL DEFAULT 0,
+    checked_at DATETIME NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    provider TEXT NOT NULL,
+    interest TEXT,
+    title TEXT,
+    url TEXT,
+    published_at DATETIME,
+    created_at DATETIME NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_article_changes_created_at ON article_changes (created_at);
+CREATE TABLE IF NOT EXISTS change_feed_cursors (
+    consumer TEXT PRIMARY KEY,
+    last_seq INTEGER NOT NULL,
+    updated_at DATETIME NOT NULL
+);
+"""
+
+
+def _converter(parse):
+    # Values that do not parse (e.g. provider dates in another format) are returned as text
+    def convert(value):
+        text = value.decode('utf-8')
+        try:
+            return parse(text)
+        except ValueError:
+            return text
+    return convert
+
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+sqlite3.register_converter('DATE', _converter(date.fromisoformat))
+sqlite3.register_converter('DATETIME', _converter(datetime.fromisoformat))
+
+_VALUES_FUNCTION = re.compile(r'\bVALUES\((\w+)\)', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=256)
+def translate_query(query):
+    """
+    Rewrite a MySQL query for SQLite.
+
+    Handles '%s' placeholders, INSERT IGNORE and ON DUPLICATE KEY UPDATE with VALUES(column).
+
+    Args:
+        query (str): The MySQL query.
+
+    Returns:
+        str: The SQLite query.
+    """
+    query = query.replace('%s', '?').replace('INSERT IGNORE', 'INSERT OR IGNORE')
+    head, separator, updates = query.partition('ON DUPLICATE KEY UPDATE')
+    if separator:
+        updates = _VALUES_FUNCTION.sub(r'excluded.\1', updates)
+        query = f"{head}ON CONFLICT DO UPDATE SET{updates}"
+    return query
+
+
+class _BitXor:
+    """SQLite implementation of MySQL's BIT_XOR aggregate."""
+
+    def __init__(self):
+        self.value = 0
+
+    def step(self, value):
+        if value is not None:
+            self.value ^= int(value)
+
+    def finalize(self):
+        return self.value
+
+
+def _concat_ws(separator, *values):
+    return separator.join(str(value) for value in values if value is not None)
+
+
+class SQLiteCursor:
+    """Cursor with mysql.connector's interface over a sqlite3 cursor."""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(translate_query(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise DatabaseError(msg=str(e)) from e
+
+    def executemany(self, query, seq_params):
+        try:
+            self._cursor.executemany(translate_query(query), [tuple(params) for params in seq_params])
+        except sqlite3.Error as e:
+            raise DatabaseError(msg=str(e)) from e
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SQLiteConnection:
+    """Connection with mysql.connector's interface; close() hands it back to its backend for reuse."""
+
+    def __init__(self, backend, conn):
+        self._backend = backend
+        self._conn = conn
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._conn.cursor(), dictionary)
+
+    def commit(self):
+        try:
+            self._conn.commit()
+        except sqlite3.Error as e:
+            raise DatabaseError(msg=str(e)) from e
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        if self._conn is not None:
+            self._backend.release(self._conn)
+            self._conn = None
+
+
+def _driver_error(error):
+    """Build the DatabaseError of a mysql.connector error, keeping its code."""
+    return DatabaseError(msg=str(error), errno=getattr(error, 'errno', None))
+
+
+class MySQLCursor:
+    """Cursor of mysql.connector raising DatabaseError instead of the driver's errors."""
+
+    def __init__(self, cursor, driver_error):
+        self._cursor = cursor
+        self._driver_error = driver_error
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, query, params=None):
+        try:
+            self._cursor.execute(query, params)
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def executemany(self, query, seq_params):
+        try:
+            self._cursor.executemany(query, seq_params)
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def fetchone(self):
+        try:
+            return self._cursor.fetchone()
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def fetchall(self):
+        try:
+            return self._cursor.fetchall()
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def close(self):
+        try:
+            self._cursor.close()
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MySQLConnection:
+    """Pooled mysql.connector connection raising DatabaseError; close() hands it back to the pool."""
+
+    def __init__(self, conn, driver_error):
+        self._conn = conn
+        self._driver_error = driver_error
+
+    def cursor(self, dictionary=False, **kwargs):
+        try:
+            return MySQLCursor(self._conn.cursor(dictionary=dictionary, **kwargs), self._driver_error)
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def commit(self):
+        try:
+            self._conn.commit()
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def rollback(self):
+        try:
+            self._conn.rollback()
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+    def close(self):
+        try:
+            self._conn.close()
+        except self._driver_error as e:
+            raise _driver_error(e) from e
+
+
+class MySQLBackend:
+    """
+    MySQL server backend; connections come from the pool in db_connection.
+
+    mysql.connector is imported on first use, so importing the pipeline does not load it
+    (e.g. for SQLite runs and CLI commands that never reach the database).
+    """
+
+    name = 'mysql'
+    embedded = False
+
+    def __init__(self):
+        self._driver = None
+        self._driver_lock = threading.Lock()
+
+    @property
+    def driver(self):
+        """The mysql.connector module, imported on first use."""
+        if self._driver is None:
+            with self._driver_lock:
+                if self._driver is None:
+                    import mysql.connector.pooling
+                    self._driver = mysql.connector
+        return self._driver
+
+    @contextmanager
+    def errors(self):
+        """Raise the mysql.connector errors of the block as DatabaseError."""
+        try:
+            yield
+        except self.driver.Error as e:
+            raise _driver_error(e) from e
+
+    def wrap(self, conn):
+        """
+        Wrap a pooled mysql.connector connection so it raises DatabaseError.
+
+        Args:
+            conn (mysql.connector.pooling.PooledMySQLConnection): A connection taken from the pool.
+
+        Returns:
+            MySQLConnection: The connection. Close it to give it back to the pool.
+        """
+        return MySQLConnection(conn, self.driver.Error)
+
+
+class SQLiteBackend:
+    """
+    Embedded SQLite backend.
+
+    The database runs in WAL mode, so readers never block the writer and several
+    processes (e.g. shards) can share the file. Connections are kept per thread and
+    reused, which also reuses each connection's prepared statements. The pipeline's
+    MySQL queries are translated (see translate_query) and MOD, CRC32, CONCAT_WS and
+    BIT_XOR are provided, so bulk inserts and title dedup behave as on MySQL.
+    """
+
+    name = 'sqlite'
+    embedded = True
+
+    def __init__(self, path=None, synchronous=None, idle_connections=None):
+        """
+        Args:
+            path (str, optional): Database file, created with its tables if missing. Defaults to SQLITE_PATH.
+            synchronous (str, optional): PRAGMA synchronous value. Defaults to SQLITE_SYNCHRONOUS.
+            idle_connections (int, optional): Idle connections kept per thread. Defaults to SQLITE_IDLE_CONNECTIONS.
+        """
+        self.path = path or STORAGE_CONFIG["sqlite_path"]
+        self.synchronous = synchronous or STORAGE_CONFIG["sqlite_synchronous"]
+        self.idle_connections = (STORAGE_CONFIG["sqlite_idle_connections"]
+                                 if idle_connections is None else idle_connections)
+        self._local = threading.local()
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = self._open()
+        try:
+            # Imported here, as the migrations depend on modules importing this one
+            from scripts.utils.migrations import ensure_schema
+            ensure_schema(SQLiteConnection(self, conn), self.name)
+        finally:
+            conn.close()
+        logger.info(f"Using SQLite storage at {self.path}")
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=30, detect_types=sqlite3.PARSE_DECLTYPES,
+                               check_same_thread=False, cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.create_function('MOD', 2, lambda a, b: None if a is None or b is None else a % b, deterministic=True)
+        conn.create_function('CRC32', 1, lambda value: None if value is None else zlib.crc32(str(value).encode('utf-8')),
+                             deterministic=True)
+        conn.create_function('CONCAT_WS', -1, _concat_ws, deterministic=True)
+        conn.create_aggregate('BIT_XOR', 1, _BitXor)
+        return conn
+
+    def connect(self):
+        """
+        Get a connection, reusing one of this thread's idle connections if possible.
+
+        Returns:
+            SQLiteConnection: The connection. Close it to give it back.
+        """
+        idle = getattr(self._local, 'idle', None)
+        conn = idle.pop() if idle else self._open()
+        return SQLiteConnection(self, conn)
+
+    def release(self, conn):
+        """Roll back any unfinished transaction and keep the connection for reuse, or close it."""
+        conn.rollback()
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = []
+        if len(idle) < self.idle_connections:
+            idle.append(conn)
+        else:
+            conn.close()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_storage_backend():
+    """
+    Get the storage backend selected by STORAGE_BACKEND, creating it on first use.
+
+    Returns:
+        MySQLBackend or SQLiteBackend: The backend.
+
+    Raises:
+        ValueError: If STORAGE_BACKEND is not a known backend.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = STORAGE_CONFIG["backend"]
+                if name == 'mysql':
+                    _backend = MySQLBackend()
+                elif name == 'sqlite':
+                    _backend = SQLiteBackend()
+                else:
+                    raise ValueError(f"Invalid STORAGE_BACKEND '{name}'. Valid backends are: {', '.join(STORAGE_BACKENDS)}")
+    return _backend
+
+
+def set_storage_backend(backend):
+    """
+    Replace the storage backend, e.g. with an SQLiteBackend on a scratch file for tests or benchmarks.
+
+    Args:
+        backend (MySQLBackend or SQLiteBackend or None): The backend. None re-reads STORAGE_BACKEND on next use.
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,223 @@
+# scripts\utils\storage_policy.py
+
+import os
+import sys
+import json
+import zlib
+import base64
+import binascii
+import hashlib
+import threading
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+
+# Initialize logger
+logger = get_logger('storage_policy')
+
+# Load environment variables
+load_dotenv()
+
+
+def _int_env(name, default=0):
+    return int(os.getenv(name, default))
+
+
+# Storage policy configuration. Every policy is disabled (0 / false) by default.
+STORAGE_POLICY_CONFIG = {
+    # Maximum characters kept per column of the article tables
+    "max_chars": {
+        "content": _int_env("STORE_CONTENT_MAX_CHARS"),
+        "description": _int_env("STORE_DESCRIPTION_MAX_CHARS"),
+    },
+    # Text values of at least this many bytes are stored compressed (0 disables compression)
+    "compress_min_bytes": _int_env("STORE_COMPRESS_MIN_BYTES"),
+    # Article columns eligible for compression, all read back through decode_article (see
+    # article_search.rebuild_search_index). JSON columns such as keywords are never compressed, as
+    # their readers parse them as is. Raw responses in api_calls are always eligible (see get_api_response).
+    "compressed_columns": ("content", "description"),
+    # Store identical raw responses once in api_calls (needs the response_hash column, see migrations.MIGRATIONS)
+    "skip_raw_duplicates": os.getenv("STORE_SKIP_RAW_DUPLICATES", "false").lower() in ("1", "true", "yes"),
+}
+
+# Prefix of compressed values: zlib-compressed UTF-8, base64-encoded so it fits text columns
+COMPRESSED_PREFIX = 'z1:'
+
+_stats_lock = threading.Lock()
+_policy_stats = {
+    "truncated_values": 0,
+    "truncated_bytes": 0,
+    "compressed_values": 0,
+    "compressed_bytes": 0,
+    "duplicate_responses": 0,
+    "duplicate_bytes": 0,
+}
+
+
+def _count(**increments):
+    with _stats_lock:
+        for name, value in increments.items():
+            _policy_stats[name] += value
+
+
+def get_policy_stats():
+    """
+    Get the bytes saved by each policy since the start of the run.
+
+    Returns:
+        dict: Number of values and bytes saved by truncation, compression and raw duplicate skipping,
+        plus the total bytes saved.
+    """
+    with _stats_lock:
+        stats = dict(_policy_stats)
+    stats["total_bytes_saved"] = stats["truncated_bytes"] + stats["compressed_bytes"] + stats["duplicate_bytes"]
+    return stats
+
+
+def encode_text(value, min_bytes=None):
+    """
+    Compress a text value if it is large enough and compression pays off.
+
+    Args:
+        value (str or None): The value.
+        min_bytes (int, optional): Compression threshold. Defaults to STORE_COMPRESS_MIN_BYTES (0 disables).
+
+    Returns:
+        str or None: The value as stored.
+    """
+    min_bytes = STORAGE_POLICY_CONFIG["compress_min_bytes"] if min_bytes is None else min_bytes
+    if not min_bytes or not isinstance(value, str) or value.startswith(COMPRESSED_PREFIX):
+        return value
+    raw = value.encode('utf-8')
+    if len(raw) < min_bytes:
+        return value
+    encoded = COMPRESSED_PREFIX + base64.b64encode(zlib.compress(raw, 6)).decode('ascii')
+    if len(encoded) >= len(raw):
+        return value
+    _count(compressed_values=1, compressed_bytes=len(raw) - len(encoded))
+    return encoded
+
+
+def decode_text(value):
+    """
+    Decompress a value stored by encode_text; other values are returned unchanged.
+
+    A value that merely starts with COMPRESSED_PREFIX (e.g. a title "z1: ...") does not decode,
+    and is returned unchanged too.
+
+    Args:
+        value (str or None): The stored value.
+
+    Returns:
+        str or None: The original value.
+    """
+    if isinstance(value, str) and value.startswith(COMPRESSED_PREFIX):
+        try:
+            return zlib.decompress(base64.b64decode(value[len(COMPRESSED_PREFIX):], validate=True)).decode('utf-8')
+        except (binascii.Error, zlib.error, UnicodeDecodeError):
+            logger.debug("Value starting with the compressed prefix is not compressed, returned as is")
+    return value
+
+
+def decode_article(row):
+    """
+    Decompress the compressed columns of an article row read from a provider table.
+
+    Only the columns the policy compresses (STORAGE_POLICY_CONFIG["compressed_columns"]) are
+    decoded; titles, URLs and the other columns are returned as stored.
+
+    Args:
+        row (dict): The row.
+
+    Returns:
+        dict: The row with its original values.
+    """
+    compressed = STORAGE_POLICY_CONFIG["compressed_columns"]
+    return {column: decode_text(value) if column in compressed else value for column, value in row.items()}
+
+
+def apply_article_policy(record):
+    """
+    Truncate and compress the columns of an article before it is stored.
+
+    Args:
+        record (dict): Column name to value, as built by process_and_insert_*.
+
+    Returns:
+        dict: The record as stored (a copy if anything changed).
+    """
+    max_chars = STORAGE_POLICY_CONFIG["max_chars"]
+    compressed_columns = STORAGE_POLICY_CONFIG["compressed_columns"]
+    if not STORAGE_POLICY_CONFIG["compress_min_bytes"] and not any(max_chars.values()):
+        return record
+
+    stored = dict(record)
+    for column, value in record.items():
+        if not isinstance(value, str):
+            continue
+        limit = max_chars.get(column)
+        if limit and len(value) > limit:
+            truncated = value[:limit]
+            _count(truncated_values=1, truncated_bytes=len(value.encode('utf-8')) - len(truncated.encode('utf-8')))
+            value = truncated
+        if column in compressed_columns:
+            value = encode_text(value)
+        stored[column] = value
+    return stored
+
+
+def response_hash(response_json):
+    """
+    Hash a raw response, to recognize identical responses.
+
+    Args:
+        response_json (str): The JSON-encoded response.
+
+    Returns:
+        str: SHA-1 hex digest.
+    """
+    return hashlib.sha1(response_json.encode('utf-8')).hexdigest()
+
+
+def apply_raw_response_policy(cursor, response_json):
+    """
+    Prepare a raw response for the api_calls table.
+
+    With STORE_SKIP_RAW_DUPLICATES, a response already stored is replaced by a small
+    reference to it. Otherwise the response is compressed if large enough.
+
+    Args:
+        cursor: Cursor used to look up identical responses.
+        response_json (str): The JSON-encoded response.
+
+    Returns:
+        tuple: (value to store, response hash or None when duplicate skipping is disabled).
+    """
+    if not STORAGE_POLICY_CONFIG["skip_raw_duplicates"]:
+        return encode_text(response_json), None
+
+    digest = response_hash(response_json)
+    cursor.execute("SELECT 1 FROM api_calls WHERE response_hash = %s LIMIT 1", (digest,))
+    if cursor.fetchone() is not None:
+        reference = json.dumps({"duplicate_of": digest})
+        _count(duplicate_responses=1, duplicate_bytes=len(response_json.encode('utf-8')) - len(reference))
+        return reference, digest
+    return encode_text(response_json), digest
+
+
+def load_raw_response(value):
+    """
+    Decode a response stored in api_calls.
+
+    Args:
+        value (str): The stored value.
+
+    Returns:
+        dict: The response, or {'duplicate_of': hash} for a skipped duplicate (look it up by response_hash).
+    """
+    return json.loads(decode_text(value))
+
@@ -0,0 +1,363 @@
+# scripts\utils\text_normalization.py
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import unicodedata
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.storage import DatabaseError as Error  # noqa: E402
+
+# Initialize logger
+logger = get_logger('text_normalization')
+
+# Load environment variables
+load_dotenv()
+
+# Dedup key configuration
+TEXT_KEYS_CONFIG = {
+    # Words per shingle, for near-duplicate detection
+    "shingle_size": int(os.getenv("DEDUP_SHINGLE_SIZE", 2)),
+    # Records of one batch whose title shingles overlap at least this much (Jaccard) are duplicates (0 disables)
+    "near_duplicate_threshold": float(os.getenv("DEDUP_NEAR_THRESHOLD", 0.8)),
+    # Drop a trailing " - Publisher" from titles, as some providers append it
+    "strip_publisher_suffix": os.getenv("DEDUP_STRIP_PUBLISHER", "true").lower() in ("1", "true", "yes"),
+    # Rows updated per statement by backfill_dedup_keys
+    "backfill_batch_size": int(os.getenv("DEDUP_BACKFILL_BATCH_SIZE", 1000)),
+}
+
+# Article tables holding a dedup_key column (added by migration 5, see migrations.py)
+KEYED_TABLES = ('newsdata', 'newsapi', 'gnews')
+
+STOP_WORDS = {
+    'en': frozenset("""
+        a an and are as at be but by for from has have he her his in is it its not of on or our she
+        that the their they this to was were will with after over new says said into about up out more
+    """.split()),
+    'pt': frozenset("""
+        a ao aos as com como da das de do dos e em entre era foi mais mas na nas no nos o os ou para
+        pela pelas pelo pelos por que se sem ser sobre sua suas seu seus um uma umas uns diz apos ate
+    """.split()),
+    'es': frozenset("""
+        a al como con de del el en entre es esta este fue la las lo los mas para pero por que se sin
+        sobre su sus un una unas unos y o tras segun dice hasta ha han
+    """.split()),
+    'fr': frozenset("""
+        a au aux avec ce ces dans de des du elle en est et il ils la le les leur mais ne ou par pas
+        plus pour qui que sa se ses son sur un une apres selon
+    """.split()),
+    'de': frozenset("""
+        am auf aus bei das dem den der des die ein eine einem einen einer es fur im in ist mit nach
+        nicht sich sind und vom von vor zu zum zur uber wie
+    """.split()),
+    'it': frozenset("""
+        a al alla alle agli ai che con da dal dalla dei del della delle di e gli il in la le lo nel
+        nella non per piu si su sul sulla tra un una uno dopo
+    """.split()),
+}
+
+# Articles stripped from dedup keys, whatever the language, so they do not depend on the detected
+# language. Only articles: negations, prepositions and direction words change the meaning of a title
+# ("Fed will not cut rates"), and articles that are also English words (as, un, die, dem, os) are kept.
+# Stored keys are not updated when this changes: run "python -m scripts.utils.text_normalization backfill --all".
+DEDUP_STOP_WORDS = frozenset("""
+    a an the
+    o um uma uns umas
+    el la los las una unos unas
+    l le les une des
+    der das den des ein eine einen einem einer eines
+    il lo gli uno
+""".split())
+
+# Language names used by providers (e.g. NewsData.io), mapped to the codes of STOP_WORDS
+LANGUAGE_NAMES = {
+    'english': 'en', 'portuguese': 'pt', 'spanish': 'es', 'french': 'fr', 'german': 'de', 'italian': 'it',
+}
+
+_WORD = re.compile(r'\w+')
+_PUBLISHER_SUFFIX = re.compile(r'\s+[-–—|]\s+[^-–—|]{1,40}$')
+
+# Combining diacritics of the Latin, Greek and Cyrillic scripts, removed by accent folding. Marks of
+# other scripts (e.g. Indic vowel signs) are part of the letters and kept.
+_ACCENTS = {
+    code: None
+    for start, end in ((0x0300, 0x0370), (0x1AB0, 0x1B00), (0x1DC0, 0x1E00), (0x20D0, 0x2100), (0xFE20, 0xFE30))
+    for code in range(start, end)
+    if unicodedata.combining(chr(code))
+}
+
+
+def language_code(language):
+    """
+    Map a provider's language value to a code of STOP_WORDS.
+
+    Args:
+        language (str or None): A code ('pt', 'pt-BR') or name ('portuguese').
+
+    Returns:
+        str: The code, or None if the language has no stop words.
+    """
+    if not language:
+        return None
+    language = language.strip().lower()
+    code = LANGUAGE_NAMES.get(language, language.split('-')[0].split('_')[0])
+    return code if code in STOP_WORDS else None
+
+
+def strip_publisher(title):
+    """
+    Remove a trailing " - Publisher" (or " | Publisher") from a title that keeps at least four words.
+
+    Args:
+        title (str): The title.
+
+    Returns:
+        str: The title without the suffix.
+    """
+    match = _PUBLISHER_SUFFIX.search(title)
+    if match and len(title[:match.start()].split()) >= 4:
+        return title[:match.start()]
+    return title
+
+
+def normalize_batch(texts):
+    """
+    Normalize texts to word tokens: Unicode NFKC, case folding and accent folding.
+
+    The texts are normalized as one string, so a batch costs a single pass of each
+    normalization instead of one per text.
+
+    Args:
+        texts (list): Texts (None counts as empty).
+
+    Returns:
+        list: One list of word tokens per text.
+    """
+    joined = '\n'.join((text or '').replace('\n', ' ') for text in texts)
+    folded = unicodedata.normalize('NFKD', unicodedata.normalize('NFKC', joined).casefold()).translate(_ACCENTS)
+    return [_WORD.findall(line) for line in folded.split('\n')]
+
+
+def detect_language(tokens):
+    """
+    Guess the language of normalized tokens from the stop words they contain.
+
+    Args:
+        tokens (list): Tokens from normalize_batch().
+
+    Returns:
+        str: The code of the language with the most stop words, or None if there is no clear winner.
+    """
+    counts = sorted(((sum(token in words for token in tokens), code) for code, words in STOP_WORDS.items()),
+                    reverse=True)
+    (best, code), (second, _) = counts[0], counts[1]
+    return code if best > second else None
+
+
+def stable_hash(text, size=8):
+    """
+    Hash text with BLAKE2b, stable across processes and runs (unlike hash()).
+
+    Args:
+        text (str): The text.
+        size (int, optional): Digest size in bytes. Defaults to 8.
+
+    Returns:
+        bytes: The digest.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=size).digest()
+
+
+def shingles(tokens, size=None):
+    """
+    Hash the word n-grams of tokens.
+
+    Args:
+        tokens (list): Normalized tokens.
+        size (int, optional): Words per shingle. Defaults to DEDUP_SHINGLE_SIZE.
+
+    Returns:
+        frozenset: 64-bit integer hashes; texts shorter than a shingle give one shingle of all their words.
+    """
+    size = size or TEXT_KEYS_CONFIG["shingle_size"]
+    grams = [tokens[i:i + size] for i in range(max(len(tokens) - size + 1, 1))] if tokens else []
+    return frozenset(int.from_bytes(stable_hash(' '.join(gram)), 'big') for gram in grams)
+
+
+def jaccard(first, second):
+    """
+    Get the Jaccard similarity of two shingle sets.
+
+    Returns:
+        float: Between 0 (nothing shared) and 1 (same shingles); 0 if both are empty.
+    """
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def text_keys(texts, languages=None, context=None):
+    """
+    Compute the dedup and search keys of a batch of texts (typically titles) in one pass.
+
+    Dedup keys only strip articles (DEDUP_STOP_WORDS), the same in every language, so the
+    same title gets the same key whatever language is detected for it; search keys strip
+    the stop words of the text's own language, given or detected.
+
+    Args:
+        texts (list): The texts.
+        languages (list, optional): Language per text (code or provider name), None to detect it.
+        context (list, optional): Extra text per text (e.g. the description), only used to detect the language.
+
+    Returns:
+        list: One dict per text with 'language' (code or None), 'dedup_key' (16 hex characters),
+              'search_key' (normalized words, space-separated) and 'shingles' (frozenset of int).
+    """
+    texts = list(texts)
+    if TEXT_KEYS_CONFIG["strip_publisher_suffix"]:
+        texts = [strip_publisher(text) if text else text for text in texts]
+    tokens = normalize_batch(texts)
+    extra = normalize_batch(context) if context is not None else [[]] * len(texts)
+    languages = languages or [None] * len(texts)
+
+    keys = []
+    for text, words, more, language in zip(texts, tokens, extra, languages):
+        language = language_code(language) or detect_language(words + more)
+        content = [word for word in words if word not in DEDUP_STOP_WORDS]
+        # Texts made only of articles keep all their words, so they do not all share one key
+        content = content or words
+        stop_words = STOP_WORDS.get(language, ())
+        search = [word for word in words if word not in stop_words] or words
+        keys.append({
+            'language': language,
+            'dedup_key': stable_hash(' '.join(content)).hex() if content else stable_hash(text or '').hex(),
+            'search_key': ' '.join(search),
+            'shingles': shingles(content),
+        })
+    return keys
+
+
+def find_duplicates(keys, existing_keys=(), threshold=None):
+    """
+    Flag the duplicates of a batch: keys already stored, repeated in the batch, or near a kept text of the batch.
+
+    Args:
+        keys (list): Keys from text_keys().
+        existing_keys (set, optional): Dedup keys already stored.
+        threshold (float, optional): Shingle similarity of near duplicates. Defaults to DEDUP_NEAR_THRESHOLD.
+
+    Returns:
+        list: One bool per key, True for a duplicate.
+    """
+    threshold = TEXT_KEYS_CONFIG["near_duplicate_threshold"] if threshold is None else threshold
+    seen = set(existing_keys)
+    kept = []
+    flags = []
+    for key in keys:
+        duplicate = key['dedup_key'] in seen or (
+            threshold > 0 and any(jaccard(key['shingles'], other) >= threshold for other in kept))
+        if not duplicate:
+            seen.add(key['dedup_key'])
+            kept.append(key['shingles'])
+        flags.append(duplicate)
+    return flags
+
+
+def update_dedup_keys(cursor, table_name, batch_size=None, missing_only=True, commit=None):
+    """
+    Compute the dedup keys of the rows of a table, in batches of rows.
+
+    Args:
+        cursor: A cursor of the database.
+        table_name (str): One of KEYED_TABLES.
+        batch_size (int, optional): Rows per batch. Defaults to DEDUP_BACKFILL_BATCH_SIZE.
+        missing_only (bool, optional): Only the rows without a key. Defaults to True.
+        commit (callable, optional): Called after each batch, e.g. the connection's commit.
+
+    Returns:
+        int: Number of rows updated.
+    """
+    batch_size = batch_size or TEXT_KEYS_CONFIG["backfill_batch_size"]
+    missing = " AND dedup_key IS NULL" if missing_only else ""
+    updated = 0
+    last_id = 0
+    while True:
+        cursor.execute(
+            f"SELECT id, title FROM {table_name} WHERE id > %s{missing} ORDER BY id LIMIT %s",
+            (last_id, batch_size)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return updated
+        keys = text_keys([row[1] for row in rows])
+        cursor.executemany(f"UPDATE {table_name} SET dedup_key = %s WHERE id = %s",
+                           [(key['dedup_key'], row[0]) for row, key in zip(rows, keys)])
+        if commit is not None:
+            commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
+
+
+def backfill_dedup_keys(table_name, batch_size=None, missing_only=True):
+    """
+    Fill the dedup_key of rows stored before the column existed, or recompute every key.
+
+    Keys are recomputed after a change of the normalization (e.g. DEDUP_STOP_WORDS), as rows keyed
+    before it no longer match the keys of new titles. Run it offline: it rewrites every row of the table.
+
+    Args:
+        table_name (str): One of KEYED_TABLES.
+        batch_size (int, optional): Rows per batch. Defaults to DEDUP_BACKFILL_BATCH_SIZE.
+        missing_only (bool, optional): Only the rows without a key. Defaults to True.
+
+    Returns:
+        int: Number of rows updated, or -1 on error.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        updated = update_dedup_keys(cursor, table_name, batch_size, missing_only, commit=conn.commit)
+        logger.info(f"{'Filled' if missing_only else 'Recomputed'} the dedup key of {updated} rows of {table_name}")
+        return updated
+    except Error as e:
+        logger.error(f"Error filling the dedup keys of {table_name}: {e}")
+        if conn:
+            conn.rollback()
+        return -1
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute the dedup and search keys of article titles.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    keys_parser = subparsers.add_parser('keys', help="Print the keys of titles")
+    keys_parser.add_argument('titles', nargs='+')
+    keys_parser.add_argument('--language')
+    backfill_parser = subparsers.add_parser('backfill', help="Fill the dedup keys of rows stored before migration 5")
+    backfill_parser.add_argument('--all', action='store_true',
+                                 help="Recompute every key, after a change of the normalization")
+    args = parser.parse_args()
+
+    if args.command == 'keys':
+        for title, key in zip(args.titles, text_keys(args.titles, [args.language] * len(args.titles))):
+            print(json.dumps({'title': title, 'language': key['language'], 'dedup_key': key['dedup_key'],
+                              'search_key': key['search_key']}, ensure_ascii=False))
+    else:
+        for table in KEYED_TABLES:
+            backfill_dedup_keys(table, missing_only=not args.all)
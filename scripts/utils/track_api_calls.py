@@ -3,7 +3,6 @@
 import os
 import sys
 from datetime import date, datetime
-from mysql.connector import Error
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -11,6 +10,8 @@ sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
 from scripts.utils.db_connection import get_db_connection, close_connection
+from scripts.utils.storage import DatabaseError as Error
+from scripts.utils.sharding import get_shard_quota
 
 # Initialize logger
 logger = get_logger('track_api_calls')
@@ -37,13 +38,14 @@ def get_api_info(conn, api_name_id):
         logger.error(f"Error retrieving API info for {api_name_id}: {e}")
         return None
 
-def update_api_usage(conn, api_info):
+def update_api_usage(conn, api_info, shard_id=0):
     """
     Update or insert a record in the api_usage table.
     
     Args:
         conn: Database connection object
         api_info (dict): API information
+        shard_id (int, optional): Shard making the call. Defaults to 0 (unsharded runs).
     
     Returns:
         bool: True if successful, False otherwise
@@ -56,9 +58,9 @@ def update_api_usage(conn, api_info):
         # Check if there's an existing record for today
         query = """
         SELECT id, total_calls_made FROM api_usage 
-        WHERE api_id = %s AND date = %s
+        WHERE api_id = %s AND date = %s AND shard_id = %s
         """
-        cursor.execute(query, (api_info['id'], today))
+        cursor.execute(query, (api_info['id'], today, shard_id))
         existing_record = cursor.fetchone()
 
         if existing_record:
@@ -72,10 +74,10 @@ def update_api_usage(conn, api_info):
         else:
             # Insert new record
             insert_query = """
-            INSERT INTO api_usage (api_id, api_name_id, date, last_fetch, total_calls_made)
-            VALUES (%s, %s, %s, %s, 1)
+            INSERT INTO api_usage (api_id, api_name_id, date, shard_id, last_fetch, total_calls_made)
+            VALUES (%s, %s, %s, %s, %s, 1)
             """
-            cursor.execute(insert_query, (api_info['id'], api_info['api_name_id'], today, now))
+            cursor.execute(insert_query, (api_info['id'], api_info['api_name_id'], today, shard_id, now))
 
         conn.commit()
         cursor.close()
@@ -85,12 +87,121 @@ def update_api_usage(conn, api_info):
         conn.rollback()
         return False
 
-def track_api_call(api_name_id):
+def reserve_api_call(api_name_id, shard_id, num_shards):
+    """
+    Reserve one call of a shard's share of the API's daily quota, before making the call.
+
+    The daily limit (api_info.daily_limit) is split evenly between shards, and each shard
+    counts its calls in its own api_usage row. The increment is a single conditional
+    UPDATE, so concurrent workers of a shard can never exceed its share. The row is keyed
+    by the uq_api_usage_day unique key (api_id, date, shard_id) of migration 4, checked on
+    the first connection of the process (see migrations.ensure_schema).
+
+    A reservation is only given back (release_api_call) if no request was sent for it, e.g.
+    the circuit was open or the retries were deferred. A request that was sent keeps its
+    unit even if it failed, as providers count failed requests against the quota too.
+
+    Args:
+        api_name_id (str): Name of the API about to be called
+        shard_id (int): Shard making the call
+        num_shards (int): Total number of shards
+
+    Returns:
+        bool: True if the call was reserved (and counted), False if the shard's quota is used up
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        api_info = get_api_info(conn, api_name_id)
+        if api_info is None:
+            logger.error(f"API '{api_name_id}' not found in api_info table")
+            return False
+
+        cursor = conn.cursor()
+        today = date.today()
+        now = datetime.now()
+        daily_limit = api_info.get('daily_limit')
+        if daily_limit is None:
+            # No known limit: just count the call
+            cursor.close()
+            cursor = None
+            return update_api_usage(conn, api_info, shard_id)
+
+        quota = get_shard_quota(daily_limit, shard_id, num_shards)
+        cursor.execute("""
+        INSERT IGNORE INTO api_usage (api_id, api_name_id, date, shard_id, last_fetch, total_calls_made)
+        VALUES (%s, %s, %s, %s, %s, 0)
+        """, (api_info['id'], api_info['api_name_id'], today, shard_id, now))
+        cursor.execute("""
+        UPDATE api_usage SET total_calls_made = total_calls_made + 1, last_fetch = %s
+        WHERE api_id = %s AND date = %s AND shard_id = %s AND total_calls_made < %s
+        """, (now, api_info['id'], today, shard_id, quota))
+        reserved = cursor.rowcount == 1
+        conn.commit()
+
+        if not reserved:
+            logger.warning(f"Shard {shard_id} used its daily quota of {quota} calls for {api_name_id}")
+        return reserved
+    except Error as e:
+        logger.error(f"Database error while reserving API call for {api_name_id}: {e}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+def release_api_call(api_name_id, shard_id):
+    """
+    Give back a call reserved by reserve_api_call today for which no request was sent.
+
+    Args:
+        api_name_id (str): Name of the API
+        shard_id (int): Shard that reserved the call
+
+    Returns:
+        bool: True if a call was given back, False otherwise
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        api_info = get_api_info(conn, api_name_id)
+        if api_info is None:
+            logger.error(f"API '{api_name_id}' not found in api_info table")
+            return False
+
+        cursor = conn.cursor()
+        cursor.execute("""
+        UPDATE api_usage SET total_calls_made = total_calls_made - 1
+        WHERE api_id = %s AND date = %s AND shard_id = %s AND total_calls_made > 0
+        """, (api_info['id'], date.today(), shard_id))
+        released = cursor.rowcount == 1
+        conn.commit()
+        if released:
+            logger.debug(f"Shard {shard_id} released an unused call of {api_name_id}")
+        return released
+    except Error as e:
+        logger.error(f"Database error while releasing API call for {api_name_id}: {e}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_connection(conn)
+
+def track_api_call(api_name_id, shard_id=0):
     """
     Track an API call by updating the database.
     
     Args:
         api_name_id (str): Name of the API being called
+        shard_id (int, optional): Shard making the call. Defaults to 0 (unsharded runs).
     
     Returns:
         bool: True if tracking was successful, False otherwise
@@ -104,19 +215,16 @@ def track_api_call(api_name_id):
             logger.error(f"API '{api_name_id}' not found in api_info table")
             return False
         
-        success = update_api_usage(conn, api_info)
+        success = update_api_usage(conn, api_info, shard_id)
         
         if success:
-            logger.info(f"Successfully tracked API call for {api_name_id}")
-            print(f"API call tracked: {api_name_id}")
+            logger.debug(f"Successfully tracked API call for {api_name_id}")
         else:
             logger.warning(f"Failed to track API call for {api_name_id}")
-            print(f"Failed to track API call: {api_name_id}")
         
         return success
     except Error as e:
         logger.error(f"Database error while tracking API call for {api_name_id}: {e}")
-        print(f"Error tracking API call: {api_name_id}")
         return False
     finally:
         if conn: